@@ -0,0 +1,42 @@
+"""Record runs of scheduled background jobs
+
+Revision ID: a4d7e2c9b1f6
+Revises: f1c6d8a3e5b2
+Create Date: 2025-03-14 09:27:53.841062
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d7e2c9b1f6'
+down_revision: Union[str, None] = 'f1c6d8a3e5b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_runs',
+        sa.Column('id', postgresql.UUID(), nullable=False),
+        sa.Column('job', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('duration_seconds', sa.Float(), nullable=True),
+        sa.Column('host', sa.String(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_job_runs_job_started_at', 'job_runs', ['job', sa.text('started_at DESC')]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_runs_job_started_at', table_name='job_runs')
+    op.drop_table('job_runs')
@@ -0,0 +1,100 @@
+"""Typed timestamp columns and access path indexes
+
+Revision ID: b7d2c4e91a3f
+Revises: 615ffe033a5c
+Create Date: 2025-03-04 10:12:41.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2c4e91a3f'
+down_revision: Union[str, None] = '615ffe033a5c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TIMESTAMP_COLUMNS = [
+    ('threads', 'createdAt'),
+    ('steps', 'createdAt'),
+    ('steps', 'start'),
+    ('steps', 'end'),
+]
+
+
+def upgrade() -> None:
+    # Step times that are not valid timestamps are backfilled as NULL instead
+    # of failing the whole migration
+    op.execute("""
+        CREATE FUNCTION pg_temp.try_timestamptz(value text) RETURNS timestamptz AS $$
+        BEGIN
+            RETURN NULLIF(value, '')::timestamptz;
+        EXCEPTION WHEN others THEN
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql IMMUTABLE
+    """)
+
+    # A thread whose creation time can't be parsed gets the time of its
+    # first step, or the migration's, rather than NULL, which cleanup would
+    # take for a thread to delete
+    op.execute("""
+        UPDATE threads t
+        SET "createdAt" = coalesce(
+            (SELECT min(pg_temp.try_timestamptz(s."createdAt")) FROM steps s WHERE s."threadId" = t.id),
+            now()
+        )::text
+        WHERE t."createdAt" IS NOT NULL
+          AND pg_temp.try_timestamptz(t."createdAt") IS NULL
+    """)
+
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.DateTime(timezone=True),
+            existing_type=sa.String(),
+            existing_nullable=True,
+            postgresql_using=f'pg_temp.try_timestamptz("{column}")',
+        )
+
+    # Thread listing (newest first), optionally per user, and orphan cleanup
+    op.create_index(
+        'ix_threads_createdAt_id',
+        'threads',
+        [sa.text('"createdAt" DESC NULLS LAST'), sa.text('id DESC')],
+    )
+    op.create_index(
+        'ix_threads_userIdentifier_createdAt',
+        'threads',
+        ['userIdentifier', sa.text('"createdAt" DESC NULLS LAST'), sa.text('id DESC')],
+    )
+
+    # Per-thread children lookups
+    op.create_index('ix_steps_threadId_createdAt', 'steps', ['threadId', 'createdAt', 'id'])
+    op.create_index('ix_feedbacks_threadId', 'feedbacks', ['threadId'])
+    op.create_index('ix_elements_threadId', 'elements', ['threadId'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_elements_threadId', table_name='elements')
+    op.drop_index('ix_feedbacks_threadId', table_name='feedbacks')
+    op.drop_index('ix_steps_threadId_createdAt', table_name='steps')
+    op.drop_index('ix_threads_userIdentifier_createdAt', table_name='threads')
+    op.drop_index('ix_threads_createdAt_id', table_name='threads')
+
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.String(),
+            existing_type=sa.DateTime(timezone=True),
+            existing_nullable=True,
+            postgresql_using=(
+                f'to_char("{column}" AT TIME ZONE \'UTC\', '
+                f'\'YYYY-MM-DD"T"HH24:MI:SS.US"Z"\')'
+            ),
+        )
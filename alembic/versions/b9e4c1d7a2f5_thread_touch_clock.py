@@ -0,0 +1,101 @@
+"""Monotonic thread modification time, also for moved children
+
+Revision ID: b9e4c1d7a2f5
+Revises: d8b3f6a1c4e7
+Create Date: 2025-03-18 15:03:27.106482
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e4c1d7a2f5'
+down_revision: Union[str, None] = 'd8b3f6a1c4e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CHILD_TABLES = ['steps', 'feedbacks', 'elements']
+
+
+def upgrade() -> None:
+    # now() is the start of the transaction, so a long transaction could set
+    # an updatedAt older than writes committed before it, and than the
+    # analytics watermark. The statement's clock time, never moved backwards,
+    # keeps updatedAt increasing with every write.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION touch_threads() RETURNS trigger AS $$
+        BEGIN
+            UPDATE threads SET "updatedAt" = greatest(clock_timestamp(), "updatedAt")
+            WHERE id IN (SELECT "threadId" FROM changed_rows);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    # A child moved to another thread changes both threads
+    op.execute("""
+        CREATE FUNCTION touch_threads_on_update() RETURNS trigger AS $$
+        BEGIN
+            UPDATE threads SET "updatedAt" = greatest(clock_timestamp(), "updatedAt")
+            WHERE id IN (
+                SELECT "threadId" FROM changed_rows
+                UNION
+                SELECT "threadId" FROM old_rows
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION touch_thread_row() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                NEW."updatedAt" = greatest(clock_timestamp(), OLD."updatedAt");
+            ELSE
+                NEW."updatedAt" = clock_timestamp();
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    for table in CHILD_TABLES:
+        op.execute(f'DROP TRIGGER {table}_update_touch_threads ON {table}')
+        op.execute(f"""
+            CREATE TRIGGER {table}_update_touch_threads
+            AFTER UPDATE ON {table}
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS changed_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION touch_threads_on_update()
+        """)
+
+
+def downgrade() -> None:
+    for table in CHILD_TABLES:
+        op.execute(f'DROP TRIGGER {table}_update_touch_threads ON {table}')
+        op.execute(f"""
+            CREATE TRIGGER {table}_update_touch_threads
+            AFTER UPDATE ON {table}
+            REFERENCING NEW TABLE AS changed_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION touch_threads()
+        """)
+    op.execute('DROP FUNCTION touch_threads_on_update()')
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION touch_thread_row() RETURNS trigger AS $$
+        BEGIN
+            NEW."updatedAt" = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION touch_threads() RETURNS trigger AS $$
+        BEGIN
+            UPDATE threads SET "updatedAt" = now()
+            WHERE id IN (SELECT "threadId" FROM changed_rows)
+            AND "updatedAt" IS DISTINCT FROM now();
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
@@ -0,0 +1,71 @@
+"""Track thread modification time for conditional GETs
+
+Revision ID: c5e8a2f1d694
+Revises: b7d2c4e91a3f
+Create Date: 2025-03-06 16:41:09.552310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8a2f1d694'
+down_revision: Union[str, None] = 'b7d2c4e91a3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CHILD_TABLES = ['steps', 'feedbacks', 'elements']
+TRIGGER_EVENTS = [('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')]
+
+
+def upgrade() -> None:
+    op.add_column('threads', sa.Column('updatedAt', sa.DateTime(timezone=True), nullable=True))
+    op.execute('UPDATE threads SET "updatedAt" = COALESCE("createdAt", now())')
+
+    # Any write to a thread or to one of its children bumps threads."updatedAt",
+    # whichever process (API, Chainlit UI, ...) performed it. Child triggers
+    # are statement-level so bulk statements update each thread only once.
+    op.execute("""
+        CREATE FUNCTION touch_threads() RETURNS trigger AS $$
+        BEGIN
+            UPDATE threads SET "updatedAt" = now()
+            WHERE id IN (SELECT "threadId" FROM changed_rows)
+            AND "updatedAt" IS DISTINCT FROM now();
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE FUNCTION touch_thread_row() RETURNS trigger AS $$
+        BEGIN
+            NEW."updatedAt" = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    op.execute("""
+        CREATE TRIGGER threads_touch BEFORE INSERT OR UPDATE ON threads
+        FOR EACH ROW EXECUTE FUNCTION touch_thread_row()
+    """)
+    for table in CHILD_TABLES:
+        for event, transition in TRIGGER_EVENTS:
+            op.execute(f"""
+                CREATE TRIGGER {table}_{event.lower()}_touch_threads
+                AFTER {event} ON {table}
+                REFERENCING {transition} TABLE AS changed_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION touch_threads()
+            """)
+
+
+def downgrade() -> None:
+    for table in CHILD_TABLES:
+        for event, _ in TRIGGER_EVENTS:
+            op.execute(f'DROP TRIGGER {table}_{event.lower()}_touch_threads ON {table}')
+    op.execute('DROP TRIGGER threads_touch ON threads')
+    op.execute('DROP FUNCTION touch_thread_row()')
+    op.execute('DROP FUNCTION touch_threads()')
+    op.drop_column('threads', 'updatedAt')
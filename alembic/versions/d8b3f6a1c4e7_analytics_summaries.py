@@ -0,0 +1,64 @@
+"""Incrementally refreshed analytics summary tables
+
+Revision ID: d8b3f6a1c4e7
+Revises: a4d7e2c9b1f6
+Create Date: 2025-03-17 11:06:32.470915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8b3f6a1c4e7'
+down_revision: Union[str, None] = 'a4d7e2c9b1f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_steps_createdAt', 'steps', ['createdAt'])
+    op.create_index('ix_threads_updatedAt', 'threads', ['updatedAt'])
+    op.create_table(
+        'analytics_threads_daily',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('chat_profile', sa.String(), nullable=False),
+        sa.Column('threads', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'chat_profile'),
+    )
+    op.create_table(
+        'analytics_steps_daily',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('chat_profile', sa.String(), nullable=False),
+        sa.Column('step_type', sa.String(), nullable=False),
+        sa.Column('steps', sa.Integer(), nullable=False),
+        sa.Column('error_steps', sa.Integer(), nullable=False),
+        sa.Column('timed_steps', sa.Integer(), nullable=False),
+        sa.Column('latency_seconds_sum', sa.Float(), nullable=False),
+        sa.Column('latency_seconds_max', sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint('day', 'chat_profile', 'step_type'),
+    )
+    op.create_table(
+        'analytics_feedback_daily',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('chat_profile', sa.String(), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.Column('feedbacks', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'chat_profile', 'value'),
+    )
+    op.create_table(
+        'analytics_refresh',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('analytics_refresh')
+    op.drop_table('analytics_feedback_daily')
+    op.drop_table('analytics_steps_daily')
+    op.drop_table('analytics_threads_daily')
+    op.drop_index('ix_threads_updatedAt', table_name='threads')
+    op.drop_index('ix_steps_createdAt', table_name='steps')
@@ -0,0 +1,31 @@
+"""Shared token buckets of upstream sources
+
+Revision ID: e3a9f4b7c218
+Revises: c5e8a2f1d694
+Create Date: 2025-03-12 10:18:44.209135
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9f4b7c218'
+down_revision: Union[str, None] = 'c5e8a2f1d694'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'upstream_buckets',
+        sa.Column('source', sa.String(), nullable=False),
+        sa.Column('tokens', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('source'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('upstream_buckets')
@@ -0,0 +1,56 @@
+"""Shared news archive with full-text search
+
+Revision ID: f1c6d8a3e5b2
+Revises: e3a9f4b7c218
+Create Date: 2025-03-13 14:52:07.618420
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c6d8a3e5b2'
+down_revision: Union[str, None] = 'e3a9f4b7c218'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'news_articles',
+        sa.Column('id', sa.String(length=16), nullable=False),
+        sa.Column('link', sa.String(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('content', sa.String(), nullable=True),
+        sa.Column('truncated', sa.Boolean(), nullable=False),
+        sa.Column('source', sa.String(), nullable=False),
+        sa.Column('query', sa.String(), nullable=True),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            'search',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(content, '')), 'C')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_news_articles_search', 'news_articles', ['search'], postgresql_using='gin')
+    op.create_index(
+        'ix_news_articles_fetched_at', 'news_articles', [sa.text('fetched_at DESC')]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_articles_fetched_at', table_name='news_articles')
+    op.drop_index('ix_news_articles_search', table_name='news_articles')
+    op.drop_table('news_articles')
@@ -1,30 +1,32 @@
 # At the top of app.py
+import json
 import os
 import sys
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from datetime import datetime
-
 import chainlit as cl
-from chainlit.data.sql_alchemy import SQLAlchemyDataLayer
+from chainlit.data import get_data_layer
 from chainlit.types import (
     ThreadDict,
 )
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import selectinload
 
-from news_analyst_agent.agents.news_agent import NewsAnalystAgent
+from news_analyst_agent.agents.checkpoint import get_checkpointer
 from news_analyst_agent.db.database import AsyncSessionLocal
 from news_analyst_agent.db.models import Thread
+from news_analyst_agent.db.utils import utcnow
 from news_analyst_agent.config import get_settings
+from news_analyst_agent.log import configure_logging, log_context
+from news_analyst_agent.ui.data_layer import NewsAnalystDataLayer
 
 settings = get_settings()
+configure_logging(settings)
 
 @cl.data_layer
-def get_data_layer():
-    return SQLAlchemyDataLayer(conninfo=settings.ASYNC_DATABASE_URL, storage_provider=None)
+def build_data_layer():
+    return NewsAnalystDataLayer(conninfo=settings.ASYNC_DATABASE_URL, storage_provider=None)
 
 
 @cl.password_auth_callback
@@ -95,6 +97,18 @@ async def set_starters():
     ]
 
 
+async def flush_steps():
+    """Write the steps still buffered by the data layer Chainlit registered"""
+    data_layer = get_data_layer()
+    if data_layer is not None:
+        await data_layer.flush()
+
+
+@cl.on_chat_end
+async def on_chat_end():
+    await flush_steps()
+
+
 @cl.on_chat_resume
 async def on_chat_resume(thread: ThreadDict):
     pass
@@ -104,13 +118,10 @@ async def on_chat_resume(thread: ThreadDict):
 async def on_chat_start():
     # Ensure Thread exists
     # This is a workaround for the fact that sometimes the thread is not created. Should be a bug in chainlit.
-    engine = create_async_engine(settings.ASYNC_DATABASE_URL)
-    async_session = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False)
     async with AsyncSessionLocal() as session:
         thread = await session.get(Thread, cl.context.session.thread_id)
         if not thread:
-            thread = Thread(id=cl.context.session.thread_id, createdAt=datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%fZ"))
+            thread = Thread(id=cl.context.session.thread_id, createdAt=utcnow())
             session.add(thread)
             await session.commit()
             
@@ -128,12 +139,12 @@ async def get_thread_steps(thread_id: str):
         List of Step objects for the thread
 
     """
-    engine = create_async_engine(settings.ASYNC_DATABASE_URL)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
-    async with async_session() as session:
-        # Get the thread and its steps
-        thread = await session.get(Thread, thread_id)
+    async with AsyncSessionLocal() as session:
+        # Get the thread and eagerly load its steps; lazy loads can't run
+        # under an async session
+        thread = await session.get(
+            Thread, thread_id, options=[selectinload(Thread.steps)]
+        )
         if thread:
             return thread.steps
         return []
@@ -141,6 +152,12 @@ async def get_thread_steps(thread_id: str):
 
 @cl.on_message
 async def on_message(message: cl.Message):
+    """Answer a message, with the Chainlit thread as log context"""
+    with log_context(thread_id=cl.context.session.thread_id):
+        await answer(message)
+
+
+async def answer(message: cl.Message):
     """This function is called every time a user inputs a message in the UI.
     It sends back an intermediate response from the tool, followed by the final answer.
 
@@ -151,11 +168,19 @@ async def on_message(message: cl.Message):
         None.
 
     """
+    # The agent stack is loaded with the first message rather than at worker startup
+    from news_analyst_agent.agents.news_agent import NewsAnalystAgent
+
     input_lst = [HumanMessage(content=message.content)]
 
+    # Earlier turns of the conversation are restored from the checkpoint of
+    # this Chainlit thread, so only the new message is sent
     chat_profile = cl.user_session.get("chat_profile")
-    news_agent = NewsAnalystAgent(model_name=chat_profile)
-    agent = news_agent.create_agent()
+    news_agent = NewsAnalystAgent(
+        model_name=chat_profile,
+        checkpointer=await get_checkpointer(),
+        thread_id=cl.context.session.thread_id,
+    )
     use_tool = False
     
     async with cl.Step(name="Using tools") as step:
@@ -163,22 +188,32 @@ async def on_message(message: cl.Message):
         step.output = ""
         
     ui_msg = cl.Message(content="")
+    # One tool message per retrieval when the model issues several at once
+    news_reference = []
     
-    async for streaming_msg, _ in agent.astream(
-        {"messages": input_lst, "metadata": {}}, stream_mode="messages",
-    ):
-        
-        if isinstance(streaming_msg, ToolMessage):
-            news_reference = eval(streaming_msg.content)
-            step.input = "Retrieving news"
-            step.output = news_reference
-            await step.update()
-            use_tool = True
-
-        if isinstance(streaming_msg, AIMessage):
-            await ui_msg.stream_token(streaming_msg.content)
-        
-        await ui_msg.update()
+    try:
+        async for streaming_msg, _ in news_agent.agent.astream(
+            news_agent.turn_input(input_lst), stream_mode="messages",
+            config=news_agent.config,
+        ):
+            
+            if isinstance(streaming_msg, ToolMessage):
+                news_reference.extend(json.loads(streaming_msg.content))
+                step.input = "Retrieving news"
+                step.output = news_reference
+                await step.update()
+                use_tool = True
+
+            if isinstance(streaming_msg, AIMessage):
+                await ui_msg.stream_token(streaming_msg.content)
+    finally:
+        # Tokens only go to the client while streaming; the answer is
+        # persisted once at the end, also if the client went away mid-answer
+        if ui_msg.content:
+            await ui_msg.send()
+        # The message is complete; write its final state now rather than
+        # with the next timed flush
+        await flush_steps()
 
     if not use_tool:
         await step.remove()
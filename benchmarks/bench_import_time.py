@@ -0,0 +1,73 @@
+"""Measure cold import time of the application entry points.
+
+Each import runs in a fresh interpreter with ``-X importtime``, so the numbers
+include everything a new API or UI worker pays before it can serve. Usage::
+
+    python benchmarks/bench_import_time.py [--repeat 5] [--top 15] [module ...]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MODULES = [
+    "news_analyst_agent.main",
+    "news_analyst_agent.agents.news_agent",
+    "news_analyst_agent.db.database",
+]
+
+
+def profile_import(module: str) -> tuple[float, list[tuple[int, str]]]:
+    """Import ``module`` in a new interpreter.
+
+    Returns the wall time in seconds and ``(cumulative_us, module)`` entries
+    parsed from the ``-X importtime`` report.
+    """
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    env.setdefault("OPENAI_API_KEY", "benchmark")
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env, cwd=ROOT, check=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        entries.append((int(cumulative), name.strip()))
+    return elapsed, entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        runs = [profile_import(module) for _ in range(args.repeat)]
+        walls = [wall for wall, _ in runs]
+        print(
+            f"{module}: median {statistics.median(walls) * 1000:.0f} ms, "
+            f"min {min(walls) * 1000:.0f} ms over {args.repeat} runs"
+        )
+        # Top-level packages only, from the fastest run
+        _, entries = min(runs, key=lambda run: run[0])
+        packages = {}
+        for cumulative, name in entries:
+            top = name.split(".")[0]
+            packages[top] = max(packages.get(top, 0), cumulative)
+        for top, cumulative in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"  {cumulative / 1000:8.1f} ms  {top}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Measure the logging overhead of one chat request on the calling thread.
+
+Usage::
+
+    python benchmarks/bench_logging.py [--requests 200] [--body-size 20000] [--sink-latency-ms 0.05]
+
+A request logs what ``chat()`` and the graph nodes log for a turn with one
+retrieval: a few info records and a debug record per tool call and article.
+The ``before`` setup prints the request body and formats f-strings into a
+synchronous sink; the others use ``news_analyst_agent.log``: values passed as
+arguments, a background sink and debug sampling. The output is /dev/null
+behind a delay of ``--sink-latency-ms`` per record, like a slow terminal or
+pipe. Time spent writing on the background thread is reported separately.
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import time
+import timeit
+
+from loguru import logger
+
+from news_analyst_agent.api.chat_agent import ChatRequest, Message
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.log import configure_logging, flush_logs, log_context
+
+ARTICLES = 20
+
+
+def make_request(body_size: int) -> ChatRequest:
+    return ChatRequest(
+        messages=[
+            Message(role="user", content="q" * (body_size // 2)),
+            Message(role="assistant", content="a" * (body_size // 2)),
+        ]
+    )
+
+
+def request_before(request: ChatRequest, queries: list[str]):
+    print(f"alex-debug request {request}")
+    logger.info(f"Processing {len(queries)} tool calls with queries: {queries}")
+    for query in queries:
+        logger.debug(f"Invoking news retrieval tools with query: {query}")
+        logger.debug(f"Use ddg_search tool with query: {query}")
+    for i in range(ARTICLES):
+        logger.debug(f"Use yfinance_news tool with query: TSLA {i}")
+    logger.debug(f"Retrieved {ARTICLES} unique news items")
+    logger.info(f"News retriever found {ARTICLES} articles")
+
+
+def request_after(request: ChatRequest, queries: list[str]):
+    with log_context(request_id="0123456789abcdef", thread_id="thread-1"):
+        logger.debug("Chat request with {} messages, stream={}", len(request.messages), request.stream)
+        logger.info("Processing {} tool calls with queries: {}", len(queries), queries)
+        for query in queries:
+            logger.debug("Invoking news retrieval tools with query: {}", query)
+            logger.debug("Use ddg_search tool with query: {}", query)
+        for i in range(ARTICLES):
+            logger.debug("Use yfinance_news tool with query: {} {}", "TSLA", i)
+        logger.debug("Retrieved {} unique news items", ARTICLES)
+        logger.info("News retriever found {} articles", ARTICLES)
+
+
+class SlowStream:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.devnull = open(os.devnull, "w")
+
+    def write(self, message: str):
+        if self.latency:
+            time.sleep(self.latency)
+        self.devnull.write(message)
+
+    def flush(self):
+        self.devnull.flush()
+
+
+SETUPS = [
+    # label, request function, logging settings
+    ("before (print, f-strings, sync sink)", request_before, {"LOG_LEVEL": "DEBUG", "LOG_ENQUEUE": False}),
+    ("after, INFO", request_after, {"LOG_LEVEL": "INFO"}),
+    ("after, DEBUG sampled 10%", request_after, {"LOG_LEVEL": "DEBUG", "LOG_DEBUG_SAMPLE_RATE": 0.1}),
+    ("after, DEBUG", request_after, {"LOG_LEVEL": "DEBUG"}),
+    ("after, DEBUG JSON", request_after, {"LOG_LEVEL": "DEBUG", "LOG_JSON": True}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--body-size", type=int, default=20000)
+    parser.add_argument("--sink-latency-ms", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    request = make_request(args.body_size)
+    queries = ["tesla deliveries", "byd exports"]
+    print(
+        f"{args.requests} requests, {args.body_size} chars of messages, "
+        f"{args.sink_latency_ms} ms sink latency"
+    )
+    for label, request_func, overrides in SETUPS:
+        settings = get_settings().model_copy(update={"LOG_ENQUEUE": True, "LOG_JSON": False, **overrides})
+        configure_logging(settings, sink=SlowStream(args.sink_latency_ms / 1000))
+
+        def run():
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                for _ in range(args.requests):
+                    request_func(request, queries)
+
+        elapsed = min(timeit.repeat(run, number=1, repeat=args.repeat))
+        drain_start = time.perf_counter()
+        asyncio.run(flush_logs())
+        drain = time.perf_counter() - drain_start
+        print(
+            f"  {label:<38} {elapsed / args.requests * 1e6:8.1f} us/request on the caller"
+            f"  (+{drain * 1000:7.1f} ms draining the queue)"
+        )
+    logger.remove()
+
+
+if __name__ == "__main__":
+    main()
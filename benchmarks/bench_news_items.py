@@ -0,0 +1,113 @@
+"""Compare memory and throughput of news items as dicts and as ``NewsItem``.
+
+Usage::
+
+    python benchmarks/bench_news_items.py [--items 5000] [--content-size 2000]
+
+The pipeline step mirrors ``invoke_tools`` and the chat response: dedupe by
+link, drop the content into summaries and encode them in a ``ChatResponse``.
+"""
+import argparse
+import json
+import timeit
+import tracemalloc
+
+from news_analyst_agent.api.chat_agent import ChatResponse
+from news_analyst_agent.api.schemas import dump_json
+from news_analyst_agent.news_item import NewsItem
+
+SOURCES = ["ddg", "yfinance"]
+
+
+def raw_results(n: int, content_size: int) -> list[tuple]:
+    # Source names arrive as fresh strings, like values parsed from a response
+    return [
+        (
+            f"Article {i}",
+            f"https://example.com/news/{i % (n // 2 or 1)}",
+            "".join(SOURCES[i % 2]),
+            "d" * 200,
+            "c" * content_size,
+            "tesla",
+        )
+        for i in range(n)
+    ]
+
+
+def make_dicts(rows):
+    return [
+        {
+            "title": title, "description": description, "content": content,
+            "link": link, "query": query, "source": source, "published": None,
+        }
+        for title, link, source, description, content, query in rows
+    ]
+
+
+def make_items(rows):
+    return [
+        NewsItem(
+            title=title, link=link, source=source, description=description,
+            content=content, query=query,
+        )
+        for title, link, source, description, content, query in rows
+    ]
+
+
+def dict_pipeline(items):
+    seen, unique = set(), []
+    for item in items:
+        if item["link"] not in seen:
+            seen.add(item["link"])
+            unique.append(item)
+    summaries = [{k: v for k, v in item.items() if k != "content"} for item in unique]
+    return json.dumps({"messages": [], "news": summaries}).encode("utf8")
+
+
+def item_pipeline(items):
+    seen, unique = set(), []
+    for item in items:
+        if item.link not in seen:
+            seen.add(item.link)
+            unique.append(item)
+    return dump_json(ChatResponse(messages=[], news=[item.summary() for item in unique]))
+
+
+def measure_memory(build, rows) -> int:
+    """Bytes allocated by ``build`` that stay alive, excluding shared content strings"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = build(rows)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--content-size", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    rows = raw_results(args.items, args.content_size)
+    print(f"{args.items} items, {args.content_size} chars of content each")
+    for label, build, pipeline in [
+        ("dict", make_dicts, dict_pipeline),
+        ("NewsItem", make_items, item_pipeline),
+    ]:
+        memory = measure_memory(build, rows)
+        build_time = min(timeit.repeat(lambda: build(rows), number=1, repeat=args.repeat))
+        items = build(rows)
+        pipeline_time = min(
+            timeit.repeat(lambda: pipeline(items), number=1, repeat=args.repeat)
+        )
+        print(
+            f"  {label:<9} {memory / args.items:6.0f} B/item  "
+            f"build {build_time * 1000:7.2f} ms  pipeline {pipeline_time * 1000:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
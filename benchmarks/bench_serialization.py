@@ -0,0 +1,110 @@
+"""Compare serialization cost of large thread and news payloads.
+
+Usage::
+
+    python benchmarks/bench_serialization.py [--steps 500] [--news 50] [--repeat 20]
+
+``jsonable_encoder + json`` is what the API did with hand-built dicts;
+``typed dump_json`` is the current path through ``api.schemas``.
+"""
+import argparse
+import json
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from news_analyst_agent.api.chat_agent import ChatResponse
+from news_analyst_agent.api.schemas import ThreadBundle, dump_json
+
+
+def make_bundle(n_steps: int, text_size: int) -> dict:
+    thread_id = uuid.uuid4()
+    start = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    return {
+        "id": thread_id,
+        "name": "How did Tesla perform last quarter?",
+        "createdAt": start,
+        "userIdentifier": "admin",
+        "tags": ["finance"],
+        "metadata": {"model": "gpt-4o-mini"},
+        "steps": [
+            {
+                "id": uuid.uuid4(),
+                "name": "news_retriever",
+                "type": "tool",
+                "input": "q" * text_size,
+                "output": "o" * text_size,
+                "createdAt": start + timedelta(seconds=i),
+                "isError": False,
+                "metadata": {"index": i},
+            }
+            for i in range(n_steps)
+        ],
+        "feedbacks": [
+            {"id": uuid.uuid4(), "forId": uuid.uuid4(), "value": 1, "comment": None}
+        ],
+        "elements": [],
+    }
+
+
+def make_chat(n_news: int) -> dict:
+    return {
+        "messages": [
+            {"role": "user", "content": "how's tesla recent performance?"},
+            {"role": "assistant", "content": "a" * 2000},
+        ],
+        "news": [
+            {
+                "id": f"{i:016x}",
+                "title": f"Article {i}",
+                "description": "d" * 300,
+                "link": f"https://example.com/news/{i}",
+                "source": "yfinance",
+                "published": "2025-03-01T12:00:00+00:00",
+                "query": "tesla",
+            }
+            for i in range(n_news)
+        ],
+    }
+
+
+def bench(label: str, func, repeat: int):
+    size = len(func())
+    seconds = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f"  {label:<28} {seconds * 1000:8.2f} ms  {size / 1024:8.0f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--news", type=int, default=50)
+    parser.add_argument("--text-size", type=int, default=4096)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = [
+        (f"thread bundle ({args.steps} steps)", make_bundle(args.steps, args.text_size), ThreadBundle),
+        (f"chat response ({args.news} news)", make_chat(args.news), ChatResponse),
+    ]
+    for title, data, model in payloads:
+        typed = model.model_validate(data)
+        print(title)
+        bench(
+            "jsonable_encoder + json",
+            lambda data=data: json.dumps(jsonable_encoder(data)).encode("utf8"),
+            args.repeat,
+        )
+        bench("orjson (dicts)", lambda data=data: orjson.dumps(data), args.repeat)
+        bench(
+            "validate + dump_json",
+            lambda data=data, model=model: dump_json(model.model_validate(data)),
+            args.repeat,
+        )
+        bench("typed dump_json", lambda typed=typed: dump_json(typed), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
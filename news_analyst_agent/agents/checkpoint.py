@@ -0,0 +1,61 @@
+"""Postgres-backed LangGraph checkpoints.
+
+Conversation state is stored per ``thread_id`` in the application database, so
+a client only sends the new message of each turn and the graph resumes from
+the latest checkpoint. The saver only writes blobs for channels whose version
+changed in a step; old checkpoints are removed by
+``news_analyst_agent.tasks.checkpoints.prune_checkpoints``.
+"""
+import asyncio
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from news_analyst_agent.config import get_settings
+
+if TYPE_CHECKING:
+    from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+    from psycopg_pool import AsyncConnectionPool
+
+_pool: "AsyncConnectionPool | None" = None
+_checkpointer: "AsyncPostgresSaver | None" = None
+_lock = asyncio.Lock()
+
+
+async def get_checkpointer() -> "AsyncPostgresSaver":
+    """Return the process-wide checkpointer, creating its tables on first use"""
+    global _pool, _checkpointer
+    if _checkpointer is not None:
+        return _checkpointer
+
+    # psycopg is only needed by processes that actually resume conversations
+    from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+
+    async with _lock:
+        if _checkpointer is None:
+            settings = get_settings()
+            pool = AsyncConnectionPool(
+                conninfo=settings.DATABASE_URL,
+                min_size=1,
+                max_size=settings.CHECKPOINT_POOL_SIZE,
+                # Settings required by the saver: it manages its own
+                # transactions and rows are read as dicts
+                kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+                open=False,
+            )
+            await pool.open()
+            checkpointer = AsyncPostgresSaver(pool)
+            await checkpointer.setup()
+            _pool, _checkpointer = pool, checkpointer
+            logger.info("Postgres checkpointer ready")
+    return _checkpointer
+
+
+async def close_checkpointer():
+    """Close the checkpointer's connection pool"""
+    global _pool, _checkpointer
+    if _pool is not None:
+        await _pool.close()
+    _pool, _checkpointer = None, None
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class ModelName(str, Enum):
+    GPT_4_O = "gpt-4o"
+    GPT_4_O_MINI = "gpt-4o-mini"
+    LLAMA_3_2 = "llama3.2:latest"
@@ -1,14 +1,17 @@
+import asyncio
 import json
 from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from functools import partial
 from itertools import chain
 from typing import Annotated, List, Set
 from uuid import uuid4
 
-from langchain_core.messages import AIMessage, SystemMessage, ToolMessage
+from langchain_core.messages import AIMessage, RemoveMessage, SystemMessage, ToolMessage
 from langchain_core.messages.base import BaseMessage
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, StateGraph
 from loguru import logger
 
@@ -20,11 +23,14 @@ from news_analyst_agent.agents.news_analyst_prompts import (
 from news_analyst_agent.agents.utils import (
     ModelName,
     NewsAnalystState,
+    cap_news,
     get_llm,
-    retry_with_backoff,
+    trim_history,
 )
-from news_analyst_agent.tools.ddg_search import ddg_search
-from news_analyst_agent.tools.yfinance_news import yf_tool
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.metrics import metrics
+from news_analyst_agent.news_item import NewsItem
+from news_analyst_agent.news_store import store_news
 
 
 @tool
@@ -44,15 +50,27 @@ def chat_with_user(
 
 
 class NewsAnalystAgent:
-    def __init__(self, model_name: ModelName = ModelName.LLAMA_3_2, tracing: bool = False):
+    def __init__(
+        self,
+        model_name: ModelName = ModelName.LLAMA_3_2,
+        tracing: bool = False,
+        checkpointer: BaseCheckpointSaver | None = None,
+        thread_id: str | None = None,
+    ):
+        """Create the agent.
+
+        With a ``checkpointer``, the conversation state of ``thread_id`` is
+        persisted after every step and each run only needs the new messages.
+        """
         logger.info("Initializing NewsAnalystAgent")
         if model_name == ModelName.LLAMA_3_2:
             self.tools = [news_retriever, chat_with_user]
         else:
             self.tools = [news_retriever]
         self.model = get_llm(model_name, self.tools)
-        self.thread_id = str(uuid4())
-        if tracing:
+        self.checkpointer = checkpointer
+        self.thread_id = thread_id or str(uuid4())
+        if tracing or checkpointer is not None:
             self.config = {
                 "configurable": {
                     "thread_id": self.thread_id
@@ -62,62 +80,119 @@ class NewsAnalystAgent:
             self.config = None
         self.agent = self.create_agent()
 
-    def invoke_tools(self, query: str, entities: list[str]) -> List[dict]:
-        """Execute multiple news retrieval tools in parallel"""
-        logger.debug(f"Invoking news retrieval tools with query: {query}")
-        tasks = [
-            (partial(retry_with_backoff, ddg_search.invoke), query),
-        ]
-        if entities:
-            for entity in entities:
-                tasks.append(
-                    (partial(retry_with_backoff, yf_tool.invoke), entity)
-                )
+    def invoke_tools(self, query: str, entities: list[str]) -> List[NewsItem]:
+        """Retrieve news for a single query, see ``invoke_tool_calls``"""
+        return self.invoke_tool_calls([(query, entities)])[0]
+
+    def invoke_tool_calls(self, calls: list[tuple[str, list[str]]]) -> List[List[NewsItem]]:
+        """Execute the news retrieval tools of several tool calls in parallel.
+
+        Returns the news of each call in order. An article found by more than
+        one call is only kept for the first of them. Article content is moved
+        to the news store; the returned items are summaries that refer to it
+        by id.
+
+        Besides the live tools, each query is searched in the shared news
+        archive; live results come first when an article is found by both.
+        """
+        from news_analyst_agent.news_archive import search_archive
+        # Search clients and loaders are imported when news is first retrieved
+        from news_analyst_agent.tools.ddg_search import ddg_search
+        from news_analyst_agent.tools.retrieval_cache import cached_invoke
+        from news_analyst_agent.tools.yfinance_news import yf_tool
+
+        tasks = []
+        for call_index, (query, entities) in enumerate(calls):
+            logger.debug("Invoking news retrieval tools with query: {}", query)
+            tasks.append((call_index, partial(cached_invoke, ddg_search), query))
+            for entity in entities or []:
+                tasks.append((call_index, partial(cached_invoke, yf_tool), entity))
+            tasks.append((call_index, search_archive, query))
 
-        remove_duplicates: Set[str] = set()
-        filtered_res_lst = []
-        
         with ThreadPoolExecutor() as executor:
-            futures = [executor.submit(func, *args) for func, *args in tasks]
-            res_lst = [future.result() for future in futures]
-            res_lst = list(chain.from_iterable(res_lst))
-
-        for r in res_lst:
-            if r and r["link"] not in remove_duplicates:
-                remove_duplicates.add(r["link"])
-                filtered_res_lst.append(r)
-        
-        logger.debug(f"Retrieved {len(filtered_res_lst)} unique news items")
-        return filtered_res_lst
-
-    def node_call_tools(self, state: NewsAnalystState) -> dict:
-        """Handle tool calls and retrieve news"""
-        tool_call = state["messages"][-1].tool_calls[0]
-        query = tool_call["args"]["query"]
-        entities = tool_call["args"]["entities"]
-        logger.info(f"Processing tool call with query: {query}")
-
-        response = self.invoke_tools(query, entities)
-        logger.info(f"News retriever found {len(response)} articles")
-        
-        content = json.dumps([
-            {
-                "title": item["title"],
-                "description": item["description"]
-            } for item in response
-        ])
-        
-        message = ToolMessage(
-            content=content,
-            name="news_retriever",
-            tool_call_id=tool_call["id"],
+            # Each tool runs in a copy of this context to keep the request's log context
+            futures = [
+                (call_index, executor.submit(copy_context().run, func, arg))
+                for call_index, func, arg in tasks
+            ]
+            res_lst = [(call_index, future.result()) for call_index, future in futures]
+
+        remove_duplicates: Set[str] = set()
+        filtered_res_lst: List[List[NewsItem]] = [[] for _ in calls]
+        for call_index, results in res_lst:
+            for r in results:
+                if r and r.link not in remove_duplicates:
+                    remove_duplicates.add(r.link)
+                    filtered_res_lst[call_index].append(r)
+
+        logger.debug("Retrieved {} unique news items", len(remove_duplicates))
+        stored = iter(store_news(list(chain.from_iterable(filtered_res_lst))))
+        return [[next(stored) for _ in items] for items in filtered_res_lst]
+
+    async def node_call_tools(self, state: NewsAnalystState) -> dict:
+        """Handle the tool calls of the last message and retrieve news.
+
+        All calls are retrieved concurrently and answered with one tool
+        message each. With summarization enabled, the tool messages carry a
+        summary of each article's content where one is available, in place of
+        its description.
+
+        The news kept in the state and in the tool messages is capped by
+        ``AGENT_MAX_NEWS_ITEMS`` and ``AGENT_MAX_TOOL_CONTENT_CHARS``.
+        """
+        settings = get_settings()
+        tool_calls = state["messages"][-1].tool_calls
+        calls = [(call["args"]["query"], call["args"].get("entities", [])) for call in tool_calls]
+        logger.info("Processing {} tool calls with queries: {}", len(calls), [q for q, _ in calls])
+
+        responses = await asyncio.to_thread(self.invoke_tool_calls, calls)
+        found = sum(map(len, responses))
+        # Capped before summarizing so that no summaries are made for dropped news
+        responses = cap_news(responses, settings.AGENT_MAX_NEWS_ITEMS)
+        logger.info("News retriever found {} articles", found)
+
+        summaries = {}
+        if settings.SUMMARIZE_ENABLED and found:
+            from news_analyst_agent.agents.summarizer import summarize_news
+
+            summaries = await summarize_news(list(chain.from_iterable(responses)))
+
+        def tool_entry(item: NewsItem) -> dict:
+            return {
+                "title": item.title,
+                "description": summaries.get(item.id, item.description)
+            }
+
+        entries = {item.id: json.dumps(tool_entry(item)) for item in chain.from_iterable(responses)}
+        responses = cap_news(
+            responses,
+            settings.AGENT_MAX_NEWS_ITEMS,
+            settings.AGENT_MAX_TOOL_CONTENT_CHARS,
+            # The separator between entries is left out
+            size=lambda item: len(entries[item.id]),
         )
-        
-        logger.debug("News retriever message created successfully")
+        news = list(chain.from_iterable(responses))
+        if len(news) < found:
+            logger.warning("Kept {} of {} news articles within the state caps", len(news), found)
+            metrics.inc("agent_news_capped_total", found - len(news))
+
+        messages = []
+        for tool_call, response in zip(tool_calls, responses):
+            content = "[" + ", ".join(entries[item.id] for item in response) + "]"
+            metrics.observe("agent_tool_message_chars", len(content))
+            messages.append(
+                ToolMessage(
+                    content=content,
+                    name="news_retriever",
+                    tool_call_id=tool_call["id"],
+                )
+            )
+
+        logger.debug("News retriever messages created successfully")
         return {
-            "messages": [message],
+            "messages": messages,
             "metadata": {
-                "news": response
+                "news": news
             }
         }
         
@@ -128,20 +203,32 @@ class NewsAnalystAgent:
             if tool["name"] == "chat_with_user":
                 assistant_response = tool["args"]["query"]
         
-        state["messages"].pop(-1)
+        # The tool call is replaced by a plain answer
         ai_message = AIMessage(content=assistant_response)
         return {
-            "messages": [ai_message],
+            "messages": [RemoveMessage(id=state["messages"][-1].id), ai_message],
             "metadata": {}
         }
 
     def call_model(self, state: NewsAnalystState, config: RunnableConfig) -> dict:
-        """Call the LLM with the current state"""
+        """Call the LLM with the current state.
+
+        Turns beyond ``AGENT_MAX_MESSAGES`` messages are dropped from the
+        conversation, oldest first, and aren't sent to the model.
+        """
         logger.debug("Calling LLM model")
+        messages = state["messages"]
+        dropped = trim_history(messages, get_settings().AGENT_MAX_MESSAGES)
+        if dropped:
+            logger.info("Dropping {} old messages from the conversation", len(dropped))
+            metrics.inc("agent_messages_dropped_total", len(dropped))
+            messages = messages[len(dropped):]
+        metrics.observe("agent_state_messages", len(messages))
+
         system_prompt = SystemMessage(NEWS_ANALYST_AGENT_SYSTEM_PROMPT)
-        response = self.model.invoke([system_prompt] + state["messages"], config)
+        response = self.model.invoke([system_prompt] + list(messages), config)
         logger.debug("LLM response received")
-        return {"messages": [response]}
+        return {"messages": [RemoveMessage(id=message.id) for message in dropped] + [response]}
 
     @staticmethod
     def should_continue(state: NewsAnalystState) -> List[str]:
@@ -178,15 +265,21 @@ class NewsAnalystAgent:
         workflow.add_edge("chat_with_user", END)
 
         logger.info("News analyst agent workflow created successfully")
-        return workflow.compile()
+        return workflow.compile(checkpointer=self.checkpointer)
     
+    @staticmethod
+    def turn_input(msg_lst: list[BaseMessage]) -> dict:
+        """Graph input for one turn.
+
+        ``metadata`` is merged into checkpointed state, so the news of a
+        previous turn is reset rather than reported again.
+        """
+        return {"messages": msg_lst, "metadata": {"news": []}}
+
     async def arun(self, msg_lst: list[BaseMessage]):
         """Run the news analyst agent asynchronously"""
         res = await self.agent.ainvoke(
-            input={
-                "messages": msg_lst,
-                "metadata": {}
-            },
+            input=self.turn_input(msg_lst),
             config=self.config
         )
         return res
@@ -194,18 +287,19 @@ class NewsAnalystAgent:
     async def astream(self, msg_lst: list[BaseMessage], json_mode: bool = False):
         """Stream the news analyst agent"""
         async for streaming_msg, _ in self.agent.astream(
-            {"messages": msg_lst, "metadata": {}}, stream_mode="messages",
+            self.turn_input(msg_lst), stream_mode="messages",
             config=self.config
         ):
             if not json_mode:
                 if streaming_msg.content:
                     if isinstance(streaming_msg, ToolMessage):
-                        yield {"news": eval(streaming_msg.content)}
+                        yield {"news": json.loads(streaming_msg.content)}
                     if isinstance(streaming_msg, AIMessage):
                         yield {"chunk": streaming_msg.content}
             elif streaming_msg.content:
                 if isinstance(streaming_msg, ToolMessage):
-                    yield json.dumps({"news": eval(streaming_msg.content)})
+                    # The tool message already holds the news as JSON
+                    yield f'{{"news": {streaming_msg.content}}}'
                 if isinstance(streaming_msg, AIMessage):
                     yield json.dumps({"chunk": streaming_msg.content})
     
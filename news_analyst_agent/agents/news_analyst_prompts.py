@@ -43,3 +43,21 @@ Example: "will deepseek affect nvdia stock price?" -> ["deepseek", "nvdia"]; "co
 NEWS_ANALYST_AGENT_SYSTEM_PROMPT = """\
 You are a smart assistant that can help user with their questions.
 """
+
+SUMMARIZE_CHUNK_PROMPT = """\
+Summarize the following part of a news article in at most 3 sentences. \
+Keep facts, figures, names and dates; leave out boilerplate such as navigation, ads and disclaimers.
+
+Article: {title}
+
+{text}
+"""
+
+COMBINE_SUMMARIES_PROMPT = """\
+Combine these partial summaries of one news article into a single summary of at most 5 sentences. \
+Keep facts, figures, names and dates.
+
+Article: {title}
+
+{text}
+"""
@@ -0,0 +1,133 @@
+"""Map-reduce summaries of retrieved article content.
+
+The main model only sees titles and descriptions of the retrieved news unless
+summarization is enabled. Then each article's stored content is split into
+chunks that are summarized concurrently by a cheaper model (map), and the
+chunk summaries of an article are combined into one (reduce). Summaries are
+cached per article id, which is derived from the article URL, so an article
+is summarized once however many conversations retrieve it.
+"""
+import asyncio
+import time
+from typing import Any
+
+from langgraph.constants import TAG_NOSTREAM
+from loguru import logger
+
+from news_analyst_agent.agents.news_analyst_prompts import (
+    COMBINE_SUMMARIES_PROMPT,
+    SUMMARIZE_CHUNK_PROMPT,
+)
+from news_analyst_agent.cache import TTLCache
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.metrics import metrics
+from news_analyst_agent.news_item import NewsItem
+from news_analyst_agent.news_store import get_news
+
+settings = get_settings()
+
+summary_cache = TTLCache(
+    maxsize=settings.SUMMARY_CACHE_SIZE, ttl=settings.SUMMARY_CACHE_TTL_SECONDS
+)
+metrics.register_collector("summary_cache", summary_cache.stats)
+
+
+def chunk_text(text: str, chunk_chars: int, max_chunks: int) -> list[str]:
+    """Split text into at most ``max_chunks`` chunks of about ``chunk_chars``.
+
+    Chunks end at paragraph breaks where possible; a paragraph longer than a
+    chunk is cut at the limit. Text after the last chunk is dropped, the lead
+    of a news article carries most of its substance.
+    """
+    chunks, current = [], ""
+    for paragraph in text.split("\n\n"):
+        while len(paragraph) > chunk_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(paragraph[:chunk_chars])
+            paragraph = paragraph[chunk_chars:]
+        if current and len(current) + len(paragraph) + 2 > chunk_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+        if len(chunks) >= max_chunks:
+            break
+    if current:
+        chunks.append(current)
+    return [chunk for chunk in chunks[:max_chunks] if chunk.strip()]
+
+
+def get_summary_model(model: Any = None) -> Any:
+    """The summary model, tagged so that its tokens aren't streamed to users"""
+    if model is None:
+        from news_analyst_agent.agents.utils import get_chat_model
+
+        model = get_chat_model(settings.SUMMARY_MODEL)
+    return model.with_config(tags=[TAG_NOSTREAM], run_name="summarize_article")
+
+
+async def _complete(model: Any, semaphore: asyncio.Semaphore, prompt: str) -> str:
+    async with semaphore:
+        response = await model.ainvoke(prompt)
+    return response.content if hasattr(response, "content") else str(response)
+
+
+async def summarize_article(
+    item: NewsItem, model: Any, semaphore: asyncio.Semaphore
+) -> str | None:
+    """Summarize one article, returning None if there is no content to summarize"""
+    summary = summary_cache.get(item.id)
+    if summary is not None:
+        metrics.inc("summary_cache_total", result="hit")
+        return summary
+
+    stored = get_news(item.id)
+    if stored is None or not stored.content:
+        return None
+    metrics.inc("summary_cache_total", result="miss")
+
+    chunks = chunk_text(stored.content, settings.SUMMARY_CHUNK_CHARS, settings.SUMMARY_MAX_CHUNKS)
+    partials = await asyncio.gather(
+        *(
+            _complete(model, semaphore, SUMMARIZE_CHUNK_PROMPT.format(title=item.title, text=chunk))
+            for chunk in chunks
+        )
+    )
+    if len(partials) == 1:
+        summary = partials[0]
+    else:
+        summary = await _complete(
+            model,
+            semaphore,
+            COMBINE_SUMMARIES_PROMPT.format(title=item.title, text="\n\n".join(partials)),
+        )
+    summary_cache.set(item.id, summary)
+    return summary
+
+
+async def summarize_news(items: list[NewsItem], model: Any = None) -> dict[str, str]:
+    """Summarize the content of the given articles concurrently.
+
+    Returns the summaries by article id. Articles without content or whose
+    summary failed are left out, so the caller falls back to descriptions.
+    """
+    model = get_summary_model(model)
+    # One cap for all model calls of this batch, chunk and combine alike
+    semaphore = asyncio.Semaphore(settings.SUMMARY_CONCURRENCY)
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(summarize_article(item, model, semaphore) for item in items),
+        return_exceptions=True,
+    )
+
+    summaries = {}
+    for item, result in zip(items, results):
+        if isinstance(result, Exception):
+            logger.warning("Failed to summarize {}: {}", item.link, result)
+            metrics.inc("summary_errors_total")
+        elif result:
+            summaries[item.id] = result
+    metrics.observe("summarize_seconds", time.perf_counter() - start)
+    logger.debug("Summarized {} of {} articles", len(summaries), len(items))
+    return summaries
@@ -1,28 +1,45 @@
-import operator
 import time
-from enum import Enum
-from typing import Annotated, Any, Dict, Sequence, TypedDict
+from functools import lru_cache
+from itertools import zip_longest
+from typing import TYPE_CHECKING, Annotated, Any, Callable, Dict, Sequence, TypedDict
 
-from langchain_core.messages import BaseMessage
-from langchain_core.tools import BaseTool
-from langchain_ollama import ChatOllama
-from langchain_openai import ChatOpenAI
+from langchain_core.messages import BaseMessage, HumanMessage
+from langgraph.graph.message import add_messages
 
+from loguru import logger
 
-class ModelName(str, Enum):
-    GPT_4_O = "gpt-4o"
-    GPT_4_O_MINI = "gpt-4o-mini"
-    LLAMA_3_2 = "llama3.2:latest"
+from news_analyst_agent.agents.model_names import ModelName
+from news_analyst_agent.cassette import get_llm_cache
+from news_analyst_agent.news_item import NewsItem
+from news_analyst_agent.tools.upstream import UpstreamUnavailable
 
+if TYPE_CHECKING:
+    from langchain_core.tools import BaseTool
 
-def get_llm(model_name: ModelName, tools: list[BaseTool] = None, temperature: float = 0):
+
+@lru_cache(maxsize=None)
+def get_chat_model(model_name: ModelName, temperature: float = 0):
+    """Return the shared chat model for a name and temperature.
+
+    Chat models are stateless, and sharing one per process keeps its HTTP
+    connection pool (warmed up at startup) across requests.
+    """
+    # Model backends are imported on first use; each pulls in its own client
+    # library and neither is needed to start the API
+    cache = get_llm_cache()
     if model_name == ModelName.GPT_4_O_MINI or model_name == ModelName.GPT_4_O:
-        model = ChatOpenAI(model=model_name, temperature=temperature)
-    elif model_name == ModelName.LLAMA_3_2:
-        model = ChatOllama(model=model_name, temperature=temperature)
-    else:
-        raise ValueError(f"Invalid model name: {model_name}")
-    
+        from langchain_openai import ChatOpenAI
+
+        return ChatOpenAI(model=model_name, temperature=temperature, cache=cache)
+    if model_name == ModelName.LLAMA_3_2:
+        from langchain_ollama import ChatOllama
+
+        return ChatOllama(model=model_name, temperature=temperature, cache=cache)
+    raise ValueError(f"Invalid model name: {model_name}")
+
+
+def get_llm(model_name: ModelName, tools: list["BaseTool"] = None, temperature: float = 0):
+    model = get_chat_model(model_name, temperature)
     if tools:
         model = model.bind_tools(tools)
     
@@ -34,7 +51,9 @@ def merge_dicts(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
 
 
 class AgentState(TypedDict):
-    messages: Annotated[Sequence[BaseMessage], operator.add]
+    # add_messages appends like list concatenation, and also lets nodes drop
+    # messages by returning a RemoveMessage with their id
+    messages: Annotated[Sequence[BaseMessage], add_messages]
     metadata: Annotated[Dict[str, Any], merge_dicts]
 
 
@@ -42,19 +61,74 @@ class NewsAnalystState(AgentState):
     pass
 
 
-def retry_with_backoff(func, *args, max_retries=3, initial_delay=1):
-    """Retry a function with exponential backoff"""
+def trim_history(messages: Sequence[BaseMessage], max_messages: int) -> list[BaseMessage]:
+    """The oldest messages to drop so that at most ``max_messages`` remain.
+
+    Only whole turns are dropped, so the kept messages start with a human
+    message and every tool message keeps the AI message that called it. The
+    current turn is never dropped, even if it alone exceeds the cap.
+    """
+    if len(messages) <= max_messages:
+        return []
+    turn_starts = [i for i, message in enumerate(messages) if isinstance(message, HumanMessage)]
+    if not turn_starts:
+        return []
+    cut = next((i for i in turn_starts if len(messages) - i <= max_messages), turn_starts[-1])
+    return list(messages[:cut])
+
+
+def cap_news(
+    responses: list[list[NewsItem]],
+    max_items: int,
+    max_chars: int | None = None,
+    size: Callable[[NewsItem], int] | None = None,
+) -> list[list[NewsItem]]:
+    """Keep at most ``max_items`` of the news of several tool calls, and at most
+    ``max_chars`` of their ``size``.
+
+    The calls take turns, first results first, so that each call keeps its
+    best results. The order of the kept news is unchanged.
+    """
+    kept: set[str] = set()
+    chars = 0
+    for rank in zip_longest(*responses):
+        for item in rank:
+            if item is None:
+                continue
+            if len(kept) >= max_items:
+                break
+            item_chars = size(item) if size is not None else 0
+            if max_chars is not None and chars + item_chars > max_chars:
+                continue
+            kept.add(item.id)
+            chars += item_chars
+    return [[item for item in response if item.id in kept] for response in responses]
+
+
+def retry_with_backoff(func, *args, max_retries=3, initial_delay=1, reraise=False):
+    """Retry a function with exponential backoff.
+
+    Gives up at once on a source that is rate limited or whose circuit is open,
+    retrying would only add to its load. A call that still fails returns an
+    empty list, or raises its last error with ``reraise``.
+    """
     for attempt in range(max_retries):
         try:
             return func(*args)
+        except UpstreamUnavailable as e:
+            logger.warning("Not retrying: {}", e)
+            if reraise:
+                raise
+            return []
         except Exception as e:
             if attempt == max_retries - 1:  # Last attempt
-                print(f"Failed after {max_retries} attempts: {str(e)}")
+                logger.error("Failed after {} attempts: {}", max_retries, e)
+                if reraise:
+                    raise
                 return []  # Return empty list on complete failure
             
             delay = initial_delay * (2 ** attempt)  # Exponential backoff
-            print(f"error: {e}")
-            print(f"Attempt {attempt + 1} failed, retrying in {delay} seconds...")
+            logger.warning("Attempt {} failed, retrying in {} seconds: {}", attempt + 1, delay, e)
             time.sleep(delay)
     
     return []  # Fallback return if somehow we get here
@@ -0,0 +1,189 @@
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from news_analyst_agent.api.auth import verify_admin
+from news_analyst_agent.api.schemas import (
+    AnalyticsRefreshOut,
+    FeedbackSummaryOut,
+    LatencyOut,
+    UsageOut,
+    json_response,
+)
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.db.database import get_db
+from news_analyst_agent.db.models import (
+    AnalyticsFeedbackDaily,
+    AnalyticsStepsDaily,
+    AnalyticsThreadsDaily,
+)
+from news_analyst_agent.tasks.analytics import refresh_analytics
+
+router = APIRouter()
+
+# All endpoints read the summary tables kept by the refresh_analytics job, so
+# they lag behind the steps and feedbacks tables by up to one refresh interval.
+
+
+def date_range(start: date | None, end: date | None) -> tuple[date, date]:
+    """Resolve an inclusive day range, by default the last ANALYTICS_DEFAULT_DAYS days"""
+    # Summaries are kept per UTC day
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=get_settings().ANALYTICS_DEFAULT_DAYS - 1)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start is after end")
+    return start, end
+
+
+def _filter(stmt, model, start: date, end: date, chat_profile: str | None):
+    stmt = stmt.where(model.day >= start, model.day <= end)
+    if chat_profile is not None:
+        stmt = stmt.where(model.chat_profile == chat_profile)
+    return stmt
+
+
+def _rate(part: int, total: int) -> float | None:
+    return part / total if total else None
+
+
+@router.get("/analytics/usage", response_model=list[UsageOut], tags=["Analytics"])
+async def get_usage(
+    start: date | None = None,
+    end: date | None = None,
+    chat_profile: str | None = None,
+    db: AsyncSession = Depends(get_db),
+    _: str = Depends(verify_admin)
+):
+    """Threads, steps and failed steps per day and chat profile"""
+    start, end = date_range(start, end)
+    threads = await db.execute(
+        _filter(
+            select(AnalyticsThreadsDaily.day, AnalyticsThreadsDaily.chat_profile, AnalyticsThreadsDaily.threads),
+            AnalyticsThreadsDaily, start, end, chat_profile,
+        )
+    )
+    steps = await db.execute(
+        _filter(
+            select(
+                AnalyticsStepsDaily.day,
+                AnalyticsStepsDaily.chat_profile,
+                func.sum(AnalyticsStepsDaily.steps).label("steps"),
+                func.sum(AnalyticsStepsDaily.error_steps).label("error_steps"),
+            ).group_by(AnalyticsStepsDaily.day, AnalyticsStepsDaily.chat_profile),
+            AnalyticsStepsDaily, start, end, chat_profile,
+        )
+    )
+
+    usage: dict[tuple[date, str], dict] = {}
+    for row in threads:
+        usage[row.day, row.chat_profile] = {"threads": row.threads, "steps": 0, "error_steps": 0}
+    for row in steps:
+        entry = usage.setdefault((row.day, row.chat_profile), {"threads": 0})
+        entry.update(steps=row.steps, error_steps=row.error_steps)
+
+    return json_response(
+        [
+            UsageOut(
+                day=day,
+                chat_profile=profile,
+                error_rate=_rate(entry["error_steps"], entry["steps"]),
+                **entry,
+            )
+            for (day, profile), entry in sorted(usage.items())
+        ],
+        list[UsageOut],
+    )
+
+
+@router.get("/analytics/feedback", response_model=list[FeedbackSummaryOut], tags=["Analytics"])
+async def get_feedback_summary(
+    start: date | None = None,
+    end: date | None = None,
+    chat_profile: str | None = None,
+    db: AsyncSession = Depends(get_db),
+    _: str = Depends(verify_admin)
+):
+    """Feedback score distribution per chat profile, for threads created in the range"""
+    start, end = date_range(start, end)
+    result = await db.execute(
+        _filter(
+            select(
+                AnalyticsFeedbackDaily.chat_profile,
+                AnalyticsFeedbackDaily.value,
+                func.sum(AnalyticsFeedbackDaily.feedbacks).label("feedbacks"),
+            ).group_by(AnalyticsFeedbackDaily.chat_profile, AnalyticsFeedbackDaily.value),
+            AnalyticsFeedbackDaily, start, end, chat_profile,
+        )
+    )
+
+    distributions: dict[str, dict[int, int]] = {}
+    for row in result:
+        distributions.setdefault(row.chat_profile, {})[row.value] = row.feedbacks
+
+    summaries = []
+    for profile, distribution in sorted(distributions.items()):
+        feedbacks = sum(distribution.values())
+        total = sum(value * count for value, count in distribution.items())
+        summaries.append(
+            FeedbackSummaryOut(
+                chat_profile=profile,
+                feedbacks=feedbacks,
+                average=_rate(total, feedbacks),
+                distribution=dict(sorted(distribution.items())),
+            )
+        )
+    return json_response(summaries, list[FeedbackSummaryOut])
+
+
+@router.get("/analytics/latency", response_model=list[LatencyOut], tags=["Analytics"])
+async def get_latency(
+    start: date | None = None,
+    end: date | None = None,
+    chat_profile: str | None = None,
+    db: AsyncSession = Depends(get_db),
+    _: str = Depends(verify_admin)
+):
+    """Step latency (``end`` - ``start``) and error rate per chat profile and step type"""
+    start, end = date_range(start, end)
+    result = await db.execute(
+        _filter(
+            select(
+                AnalyticsStepsDaily.chat_profile,
+                AnalyticsStepsDaily.step_type,
+                func.sum(AnalyticsStepsDaily.steps).label("steps"),
+                func.sum(AnalyticsStepsDaily.error_steps).label("error_steps"),
+                func.sum(AnalyticsStepsDaily.timed_steps).label("timed_steps"),
+                func.sum(AnalyticsStepsDaily.latency_seconds_sum).label("latency_seconds_sum"),
+                func.max(AnalyticsStepsDaily.latency_seconds_max).label("latency_seconds_max"),
+            )
+            .group_by(AnalyticsStepsDaily.chat_profile, AnalyticsStepsDaily.step_type)
+            .order_by(AnalyticsStepsDaily.chat_profile, AnalyticsStepsDaily.step_type),
+            AnalyticsStepsDaily, start, end, chat_profile,
+        )
+    )
+    return json_response(
+        [
+            LatencyOut(
+                chat_profile=row.chat_profile,
+                step_type=row.step_type,
+                steps=row.steps,
+                error_rate=_rate(row.error_steps, row.steps),
+                timed_steps=row.timed_steps,
+                avg_seconds=_rate(row.latency_seconds_sum, row.timed_steps),
+                max_seconds=row.latency_seconds_max,
+            )
+            for row in result
+        ],
+        list[LatencyOut],
+    )
+
+
+@router.post("/analytics/refresh", response_model=AnalyticsRefreshOut, tags=["Analytics"])
+async def post_refresh(
+    full: bool = False,
+    _: str = Depends(verify_admin)
+):
+    """Bring the summary tables up to date now instead of at the next scheduled refresh"""
+    return json_response(AnalyticsRefreshOut(**await refresh_analytics(full)))
@@ -0,0 +1,97 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable
+from uuid import UUID
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from news_analyst_agent.api.schemas import dump_json
+from news_analyst_agent.cache import TTLCache
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.db.models import Thread
+from news_analyst_agent.metrics import metrics
+
+settings = get_settings()
+
+# Serialized response bodies keyed by ETag. The ETag embeds the thread's
+# updatedAt, so any write to the thread or its children makes old entries
+# unreachable and they simply age out.
+response_cache = TTLCache(
+    maxsize=settings.RESPONSE_CACHE_SIZE, ttl=settings.RESPONSE_CACHE_TTL_SECONDS
+)
+metrics.register_collector("response_cache", response_cache.stats)
+
+
+async def get_thread_version(db: AsyncSession, thread_id: UUID) -> datetime | None:
+    """Return the thread's updatedAt, raising 404 if the thread doesn't exist"""
+    result = await db.execute(
+        select(Thread.id, Thread.updatedAt).where(Thread.id == thread_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Thread not found")
+    return row.updatedAt
+
+
+def make_etag(request: Request, version: datetime | None) -> str:
+    """Weak ETag for a thread-scoped URL at a given thread version"""
+    stamp = version.isoformat() if version else ""
+    key = f"{request.url.path}?{request.url.query}@{stamp}"
+    return f'W/"{hashlib.sha1(key.encode("utf8")).hexdigest()}"'
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {tag.strip() for tag in if_none_match.split(",")}
+        return etag in candidates or "*" in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have a one second resolution
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+async def conditional_thread_response(
+    request: Request,
+    db: AsyncSession,
+    thread_id: UUID,
+    loader: Callable[[], Awaitable[Any]],
+    type_: Any | None = None,
+) -> Response:
+    """Serve thread-scoped data with ETag/Last-Modified validation.
+
+    Unchanged threads are answered with ``304 Not Modified`` after a single
+    primary-key lookup; otherwise the body comes from the read-through cache
+    and ``loader`` only runs on a miss. The loaded value is serialized as
+    ``type_`` (or its own model type), so the cache holds ready-to-send bytes.
+    """
+    version = await get_thread_version(db, thread_id)
+    etag = make_etag(request, version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if version is not None:
+        headers["Last-Modified"] = format_datetime(
+            version.astimezone(timezone.utc), usegmt=True
+        )
+
+    if is_not_modified(request, etag, version):
+        metrics.inc("conditional_get_total", result="not_modified")
+        return Response(status_code=304, headers=headers)
+
+    body = response_cache.get(etag)
+    if body is None:
+        metrics.inc("conditional_get_total", result="miss")
+        body = dump_json(await loader(), type_)
+        response_cache.set(etag, body)
+    else:
+        metrics.inc("conditional_get_total", result="hit")
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,13 +1,14 @@
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
-from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from news_analyst_agent.agents.news_agent import NewsAnalystAgent
-from news_analyst_agent.agents.utils import ModelName
+from news_analyst_agent.agents.checkpoint import get_checkpointer
+from news_analyst_agent.agents.model_names import ModelName
 from news_analyst_agent.api.auth import verify_admin
+from news_analyst_agent.api.schemas import NewsItemOut, json_response
+from news_analyst_agent.log import add_log_context
 
 router = APIRouter()
 
@@ -21,6 +22,13 @@ class ChatRequest(BaseModel):
     messages: list[Message]
     model: ModelName = ModelName.LLAMA_3_2
     stream: bool = False
+    thread_id: str | None = Field(
+        None,
+        description=(
+            "Resume this conversation from its saved state. "
+            "`messages` then only holds the new message(s)."
+        ),
+    )
     
     model_config = {
         "json_schema_extra": {
@@ -40,6 +48,15 @@ class ChatRequest(BaseModel):
                             "content": "how's tesla recent performance?"
                         }
                     ]
+                },
+                {
+                    "thread_id": "5f0c1d9e-2b4f-4a51-9d0e-6a1f2c3b4d5e",
+                    "messages": [
+                        {
+                            "role": "user",
+                            "content": "and how does that compare to BYD?"
+                        }
+                    ]
                 }
             ]
         }
@@ -48,7 +65,8 @@ class ChatRequest(BaseModel):
 
 class ChatResponse(BaseModel):
     messages: list[Message]
-    news: list[dict] | None = None
+    thread_id: str | None = None
+    news: list[NewsItemOut] | None = None
 
 
 @router.post("/chat", response_model=ChatResponse, tags=["Chat"])
@@ -57,10 +75,31 @@ async def chat(
     _: str = Depends(verify_admin)
 ):
     """Chat endpoint that uses NewsAnalystAgent"""
+    # The agent stack (LangChain, LangGraph, model clients and tools) is
+    # loaded on the first chat request rather than at application startup
+    from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+    from news_analyst_agent.agents.news_agent import NewsAnalystAgent
+
     try:
         model_name = request.model
-        agent = NewsAnalystAgent(model_name=model_name)
-        print(f"alex-debug request {request}")
+        history = []
+        if request.thread_id is None:
+            agent = NewsAnalystAgent(model_name=model_name)
+        else:
+            agent = NewsAnalystAgent(
+                model_name=model_name,
+                checkpointer=await get_checkpointer(),
+                thread_id=request.thread_id,
+            )
+            # Only this turn's messages are returned, not the saved history
+            state = await agent.agent.aget_state(agent.config)
+            history = state.values.get("messages", [])
+        add_log_context(thread_id=agent.thread_id, model=model_name)
+        # Message contents are left out; they can be large and private
+        logger.debug(
+            "Chat request with {} messages, stream={}", len(request.messages), request.stream
+        )
         
         lg_msg_lst = []
         for msg in request.messages:
@@ -74,8 +113,15 @@ async def chat(
         # Run agent
         if not request.stream:
             lg_result = await agent.arun(lg_msg_lst)
+            history_ids = {msg.id for msg in history}
+            if None in history_ids:
+                # Saved before messages had ids; the new ones follow the history
+                new_messages = lg_result["messages"][len(history):]
+            else:
+                # Old turns may have been dropped, see AGENT_MAX_MESSAGES
+                new_messages = [msg for msg in lg_result["messages"] if msg.id not in history_ids]
             result = []
-            for msg in lg_result["messages"]:
+            for msg in new_messages:
                 if msg.content:
                     if isinstance(msg, AIMessage):
                         result.append({"role": "assistant", "content": msg.content})
@@ -84,14 +130,14 @@ async def chat(
                     elif isinstance(msg, HumanMessage):
                         result.append({"role": "user", "content": msg.content})
                     else:
-                        logger.warning(f"Unknown message type {type(msg)}")
-                        logger.warning(f"Unknown message {msg}")
-            return ChatResponse(
+                        logger.warning("Unknown message type {}", type(msg))
+            return json_response(ChatResponse(
                 messages=result,
+                thread_id=request.thread_id,
                 news=lg_result["metadata"]["news"]
-            )
+            ))
         return StreamingResponse(agent.astream(lg_msg_lst, json_mode=True))
 
     except Exception as e:
-        logger.error(f"Error in chat endpoint: {str(e)}")
+        logger.error("Error in chat endpoint: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from news_analyst_agent.api.auth import verify_admin
+from news_analyst_agent.export import iter_export_records, iter_ndjson
+
+router = APIRouter()
+
+@router.get("/export", tags=["Export"])
+async def export_threads(
+    since: datetime | None = None,
+    until: datetime | None = None,
+    userIdentifier: str | None = None,
+    gzip: bool = False,
+    _: str = Depends(verify_admin)
+):
+    """Stream threads, steps and feedbacks as NDJSON, optionally gzip-compressed"""
+    # The export opens its own session: request-scoped dependencies are
+    # closed before a streaming response body is sent
+    records = iter_export_records(since, until, userIdentifier)
+    filename = "export.ndjson.gz" if gzip else "export.ndjson"
+    return StreamingResponse(
+        iter_ndjson(records, compress=gzip),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,4 +1,7 @@
 from fastapi import APIRouter, status
+from fastapi.responses import ORJSONResponse
+
+from news_analyst_agent.warmup import warmup_state
 
 router = APIRouter()
 
@@ -6,4 +9,19 @@ router = APIRouter()
 async def health_check():
     return {
         "status": "healthy"
-    }
\ No newline at end of file
+    }
+
+@router.get("/health/ready", tags=["Health"])
+async def readiness_check():
+    """Report ready once the startup warm-up has finished, 503 until then"""
+    return ORJSONResponse(
+        status_code=(
+            status.HTTP_200_OK if warmup_state.ready
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+        content={
+            "status": "ready" if warmup_state.ready else "warming_up",
+            "warmup": warmup_state.steps,
+            "warmup_seconds": warmup_state.duration,
+        },
+    )
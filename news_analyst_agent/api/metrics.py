@@ -0,0 +1,27 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+
+from news_analyst_agent.api.auth import verify_admin
+from news_analyst_agent.memory import memory_stats, top_allocations
+from news_analyst_agent.metrics import metrics
+
+router = APIRouter()
+
+@router.get("/metrics", response_model=dict, tags=["Metrics"])
+async def get_metrics(_: str = Depends(verify_admin)):
+    """Get a snapshot of the in-process metrics"""
+    return metrics.snapshot()
+
+
+@router.get("/metrics/memory", response_model=dict, tags=["Metrics"])
+async def get_memory(
+    limit: int = Query(20, ge=1, le=200),
+    group_by: Literal["lineno", "filename"] = "lineno",
+    _: str = Depends(verify_admin)
+):
+    """Get the memory use of this process and, with MEMORY_PROFILING, its largest allocations"""
+    return {
+        "stats": memory_stats(),
+        "top_allocations": top_allocations(limit, group_by),
+    }
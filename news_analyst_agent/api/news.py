@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from news_analyst_agent.api.auth import verify_admin
+from news_analyst_agent.api.schemas import NewsArticleOut, json_response
+from news_analyst_agent.news_archive import get_archived
+from news_analyst_agent.news_store import get_news
+
+router = APIRouter()
+
+@router.get("/news/{news_id}", response_model=NewsArticleOut, tags=["News"])
+async def get_news_article(
+    news_id: str,
+    _: str = Depends(verify_admin)
+):
+    """Get the cleaned content of a retrieved article by the id from its summary.
+
+    Articles no longer in this process's news store are read from the archive.
+    """
+    article = get_news(news_id)
+    if article is None:
+        article = await get_archived(news_id)
+    if article is None:
+        raise HTTPException(status_code=404, detail="News article not found")
+    
+    return json_response(NewsArticleOut.model_validate(article))
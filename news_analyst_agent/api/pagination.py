@@ -0,0 +1,80 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, Select, and_, or_
+
+from news_analyst_agent.db.utils import parse_timestamp
+
+
+def encode_cursor(created_at: Any, row_id: UUID) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor"""
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    payload = json.dumps([created_at, str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Any, UUID]:
+    """Decode a cursor produced by ``encode_cursor``"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return created_at, UUID(row_id)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def paginate(
+    query: Select,
+    created_col,
+    id_col,
+    limit: int,
+    cursor: str | None = None,
+    descending: bool = False,
+) -> Select:
+    """Apply keyset pagination ordered by (created_col, id_col).
+
+    Rows without a creation time sort last in both directions, so the keyset
+    predicate has to treat them as their own trailing partition.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        if isinstance(created_col.type, DateTime):
+            try:
+                created_at = parse_timestamp(created_at)
+            except (ValueError, AttributeError) as e:
+                raise HTTPException(status_code=400, detail="Invalid cursor") from e
+        id_after = id_col < row_id if descending else id_col > row_id
+        if created_at is None:
+            query = query.where(and_(created_col.is_(None), id_after))
+        else:
+            created_after = (
+                created_col < created_at if descending else created_col > created_at
+            )
+            query = query.where(
+                or_(
+                    created_after,
+                    and_(created_col == created_at, id_after),
+                    created_col.is_(None),
+                )
+            )
+
+    if descending:
+        order_by = (created_col.desc().nulls_last(), id_col.desc())
+    else:
+        order_by = (created_col.asc().nulls_last(), id_col.asc())
+    # Fetch one extra row to know whether there is a next page
+    return query.order_by(*order_by).limit(limit + 1)
+
+
+def split_page(rows: list, limit: int, created_attr: str = "createdAt"):
+    """Trim the look-ahead row and build the cursor for the next page"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, created_attr), last.id)
@@ -0,0 +1,76 @@
+from typing import Literal
+
+from fastapi import HTTPException
+from sqlalchemy import func
+
+from news_analyst_agent.api.schemas import StepOut
+from news_analyst_agent.db.models import Step
+
+StepMode = Literal["summary", "full"]
+
+# Response field name -> Step column
+STEP_COLUMNS = {
+    "id": Step.id,
+    "threadId": Step.threadId,
+    "parentId": Step.parentId,
+    "name": Step.name,
+    "type": Step.type,
+    "createdAt": Step.createdAt,
+    "start": Step.start,
+    "end": Step.end,
+    "isError": Step.isError,
+    "tags": Step.tags,
+    "metadata": Step.metadata_,
+    "input": Step.input,
+    "output": Step.output,
+    "generation": Step.generation,
+}
+
+# Potentially huge fields that are only loaded when asked for
+LARGE_STEP_FIELDS = {"input", "output", "generation"}
+TRUNCATABLE_STEP_FIELDS = {"input", "output"}
+
+SUMMARY_STEP_FIELDS = ["id", "name", "type", "createdAt", "isError"]
+FULL_STEP_FIELDS = [
+    "id", "name", "type", "input", "output", "createdAt", "isError", "metadata"
+]
+# Needed to build pagination cursors, so always part of the projection
+REQUIRED_STEP_FIELDS = ["id", "createdAt"]
+
+
+def resolve_step_fields(fields: str | None, mode: StepMode) -> list[str]:
+    """Turn a ``?fields=`` list or a mode into the list of step fields to return"""
+    if not fields:
+        names = SUMMARY_STEP_FIELDS if mode == "summary" else FULL_STEP_FIELDS
+    else:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in names if name not in STEP_COLUMNS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown step fields: {', '.join(unknown)}",
+            )
+    return list(dict.fromkeys(REQUIRED_STEP_FIELDS + names))
+
+
+def step_columns(names: list[str], truncate: int | None = None) -> list:
+    """Labeled columns for a projected ``select()``, truncating large text in SQL"""
+    columns = []
+    for name in names:
+        column = STEP_COLUMNS[name]
+        if truncate is not None and name in TRUNCATABLE_STEP_FIELDS:
+            column = func.left(column, truncate)
+        columns.append(column.label(name))
+    return columns
+
+
+def step_from_row(row, names: list[str]) -> StepOut:
+    """Build a step schema from a projected row, leaving other fields unset"""
+    return StepOut.model_validate({name: getattr(row, name) for name in names})
+
+
+def step_from_orm(step: Step, names: list[str]) -> StepOut:
+    """Build a step schema from the given fields of a Step ORM object"""
+    return StepOut.model_validate(
+        {name: getattr(step, STEP_COLUMNS[name].key) for name in names}
+    )
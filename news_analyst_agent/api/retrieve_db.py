@@ -1,139 +1,259 @@
-from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from news_analyst_agent.api.auth import verify_admin
+from news_analyst_agent.api.caching import conditional_thread_response
+from news_analyst_agent.api.pagination import paginate, split_page
+from news_analyst_agent.api.projection import (
+    STEP_COLUMNS,
+    StepMode,
+    resolve_step_fields,
+    step_columns,
+    step_from_orm,
+    step_from_row,
+)
+from news_analyst_agent.api.schemas import (
+    ElementOut,
+    FeedbackOut,
+    StepOut,
+    StepPage,
+    ThreadBundle,
+    ThreadOut,
+    ThreadPage,
+    json_response,
+)
 from news_analyst_agent.db.database import get_db
-from news_analyst_agent.db.models import Feedback, Step, Thread
+from news_analyst_agent.db.models import Element, Feedback, Step, Thread
 
 router = APIRouter()
 
+MAX_BUNDLE_IDS = 50
+
+
+def thread_fields(thread: Thread) -> dict:
+    return {
+        "id": thread.id,
+        "name": thread.name,
+        "createdAt": thread.createdAt,
+        "userIdentifier": thread.userIdentifier,
+        "tags": thread.tags,
+        "metadata": thread.metadata_
+    }
+
+
+def thread_out(thread: Thread) -> ThreadOut:
+    return ThreadOut(**thread_fields(thread))
+
+
+def feedback_out(feedback: Feedback) -> FeedbackOut:
+    return FeedbackOut(
+        id=feedback.id,
+        forId=feedback.forId,
+        value=feedback.value,
+        comment=feedback.comment
+    )
+
+
+def element_out(element: Element) -> ElementOut:
+    return ElementOut(
+        id=element.id,
+        forId=element.forId,
+        type=element.type,
+        name=element.name,
+        url=element.url,
+        display=element.display,
+        mime=element.mime,
+        size=element.size,
+        language=element.language,
+        page=element.page
+    )
+
+
+def bundle_query(thread_ids: list[UUID], mode: StepMode):
+    """Threads with their steps, feedbacks and elements in four round trips"""
+    step_fields = resolve_step_fields(None, mode)
+    return (
+        select(Thread)
+        .where(Thread.id.in_(thread_ids))
+        .options(
+            selectinload(Thread.steps).load_only(
+                *(STEP_COLUMNS[name] for name in step_fields)
+            ),
+            selectinload(Thread.feedbacks),
+            selectinload(Thread.elements),
+        )
+    ), step_fields
+
+
+def bundle_out(thread: Thread, step_fields: list[str]) -> ThreadBundle:
+    return ThreadBundle(
+        **thread_fields(thread),
+        steps=[step_from_orm(step, step_fields) for step in thread.steps],
+        feedbacks=[feedback_out(feedback) for feedback in thread.feedbacks],
+        elements=[element_out(element) for element in thread.elements],
+    )
+
 
 # Thread endpoints
-@router.get("/threads", response_model=List[dict], tags=["Threads"])
+@router.get("/threads", response_model=ThreadPage, tags=["Threads"])
 async def get_threads(
-    skip: int = 0,
-    limit: int = 10,
+    cursor: str | None = None,
+    limit: int = Query(10, ge=1, le=100),
+    userIdentifier: str | None = None,
+    tags: list[str] | None = Query(None),
     db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_admin)
 ):
-    """Get all threads with pagination"""
-    query = select(Thread).offset(skip).limit(limit)
+    """Get threads, newest first, with cursor-based pagination"""
+    query = select(Thread)
+    if userIdentifier is not None:
+        query = query.where(Thread.userIdentifier == userIdentifier)
+    if tags:
+        query = query.where(Thread.tags.contains(tags))
+    query = paginate(
+        query, Thread.createdAt, Thread.id, limit, cursor, descending=True
+    )
     result = await db.execute(query)
-    threads = result.scalars().all()
+    threads, next_cursor = split_page(result.scalars().all(), limit)
     
-    return [
-        {
-            "id": str(thread.id),
-            "name": thread.name,
-            "createdAt": thread.createdAt,
-            "userIdentifier": thread.userIdentifier,
-            "tags": thread.tags,
-            "metadata": thread.metadata_
-        }
-        for thread in threads
-    ]
-
-@router.get("/threads/{thread_id}", response_model=dict, tags=["Threads"])
-async def get_thread(
+    return json_response(ThreadPage(
+        items=[thread_out(thread) for thread in threads],
+        next_cursor=next_cursor,
+    ))
+
+@router.get("/threads/bundles", response_model=list[ThreadBundle], tags=["Threads"])
+async def get_thread_bundles(
+    ids: list[UUID] = Query(..., max_length=MAX_BUNDLE_IDS),
+    mode: StepMode = "full",
+    db: AsyncSession = Depends(get_db),
+    _: str = Depends(verify_admin)
+):
+    """Get several threads with their steps, feedbacks and elements in one call"""
+    query, step_fields = bundle_query(ids, mode)
+    result = await db.execute(query)
+    threads = {thread.id: thread for thread in result.scalars().all()}
+    
+    return json_response([
+        bundle_out(threads[thread_id], step_fields)
+        for thread_id in dict.fromkeys(ids)
+        if thread_id in threads
+    ], list[ThreadBundle])
+
+@router.get("/threads/{thread_id}/bundle", response_model=ThreadBundle, tags=["Threads"])
+async def get_thread_bundle(
     thread_id: UUID,
+    mode: StepMode = "full",
     db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_admin)
 ):
-    """Get a specific thread by ID"""
-    query = select(Thread).where(Thread.id == thread_id)
+    """Get a thread with its steps, feedbacks and elements in one call"""
+    query, step_fields = bundle_query([thread_id], mode)
     result = await db.execute(query)
     thread = result.scalar_one_or_none()
     
     if not thread:
         raise HTTPException(status_code=404, detail="Thread not found")
     
-    return {
-        "id": str(thread.id),
-        "name": thread.name,
-        "createdAt": thread.createdAt,
-        "userIdentifier": thread.userIdentifier,
-        "tags": thread.tags,
-        "metadata": thread.metadata_
-    }
+    return json_response(bundle_out(thread, step_fields))
+
+@router.get("/threads/{thread_id}", response_model=ThreadOut, tags=["Threads"])
+async def get_thread(
+    thread_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    _: str = Depends(verify_admin)
+):
+    """Get a specific thread by ID"""
+    async def load():
+        result = await db.execute(select(Thread).where(Thread.id == thread_id))
+        thread = result.scalar_one_or_none()
+        # Deleted since its version was looked up
+        if thread is None:
+            raise HTTPException(status_code=404, detail="Thread not found")
+        return thread_out(thread)
+    
+    return await conditional_thread_response(request, db, thread_id, load)
 
 # Step endpoints
-@router.get("/threads/{thread_id}/steps", response_model=List[dict], tags=["Steps"])
+@router.get("/threads/{thread_id}/steps", response_model=StepPage, tags=["Steps"])
 async def get_thread_steps(
     thread_id: UUID,
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    type: str | None = None,
+    fields: str | None = None,
+    mode: StepMode = "full",
+    truncate: int | None = Query(None, ge=1),
     db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_admin)
 ):
-    """Get all steps for a specific thread"""
-    query = select(Step).where(Step.threadId == thread_id)
-    result = await db.execute(query)
-    steps = result.scalars().all()
+    """Get the steps of a specific thread in creation order, with cursor-based pagination.
+
+    ``fields`` (comma-separated) or ``mode=summary`` restrict the loaded columns,
+    and ``truncate`` caps the length of ``input``/``output``.
+    """
+    names = resolve_step_fields(fields, mode)
+
+    async def load():
+        query = select(*step_columns(names, truncate)).where(Step.threadId == thread_id)
+        if type is not None:
+            query = query.where(Step.type == type)
+        query = paginate(query, Step.createdAt, Step.id, limit, cursor)
+        result = await db.execute(query)
+        steps, next_cursor = split_page(result.all(), limit)
+        return StepPage(
+            items=[step_from_row(step, names) for step in steps],
+            next_cursor=next_cursor,
+        )
     
-    return [
-        {
-            "id": str(step.id),
-            "name": step.name,
-            "type": step.type,
-            "input": step.input,
-            "output": step.output,
-            "createdAt": step.createdAt,
-            "isError": step.isError,
-            "metadata": step.metadata_
-        }
-        for step in steps
-    ]
-
-@router.get("/steps/{step_id}", response_model=dict, tags=["Steps"])
+    return await conditional_thread_response(request, db, thread_id, load)
+
+@router.get("/steps/{step_id}", response_model=StepOut, tags=["Steps"])
 async def get_step(
     step_id: UUID,
+    fields: str | None = None,
+    mode: StepMode = "full",
+    truncate: int | None = Query(None, ge=1),
     db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_admin)
 ):
-    """Get a specific step by ID"""
-    query = select(Step).where(Step.id == step_id)
+    """Get a specific step by ID, optionally projected like the step listing"""
+    names = resolve_step_fields(fields, mode)
+    query = select(*step_columns(names, truncate)).where(Step.id == step_id)
     result = await db.execute(query)
-    step = result.scalar_one_or_none()
+    step = result.one_or_none()
     
     if not step:
         raise HTTPException(status_code=404, detail="Step not found")
     
-    return {
-        "id": str(step.id),
-        "name": step.name,
-        "type": step.type,
-        "input": step.input,
-        "output": step.output,
-        "createdAt": step.createdAt,
-        "isError": step.isError,
-        "metadata": step.metadata_
-    }
+    return json_response(step_from_row(step, names))
 
 # Feedback endpoints
-@router.get("/threads/{thread_id}/feedbacks", response_model=List[dict], tags=["Feedback"])
+@router.get(
+    "/threads/{thread_id}/feedbacks", response_model=list[FeedbackOut], tags=["Feedback"]
+)
 async def get_thread_feedbacks(
     thread_id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     _: str = Depends(verify_admin)
 ):
     """Get all feedbacks for a specific thread"""
-    query = select(Feedback).where(Feedback.threadId == thread_id)
-    result = await db.execute(query)
-    feedbacks = result.scalars().all()
+    async def load():
+        query = select(Feedback).where(Feedback.threadId == thread_id)
+        result = await db.execute(query)
+        return [feedback_out(feedback) for feedback in result.scalars().all()]
     
-    return [
-        {
-            "id": str(feedback.id),
-            "forId": str(feedback.forId),
-            "value": feedback.value,
-            "comment": feedback.comment
-        }
-        for feedback in feedbacks
-    ]
-
-@router.get("/feedbacks/{feedback_id}", response_model=dict, tags=["Feedback"])
+    return await conditional_thread_response(
+        request, db, thread_id, load, list[FeedbackOut]
+    )
+
+@router.get("/feedbacks/{feedback_id}", response_model=FeedbackOut, tags=["Feedback"])
 async def get_feedback(
     feedback_id: UUID,
     db: AsyncSession = Depends(get_db),
@@ -147,9 +267,4 @@ async def get_feedback(
     if not feedback:
         raise HTTPException(status_code=404, detail="Feedback not found")
     
-    return {
-        "id": str(feedback.id),
-        "forId": str(feedback.forId),
-        "value": feedback.value,
-        "comment": feedback.comment
-    }
\ No newline at end of file
+    return json_response(feedback_out(feedback))
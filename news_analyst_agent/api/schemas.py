@@ -0,0 +1,170 @@
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any
+from uuid import UUID
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+
+
+class ThreadOut(BaseModel):
+    id: UUID
+    name: str | None = None
+    createdAt: datetime | None = None
+    userIdentifier: str | None = None
+    tags: list[str] | None = None
+    metadata: dict[str, Any] | None = None
+
+
+class StepOut(BaseModel):
+    """A step restricted to the requested fields.
+
+    Fields that were not projected are left unset and omitted from the output.
+    """
+
+    id: UUID
+    threadId: UUID | None = None
+    parentId: UUID | None = None
+    name: str | None = None
+    type: str | None = None
+    createdAt: datetime | None = None
+    start: datetime | None = None
+    end: datetime | None = None
+    isError: bool | None = None
+    tags: list[str] | None = None
+    metadata: dict[str, Any] | None = None
+    input: str | None = None
+    output: str | None = None
+    generation: dict[str, Any] | None = None
+
+
+class FeedbackOut(BaseModel):
+    id: UUID
+    forId: UUID
+    value: int
+    comment: str | None = None
+
+
+class ElementOut(BaseModel):
+    id: UUID
+    forId: UUID | None = None
+    type: str | None = None
+    name: str
+    url: str | None = None
+    display: str | None = None
+    mime: str | None = None
+    size: str | None = None
+    language: str | None = None
+    page: int | None = None
+
+
+class ThreadBundle(ThreadOut):
+    steps: list[StepOut]
+    feedbacks: list[FeedbackOut]
+    elements: list[ElementOut]
+
+
+class ThreadPage(BaseModel):
+    items: list[ThreadOut]
+    next_cursor: str | None = None
+
+
+class StepPage(BaseModel):
+    items: list[StepOut]
+    next_cursor: str | None = None
+
+
+class NewsItemOut(BaseModel):
+    """Summary of a retrieved article; the content is served by ``/api/news/{id}``"""
+
+    # Built straight from ``NewsItem`` records
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    title: str
+    description: str | None = None
+    link: str
+    source: str
+    published: str | None = None
+    query: str | None = None
+
+
+class NewsArticleOut(NewsItemOut):
+    content: str | None = None
+    truncated: bool = False
+
+
+class UsageOut(BaseModel):
+    day: date
+    chat_profile: str
+    threads: int
+    steps: int
+    error_steps: int
+    error_rate: float | None = None
+
+
+class FeedbackSummaryOut(BaseModel):
+    chat_profile: str
+    feedbacks: int
+    average: float | None = None
+    # Number of feedbacks per value
+    distribution: dict[int, int]
+
+
+class LatencyOut(BaseModel):
+    chat_profile: str
+    step_type: str
+    steps: int
+    error_rate: float | None = None
+    timed_steps: int
+    avg_seconds: float | None = None
+    max_seconds: float | None = None
+
+
+class AnalyticsRefreshOut(BaseModel):
+    days: int
+
+
+@lru_cache(maxsize=None)
+def type_adapter(type_: Any) -> TypeAdapter:
+    return TypeAdapter(type_)
+
+
+def _encode_default(value: Any) -> Any:
+    # orjson only encodes uuid.UUID itself, not subclasses such as the UUIDs
+    # asyncpg returns
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dump_json(value: Any, type_: Any | None = None) -> bytes:
+    """Serialize a typed value, skipping fields that were never set.
+
+    pydantic-core only walks the value down to Python primitives (leaving
+    UUIDs and datetimes as is) and orjson encodes them, which is noticeably
+    faster than pydantic's own JSON writer on large text fields; see
+    ``benchmarks/bench_serialization.py``. ``type_`` is only needed for values
+    that aren't models themselves, such as ``list[FeedbackOut]``.
+    """
+    if type_ is None and isinstance(value, BaseModel):
+        data = value.model_dump(exclude_unset=True)
+    else:
+        data = type_adapter(type_ or type(value)).dump_python(value, exclude_unset=True)
+    return orjson.dumps(data, default=_encode_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def json_response(
+    value: Any,
+    type_: Any | None = None,
+    status_code: int = 200,
+    headers: dict | None = None,
+) -> Response:
+    """Return a typed value as JSON without FastAPI's generic encoder pass"""
+    return Response(
+        content=dump_json(value, type_),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
@@ -0,0 +1,254 @@
+"""Record/replay layer for upstream calls (search, article fetches and LLMs).
+
+In ``record`` mode every wrapped call is executed for real and its result is
+appended to a gzip-compressed JSON-lines cassette together with the time the
+call took. In ``replay`` mode the same calls are served from the cassette,
+either immediately (``fast``) or after sleeping for the recorded duration
+(``realtime``), so profiling runs and load tests no longer depend on live
+services.
+
+Recording is single-process only: the recording process holds an exclusive
+lock on the cassette, and a second process trying to record to it fails with
+``CassetteLocked``. Record with one API worker (e.g. ``uvicorn`` without
+``--workers``); any number of processes can replay the same cassette.
+"""
+import asyncio
+import atexit
+import fcntl
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumpd, load
+from loguru import logger
+
+from news_analyst_agent.config import get_settings
+
+
+class CassetteMiss(KeyError):
+    """Raised in replay mode when a call was never recorded."""
+
+
+class CassetteLocked(RuntimeError):
+    """Raised when another process is already recording to a cassette."""
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def make_key(kind: str, *parts: Any) -> str:
+    """Build a stable cassette key from the call kind and its arguments"""
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    digest = hashlib.sha256(payload.encode("utf8")).hexdigest()[:32]
+    return f"{kind}:{digest}"
+
+
+class Cassette:
+    """A gzip-compressed JSON-lines file of recorded upstream responses.
+
+    Calls with the same key are replayed in the order they were recorded;
+    once exhausted the last recorded response keeps being served so that a
+    cassette can drive load tests of arbitrary length.
+    """
+
+    def __init__(self, path: str | Path, mode: str, timing: str = "fast"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Invalid cassette mode: {mode}")
+        if timing not in ("fast", "realtime"):
+            raise ValueError(f"Invalid cassette replay timing: {timing}")
+        self.path = Path(path)
+        self.mode = mode
+        self.timing = timing
+        self._lock = threading.Lock()
+        self._entries: dict[str, list[dict]] = defaultdict(list)
+        self._cursors: dict[str, int] = defaultdict(int)
+        self._raw = None
+        self._file = None
+
+        if mode == "replay":
+            self._load()
+        else:
+            self._open_for_recording()
+
+    def _open_for_recording(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        raw = open(self.path, "ab")
+        try:
+            # Gzip members appended by two writers at once would interleave
+            fcntl.flock(raw, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raw.close()
+            raise CassetteLocked(
+                f"Cassette {self.path} is being recorded by another process; "
+                "recording is single-process only"
+            ) from None
+        self._raw = raw
+        self._file = gzip.open(raw, "at", encoding="utf8")
+
+    def _load(self):
+        if not self.path.exists():
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+        with gzip.open(self.path, "rt", encoding="utf8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]].append(entry)
+        logger.info("Loaded {} recorded calls from {}", len(self._entries), self.path)
+
+    def record(self, key: str, payload: Any, elapsed: float):
+        """Append a recorded response to the cassette"""
+        line = json.dumps(
+            {"key": key, "elapsed": round(elapsed, 4), "payload": payload},
+            separators=(",", ":"),
+            default=str,
+        )
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + "\n")
+
+    def replay(self, key: str) -> dict:
+        """Return the next recorded entry for ``key``"""
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise CassetteMiss(key)
+            index = min(self._cursors[key], len(entries) - 1)
+            self._cursors[key] += 1
+            return entries[index]
+
+    def delay(self, entry: dict) -> float:
+        """Seconds to wait before serving a replayed entry"""
+        return entry["elapsed"] if self.timing == "realtime" else 0.0
+
+    def call(
+        self,
+        key: str,
+        func: Callable[..., Any],
+        *args,
+        encode: Callable[[Any], Any] = _identity,
+        decode: Callable[[Any], Any] = _identity,
+        **kwargs,
+    ) -> Any:
+        """Run ``func`` through the cassette.
+
+        ``encode`` turns the live result into something JSON-serializable and
+        ``decode`` rebuilds the original type from a recorded payload.
+        """
+        if self.mode == "replay":
+            entry = self.replay(key)
+            time.sleep(self.delay(entry))
+            return decode(entry["payload"])
+
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.record(key, encode(result), time.perf_counter() - start)
+        return result
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self._raw is not None:
+                # Also releases the lock
+                self._raw.close()
+                self._raw = None
+
+
+@lru_cache()
+def get_cassette() -> Optional[Cassette]:
+    """Return the process-wide cassette, or None when recording is off"""
+    settings = get_settings()
+    if settings.CASSETTE_MODE == "off":
+        return None
+    cassette = Cassette(
+        settings.CASSETTE_PATH,
+        mode=settings.CASSETTE_MODE,
+        timing=settings.CASSETTE_REPLAY_TIMING,
+    )
+    atexit.register(cassette.close)
+    logger.info("Cassette {} mode enabled: {}", settings.CASSETTE_MODE, cassette.path)
+    return cassette
+
+
+def cassette_call(
+    kind: str,
+    key_parts: Sequence[Any],
+    func: Callable[..., Any],
+    *args,
+    encode: Callable[[Any], Any] = _identity,
+    decode: Callable[[Any], Any] = _identity,
+    **kwargs,
+) -> Any:
+    """Run ``func(*args, **kwargs)`` through the cassette if one is enabled"""
+    cassette = get_cassette()
+    if cassette is None:
+        return func(*args, **kwargs)
+    return cassette.call(
+        make_key(kind, *key_parts), func, *args, encode=encode, decode=decode, **kwargs
+    )
+
+
+class CassetteLLMCache(BaseCache):
+    """LangChain cache that records and replays chat model generations.
+
+    Plugged into chat models through their ``cache`` field. In record mode
+    lookups always miss so the model is called for real, and the time between
+    the miss and the matching ``update`` is stored as the call duration.
+    """
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+        self._started: dict[str, float] = {}
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return make_key("llm", prompt, llm_string)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+        if self.cassette.mode == "record":
+            self._started[key] = time.perf_counter()
+            return None
+        entry = self.cassette.replay(key)
+        time.sleep(self.cassette.delay(entry))
+        return [load(generation) for generation in entry["payload"]]
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+        if self.cassette.mode == "record":
+            self._started[key] = time.perf_counter()
+            return None
+        entry = self.cassette.replay(key)
+        await asyncio.sleep(self.cassette.delay(entry))
+        return [load(generation) for generation in entry["payload"]]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        if self.cassette.mode != "record":
+            return
+        key = self._key(prompt, llm_string)
+        started = self._started.pop(key, time.perf_counter())
+        self.cassette.record(
+            key,
+            [dumpd(generation) for generation in return_val],
+            time.perf_counter() - started,
+        )
+
+    def clear(self, **kwargs: Any) -> None:
+        self._started.clear()
+
+
+def get_llm_cache() -> Optional[CassetteLLMCache]:
+    """Return a chat model cache backed by the cassette, if one is enabled"""
+    cassette = get_cassette()
+    if cassette is None:
+        return None
+    return CassetteLLMCache(cassette)
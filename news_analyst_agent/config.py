@@ -1,9 +1,12 @@
 import os
 from functools import lru_cache
+from typing import Literal
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 
+from news_analyst_agent.agents.model_names import ModelName
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -13,7 +16,43 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = "news_analyst_password"
     POSTGRES_SERVER: str = "localhost"
     POSTGRES_DB: str = "app"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_SLOW_QUERY_MS: float = 500
+    DB_ECHO: bool = False
     
+    # Logging settings
+    LOG_LEVEL: str = "INFO"
+    # One JSON object per record instead of readable lines
+    LOG_JSON: bool = False
+    # Write records from a background thread rather than the one logging them
+    LOG_ENQUEUE: bool = True
+    # Records waiting to be written before new ones are dropped
+    LOG_QUEUE_SIZE: int = 10000
+    # Fraction of requests whose debug records are kept
+    LOG_DEBUG_SAMPLE_RATE: float = 1.0
+
+    # Background cleanup settings
+    CLEANUP_ORPHAN_AGE_HOURS: float = 1
+    CLEANUP_BATCH_SIZE: int = 500
+    CLEANUP_TIME_BUDGET_SECONDS: float = 30
+
+    # Scheduled jobs run in the API process unless a worker owns them
+    # (python -m news_analyst_agent.worker)
+    SCHEDULER_IN_API: bool = True
+
+    # Chainlit step writes are buffered and written in batches
+    UI_STEP_FLUSH_INTERVAL_SECONDS: float = 1.0
+    UI_STEP_FLUSH_MAX_PENDING: int = 100
+
+    # Retrieval API response cache settings
+    RESPONSE_CACHE_SIZE: int = 512
+    RESPONSE_CACHE_TTL_SECONDS: float = 300
+
     # API Keys
     OPENAI_API_KEY: str
     
@@ -28,6 +67,94 @@ class Settings(BaseSettings):
     # Chainlit settings
     CHAINLIT_AUTH_SECRET: str | None = None
 
+    # Cassette (record/replay of upstream calls) settings
+    CASSETTE_MODE: Literal["off", "record", "replay"] = "off"
+    CASSETTE_PATH: str = "cassettes/default.jsonl.gz"
+    CASSETTE_REPLAY_TIMING: Literal["fast", "realtime"] = "fast"
+
+    # Conversation checkpoint settings
+    CHECKPOINT_POOL_SIZE: int = 5
+    CHECKPOINT_KEEP_LAST: int = 5
+    CHECKPOINT_TTL_DAYS: float = 30
+    CHECKPOINT_PRUNE_INTERVAL_HOURS: float = 6
+    CHECKPOINT_PRUNE_BATCH_SIZE: int = 1000
+
+    # Analytics summary tables are refreshed incrementally at this interval,
+    # and recomputed as a whole, e.g. for deleted threads, at the longer one
+    ANALYTICS_REFRESH_MINUTES: float = 15
+    ANALYTICS_FULL_REFRESH_HOURS: float = 24
+    ANALYTICS_DEFAULT_DAYS: int = 30
+
+    # Retrieval tool result cache settings
+    RETRIEVAL_CACHE_SIZE: int = 1024
+    RETRIEVAL_CACHE_TTL_SECONDS: float = 900
+
+    # Startup warm-up settings
+    WARMUP_ENABLED: bool = True
+    # Chat models to load and ping, e.g. '["gpt-4o-mini", "llama3.2:latest"]'
+    WARMUP_MODELS: list[ModelName] = []
+    WARMUP_TIMEOUT_SECONDS: float = 120
+
+    # News watchlist settings
+    # Tickers or topics whose news is kept in the retrieval cache, fetched
+    # during warm-up and refreshed by the prefetch job
+    NEWS_WATCHLIST: list[str] = []
+    PREFETCH_ENABLED: bool = True
+    PREFETCH_INTERVAL_MINUTES: float = 15
+    PREFETCH_JITTER_SECONDS: int = 60
+    # How long prefetch calls wait for the upstream rate limits
+    PREFETCH_MAX_WAIT_SECONDS: float = 30
+    PREFETCH_CONCURRENCY: int = 2
+
+    # Article content store settings
+    NEWS_STORE_SIZE: int = 2000
+    NEWS_STORE_TTL_SECONDS: float = 86400
+    NEWS_CONTENT_MAX_CHARS: int = 20000
+
+    # Shared news archive in the database
+    NEWS_ARCHIVE_ENABLED: bool = True
+    # Archived articles added to the results of each retrieval
+    NEWS_ARCHIVE_RESULTS: int = 5
+    NEWS_ARCHIVE_MAX_AGE_DAYS: float = 7
+
+    # Article summarization before the final answer
+    SUMMARIZE_ENABLED: bool = False
+    SUMMARY_MODEL: ModelName = ModelName.GPT_4_O_MINI
+    SUMMARY_CHUNK_CHARS: int = 4000
+    SUMMARY_MAX_CHUNKS: int = 5
+    SUMMARY_CONCURRENCY: int = 4
+    SUMMARY_CACHE_SIZE: int = 1000
+    SUMMARY_CACHE_TTL_SECONDS: float = 86400
+
+    # Agent state caps, enforced by the graph nodes
+    # News items and characters of tool message content kept per retrieval step
+    AGENT_MAX_NEWS_ITEMS: int = 40
+    AGENT_MAX_TOOL_CONTENT_CHARS: int = 24000
+    # Older turns are dropped from a conversation beyond this many messages
+    AGENT_MAX_MESSAGES: int = 50
+
+    # Debug mode: trace allocations with tracemalloc and record the peak and
+    # retained memory of each request. Slows down the API noticeably.
+    MEMORY_PROFILING: bool = False
+    # Stack frames kept per traced allocation
+    MEMORY_PROFILING_FRAMES: int = 1
+
+    # Upstream protection: token bucket and circuit breaker per source
+    UPSTREAM_RATE_PER_SECOND: dict[str, float] = {
+        "ddg_search": 1,
+        "yfinance_search": 2,
+        "article_fetch": 5,
+    }
+    UPSTREAM_BURST: int = 5
+    # Longest a call waits for a token before the source counts as unavailable
+    UPSTREAM_MAX_WAIT_SECONDS: float = 0.5
+    UPSTREAM_FAILURE_THRESHOLD: int = 5
+    UPSTREAM_RESET_SECONDS: float = 30
+    # Share the token buckets of all processes through the database
+    UPSTREAM_SHARED_BUCKETS: bool = False
+    # How long a process uses its own buckets after the database failed
+    UPSTREAM_SHARED_RETRY_SECONDS: float = 30
+
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:5432/{self.POSTGRES_DB}"
@@ -1,36 +1,188 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+import os
+import threading
+import time
 
-from news_analyst_agent.config import get_settings
+from loguru import logger
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from news_analyst_agent.config import Settings, get_settings
+from news_analyst_agent.metrics import metrics
 
 settings = get_settings()
 
-# Async engine
-async_engine = create_async_engine(
-    settings.ASYNC_DATABASE_URL,
-    echo=True,
-    future=True
-)
 
-# Sync engine for initialization and utilities
-sync_engine = create_engine(
-    settings.DATABASE_URL,
-    echo=True,
-    future=True
-)
+def _pool_kwargs(settings: Settings) -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+def install_slow_query_log(engine: Engine, threshold_ms: float, name: str):
+    """Log statements slower than ``threshold_ms`` instead of echoing every query"""
+
+    def _finished(conn, statement: str):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        metrics.observe("db_query_seconds", elapsed, engine=name)
+        if elapsed * 1000 >= threshold_ms:
+            metrics.inc("db_slow_queries_total", engine=name)
+            logger.warning(
+                "Slow query ({:.1f} ms on {}): {}", elapsed * 1000, name, statement[:500]
+            )
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _finished(conn, statement)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        # A failed statement never reaches after_cursor_execute; without this
+        # its start time would be left behind on the connection
+        conn = context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            _finished(conn, context.statement or "")
+
+
+def install_pool_metrics(engine: Engine, name: str):
+    """Count connection lifecycle events and expose the pool state as a collector"""
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        metrics.inc("db_pool_connects_total", engine=name)
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.inc("db_pool_checkouts_total", engine=name)
+
+    @event.listens_for(engine, "invalidate")
+    def _invalidate(dbapi_connection, connection_record, exception):
+        metrics.inc("db_pool_invalidations_total", engine=name)
+
+    metrics.register_collector(f"db_pool_{name}", lambda: pool_status(engine))
+
+
+def pool_status(engine: Engine | AsyncEngine) -> dict:
+    """Return the current state of an engine's connection pool"""
+    pool = engine.pool
+    status = {"class": type(pool).__name__}
+    for attr in ("size", "checkedin", "checkedout", "overflow"):
+        value = getattr(pool, attr, None)
+        if callable(value):
+            status[attr] = value()
+    return status
+
+
+def create_async_db_engine(settings: Settings) -> AsyncEngine:
+    """Create the pooled async engine used by the API and the background tasks"""
+    connect_args = {}
+    if settings.ASYNC_DATABASE_URL.startswith("postgresql+asyncpg"):
+        connect_args["prepared_statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+
+    engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL,
+        echo=settings.DB_ECHO,
+        connect_args=connect_args,
+        **_pool_kwargs(settings),
+    )
+    install_slow_query_log(engine.sync_engine, settings.DB_SLOW_QUERY_MS, "async")
+    install_pool_metrics(engine.sync_engine, "async")
+    return engine
+
+
+def create_sync_db_engine(settings: Settings) -> Engine:
+    """Create the pooled sync engine used for initialization and utilities"""
+    engine = create_engine(
+        settings.DATABASE_URL,
+        echo=settings.DB_ECHO,
+        **_pool_kwargs(settings),
+    )
+    install_slow_query_log(engine, settings.DB_SLOW_QUERY_MS, "sync")
+    install_pool_metrics(engine, "sync")
+    return engine
+
+
+# Engines shared by everything in this process. They are created on first use
+# so that importing this module (and the API) stays cheap.
+_engines: dict[str, Engine | AsyncEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_async_engine() -> AsyncEngine:
+    """Return the process-wide async engine, creating it on first use"""
+    with _engines_lock:
+        if "async" not in _engines:
+            _engines["async"] = create_async_db_engine(settings)
+        return _engines["async"]
+
+
+def get_sync_engine() -> Engine:
+    """Return the process-wide sync engine, creating it on first use"""
+    with _engines_lock:
+        if "sync" not in _engines:
+            _engines["sync"] = create_sync_db_engine(settings)
+        return _engines["sync"]
+
+
+class LazyAsyncSessionmaker(async_sessionmaker):
+    """Session factory that binds to the async engine when the first session is made"""
+
+    def __call__(self, **local_kw) -> AsyncSession:
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_async_engine())
+        return super().__call__(**local_kw)
+
 
 # Session factories
-AsyncSessionLocal = sessionmaker(
-    async_engine, 
-    class_=AsyncSession, 
+AsyncSessionLocal = LazyAsyncSessionmaker(
+    class_=AsyncSession,
     expire_on_commit=False
 )
 
+
+def _sync_engines() -> list[Engine]:
+    return [
+        engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        for engine in _engines.values()
+    ]
+
+
+def _dispose_after_fork():
+    # Connections inherited from a parent process must never be reused
+    for engine in _sync_engines():
+        engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_dispose_after_fork)
+
+
+async def dispose_engines():
+    """Close all pooled connections, e.g. on application shutdown"""
+    for engine in list(_engines.values()):
+        if isinstance(engine, AsyncEngine):
+            await engine.dispose()
+        else:
+            engine.dispose()
+    logger.info("Disposed database engines")
+
+
 # Dependency for FastAPI
 async def get_db():
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
-            await session.close() 
\ No newline at end of file
+            await session.close()
@@ -1,17 +1,17 @@
-from news_analyst_agent.db.database import sync_engine
+from news_analyst_agent.db.database import get_sync_engine
 from news_analyst_agent.db.models import Base
 
 
 def init_db():
     """Initialize the database tables"""
     print("Creating database tables...")
-    Base.metadata.create_all(bind=sync_engine)
+    Base.metadata.create_all(bind=get_sync_engine())
     print("Database tables created successfully!")
 
 def drop_db():
     """Drop all database tables"""
     print("Dropping database tables...")
-    Base.metadata.drop_all(bind=sync_engine)
+    Base.metadata.drop_all(bind=get_sync_engine())
     print("Database tables dropped successfully!")
 
 if __name__ == "__main__":
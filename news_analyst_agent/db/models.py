@@ -1,6 +1,21 @@
 import uuid
 
-from sqlalchemy import ARRAY, JSON, UUID, Boolean, Column, ForeignKey, Integer, String
+from sqlalchemy import (
+    ARRAY,
+    JSON,
+    UUID,
+    Boolean,
+    Column,
+    Computed,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -22,16 +37,35 @@ class Thread(Base):
     __tablename__ = 'threads'
 
     id = Column(UUID, primary_key=True, default=uuid.uuid4)
-    createdAt = Column(String)
+    createdAt = Column(DateTime(timezone=True))
+    # Maintained by database triggers on writes to the thread and its children
+    updatedAt = Column(DateTime(timezone=True))
     name = Column(String)
     userId = Column(UUID, ForeignKey('users.id', ondelete='CASCADE'))
     userIdentifier = Column(String)
     tags = Column(ARRAY(String))
     metadata_ = Column("metadata", JSON)
 
+    __table_args__ = (
+        Index('ix_threads_createdAt_id', createdAt.desc().nulls_last(), id.desc()),
+        Index(
+            'ix_threads_userIdentifier_createdAt',
+            userIdentifier,
+            createdAt.desc().nulls_last(),
+            id.desc(),
+        ),
+        # Threads changed since the last analytics refresh
+        Index('ix_threads_updatedAt', updatedAt),
+    )
+
     # Relationships
     user = relationship("User", back_populates="threads")
-    steps = relationship("Step", back_populates="thread", cascade="all, delete-orphan")
+    steps = relationship(
+        "Step",
+        back_populates="thread",
+        cascade="all, delete-orphan",
+        order_by="(Step.createdAt, Step.id)",
+    )
     elements = relationship("Element", back_populates="thread", cascade="all, delete-orphan")
     feedbacks = relationship("Feedback", back_populates="thread", cascade="all, delete-orphan")
 
@@ -52,14 +86,20 @@ class Step(Base):
     tags = Column(ARRAY(String))
     input = Column(String)
     output = Column(String)
-    createdAt = Column(String)
-    start = Column(String)
-    end = Column(String)
+    createdAt = Column(DateTime(timezone=True))
+    start = Column(DateTime(timezone=True))
+    end = Column(DateTime(timezone=True))
     generation = Column(JSON)
     showInput = Column(String)
     language = Column(String)
     indent = Column(Integer)
 
+    __table_args__ = (
+        Index('ix_steps_threadId_createdAt', threadId, createdAt, id),
+        # Day ranges scanned by the analytics refresh
+        Index('ix_steps_createdAt', createdAt),
+    )
+
     # Relationships
     thread = relationship("Thread", back_populates="steps")
 
@@ -68,7 +108,7 @@ class Element(Base):
     __tablename__ = 'elements'
 
     id = Column(UUID, primary_key=True, default=uuid.uuid4)
-    threadId = Column(UUID, ForeignKey('threads.id'))
+    threadId = Column(UUID, ForeignKey('threads.id'), index=True)
     type = Column(String)
     url = Column(String)
     chainlitKey = Column(String)
@@ -90,9 +130,111 @@ class Feedback(Base):
 
     id = Column(UUID, primary_key=True, default=uuid.uuid4)
     forId = Column(UUID, nullable=False)
-    threadId = Column(UUID, ForeignKey('threads.id'), nullable=False)
+    threadId = Column(UUID, ForeignKey('threads.id'), nullable=False, index=True)
     value = Column(Integer, nullable=False)
     comment = Column(String)
 
     # Relationships
-    thread = relationship("Thread", back_populates="feedbacks")
\ No newline at end of file
+    thread = relationship("Thread", back_populates="feedbacks")
+
+
+class UpstreamBucket(Base):
+    """Token bucket of an upstream source shared by all processes, see tools/upstream.py"""
+    __tablename__ = 'upstream_buckets'
+
+    source = Column(String, primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class NewsArticle(Base):
+    """Retrieved articles shared by all processes, see news_archive.py"""
+    __tablename__ = 'news_articles'
+
+    # news_item.news_id of the link
+    id = Column(String(16), primary_key=True)
+    link = Column(String, nullable=False)
+    title = Column(String, nullable=False)
+    description = Column(String)
+    content = Column(String)
+    truncated = Column(Boolean, nullable=False, default=False)
+    source = Column(String, nullable=False)
+    query = Column(String)
+    published_at = Column(DateTime(timezone=True))
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
+    search = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(content, '')), 'C')",
+            persisted=True,
+        ),
+    )
+
+    __table_args__ = (
+        Index('ix_news_articles_search', search, postgresql_using='gin'),
+        Index('ix_news_articles_fetched_at', fetched_at.desc()),
+    )
+
+
+class JobRun(Base):
+    """One run of a scheduled background job, see tasks/scheduler.py"""
+    __tablename__ = 'job_runs'
+
+    id = Column(UUID, primary_key=True, default=uuid.uuid4)
+    job = Column(String, nullable=False)
+    # ok, failed or skipped
+    status = Column(String, nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True))
+    duration_seconds = Column(Float)
+    host = Column(String)
+    result = Column(JSON)
+    error = Column(String)
+
+    __table_args__ = (
+        Index('ix_job_runs_job_started_at', job, started_at.desc()),
+    )
+
+
+# Analytics summary tables, refreshed incrementally by tasks/analytics.py.
+# Threads are attributed to their chat profile (the model) and to the UTC day
+# they were created on; feedback has no timestamp and counts for its thread's day.
+class AnalyticsThreadsDaily(Base):
+    __tablename__ = 'analytics_threads_daily'
+
+    day = Column(Date, primary_key=True)
+    chat_profile = Column(String, primary_key=True)
+    threads = Column(Integer, nullable=False)
+
+
+class AnalyticsStepsDaily(Base):
+    __tablename__ = 'analytics_steps_daily'
+
+    day = Column(Date, primary_key=True)
+    chat_profile = Column(String, primary_key=True)
+    step_type = Column(String, primary_key=True)
+    steps = Column(Integer, nullable=False)
+    error_steps = Column(Integer, nullable=False)
+    # Steps with both start and end
+    timed_steps = Column(Integer, nullable=False)
+    latency_seconds_sum = Column(Float, nullable=False)
+    latency_seconds_max = Column(Float)
+
+
+class AnalyticsFeedbackDaily(Base):
+    __tablename__ = 'analytics_feedback_daily'
+
+    day = Column(Date, primary_key=True)
+    chat_profile = Column(String, primary_key=True)
+    value = Column(Integer, primary_key=True)
+    feedbacks = Column(Integer, nullable=False)
+
+
+class AnalyticsRefresh(Base):
+    """Threads updated after ``refreshed_at`` haven't been counted yet"""
+    __tablename__ = 'analytics_refresh'
+
+    name = Column(String, primary_key=True)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False)
@@ -1,3 +1,6 @@
+from datetime import datetime, timezone
+
+from loguru import logger
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -8,5 +11,29 @@ async def check_db_connection(session: AsyncSession) -> bool:
         await session.execute(text("SELECT 1"))
         return True
     except Exception as e:
-        print(f"Database connection failed: {e}")
-        return False 
\ No newline at end of file
+        logger.error("Database connection failed: {}", e)
+        return False
+
+
+def utcnow() -> datetime:
+    """Timezone-aware current time, as stored in timestamptz columns"""
+    return datetime.now(timezone.utc)
+
+
+def parse_timestamp(value: str | datetime | None) -> datetime | None:
+    """Parse an ISO-8601 string (as written by Chainlit) into an aware datetime"""
+    if value is None or isinstance(value, datetime):
+        return value
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def format_timestamp(value: datetime | None) -> str | None:
+    """Format a datetime the way Chainlit expects timestamps"""
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
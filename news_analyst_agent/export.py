@@ -0,0 +1,165 @@
+"""Streaming NDJSON export of threads, steps and feedbacks.
+
+Rows are read through server-side cursors and written out as they arrive, so
+memory stays flat regardless of the export size. All rows are read in one
+read-only REPEATABLE READ transaction, so the steps and feedbacks exported
+belong to the same snapshot as the threads. Usage::
+
+    python -m news_analyst_agent.export --since 2025-01-01 --gzip -o export.ndjson.gz
+"""
+import argparse
+import asyncio
+import json
+import sys
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator
+from uuid import UUID
+
+from sqlalchemy import select
+
+from news_analyst_agent.db.database import AsyncSessionLocal, dispose_engines
+from news_analyst_agent.db.models import Feedback, Step, Thread
+from news_analyst_agent.db.utils import parse_timestamp
+
+EXPORT_YIELD_PER = 1000
+# Flush the output buffer once it holds this many bytes
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def _json_default(value):
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _thread_filters(
+    since: datetime | None, until: datetime | None, user: str | None
+) -> list:
+    filters = []
+    if since is not None:
+        filters.append(Thread.createdAt >= since)
+    if until is not None:
+        filters.append(Thread.createdAt < until)
+    if user is not None:
+        filters.append(Thread.userIdentifier == user)
+    return filters
+
+
+async def iter_export_records(
+    since: datetime | None = None,
+    until: datetime | None = None,
+    user: str | None = None,
+) -> AsyncIterator[dict]:
+    """Yield threads, then their steps, then their feedbacks as plain dicts.
+
+    Each dict holds the row's columns and its kind under ``record``; a
+    ``type`` key would clash with the steps' own ``type`` column.
+
+    Core table selects are used instead of ORM entities so that rows are not
+    kept alive by the session's identity map while streaming.
+    """
+    filters = _thread_filters(since, until, user)
+    thread_ids = select(Thread.id).where(*filters)
+    queries = [
+        (
+            "thread",
+            select(Thread.__table__)
+            .where(*filters)
+            .order_by(Thread.createdAt, Thread.id),
+        ),
+        (
+            "step",
+            select(Step.__table__)
+            .where(Step.threadId.in_(thread_ids))
+            .order_by(Step.threadId, Step.createdAt, Step.id),
+        ),
+        (
+            "feedback",
+            select(Feedback.__table__)
+            .where(Feedback.threadId.in_(thread_ids))
+            .order_by(Feedback.threadId, Feedback.id),
+        ),
+    ]
+
+    async with AsyncSessionLocal() as session:
+        # Sets up the transaction, which must happen before its first query
+        await session.connection(
+            execution_options={"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+        )
+        for record_type, query in queries:
+            result = await session.stream(
+                query.execution_options(yield_per=EXPORT_YIELD_PER)
+            )
+            async for row in result.mappings():
+                yield {"record": record_type, **row}
+
+
+async def iter_ndjson(
+    records: AsyncIterator[dict], compress: bool = False
+) -> AsyncIterator[bytes]:
+    """Encode records as NDJSON chunks, optionally gzip-compressed"""
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffer = bytearray()
+
+    async for record in records:
+        buffer += json.dumps(record, default=_json_default).encode("utf8")
+        buffer += b"\n"
+        if len(buffer) >= EXPORT_CHUNK_BYTES:
+            chunk = compressor.compress(bytes(buffer)) if compressor else bytes(buffer)
+            buffer.clear()
+            if chunk:
+                yield chunk
+
+    tail = bytes(buffer)
+    if compressor:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
+
+
+async def export_to_file(
+    output, since=None, until=None, user=None, compress=False
+) -> None:
+    """Write an export to a binary file object"""
+    async for chunk in iter_ndjson(iter_export_records(since, until, user), compress):
+        output.write(chunk)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export threads, steps and feedbacks as NDJSON"
+    )
+    parser.add_argument(
+        "--since", type=parse_timestamp,
+        help="only threads created at or after this ISO timestamp",
+    )
+    parser.add_argument(
+        "--until", type=parse_timestamp,
+        help="only threads created before this ISO timestamp",
+    )
+    parser.add_argument("--user", help="only threads of this userIdentifier")
+    parser.add_argument("--gzip", action="store_true", help="gzip-compress the output")
+    parser.add_argument("-o", "--output", help="output file (defaults to stdout)")
+    args = parser.parse_args()
+
+    async def run(output):
+        try:
+            await export_to_file(
+                output, args.since, args.until, args.user, compress=args.gzip
+            )
+        finally:
+            await dispose_engines()
+
+    if args.output:
+        with Path(args.output).open("wb") as output:
+            asyncio.run(run(output))
+    else:
+        asyncio.run(run(sys.stdout.buffer))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Structured logging setup and request correlation.
+
+Log records go through one loguru handler:
+
+- With ``LOG_ENQUEUE`` the handler formats a record and puts it on a queue,
+  and a background thread writes it, so a slow stderr never blocks the event
+  loop. If the output falls ``LOG_QUEUE_SIZE`` records behind, new records
+  are dropped rather than waited for. ``flush_logs`` waits for the queue.
+- ``LOG_JSON`` writes each record as one JSON object with its ``extra``
+  fields, for log collectors; otherwise records are formatted for reading.
+- Debug records are kept for a ``LOG_DEBUG_SAMPLE_RATE`` fraction of requests.
+  The choice is made once per request, so a sampled request logs all its
+  debug records. Records below ``LOG_LEVEL`` are dropped before their message
+  is formatted, so log calls should pass values as arguments
+  (``logger.debug("Found {} items", len(items))``) rather than f-strings.
+
+``RequestContextMiddleware`` gives every HTTP request a correlation id (from
+``X-Request-ID`` or generated) that is added to the records of everything
+running for the request: graph nodes, tool threads and streamed responses.
+``add_log_context`` adds fields found later, such as the conversation's
+thread id.
+"""
+import asyncio
+import queue
+import random
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+from uuid import uuid4
+
+from loguru import logger
+
+from news_analyst_agent.config import Settings, get_settings
+from news_analyst_agent.metrics import metrics
+
+# Correlation fields of the current request; one dict shared by every task
+# and thread copied from the request's context, so fields added later are
+# seen by all of them
+_context: ContextVar[dict | None] = ContextVar("log_context", default=None)
+_sampled: ContextVar[bool | None] = ContextVar("log_debug_sampled", default=None)
+
+TEXT_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | "
+    "{extra[request_id]} | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
+    "<level>{message}</level>"
+)
+
+_DEBUG = logger.level("DEBUG").no
+# Set by configure_logging
+_debug_sample_rate = 1.0
+
+
+def _patch(record):
+    context = _context.get()
+    if context:
+        for key, value in context.items():
+            record["extra"].setdefault(key, value)
+    record["extra"].setdefault("request_id", "-")
+
+
+def sample_filter(rate: float):
+    """Keep records above DEBUG, and debug records of a ``rate`` fraction of requests"""
+
+    def keep(record) -> bool:
+        if record["level"].no > _DEBUG or rate >= 1:
+            return True
+        sampled = _sampled.get()
+        # Outside of a log context each record is sampled on its own
+        return random.random() < rate if sampled is None else sampled
+
+    return keep
+
+
+class BackgroundSink:
+    """Sink handing formatted records to a thread that writes them to ``stream``.
+
+    Unlike loguru's own ``enqueue``, which pickles every record through a
+    multiprocessing queue and blocks while the queue is full, records are
+    passed as strings and the caller never waits; records that don't fit are
+    counted in ``log_records_dropped_total``. See ``benchmarks/bench_logging.py``.
+    """
+
+    def __init__(self, stream, max_pending: int = 10000):
+        self._stream = stream
+        self._queue: queue.Queue[str | None] = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, message: str):
+        try:
+            # The message's record is left behind
+            self._queue.put_nowait(str(message))
+        except queue.Full:
+            metrics.inc("log_records_dropped_total")
+
+    def _run(self):
+        while True:
+            message = self._queue.get()
+            try:
+                if message is None:
+                    return
+                self._stream.write(message)
+                if self._queue.empty():
+                    self._stream.flush()
+            except Exception:
+                # Nowhere left to report it
+                pass
+            finally:
+                self._queue.task_done()
+
+    def isatty(self) -> bool:
+        # Lets loguru colorize records for a terminal
+        return callable(getattr(self._stream, "isatty", None)) and self._stream.isatty()
+
+    def join(self):
+        """Wait until all queued records are written"""
+        self._queue.join()
+
+    async def complete(self):
+        await asyncio.to_thread(self.join)
+
+    def stop(self):
+        self._queue.put(None)
+        self._thread.join()
+
+
+def configure_logging(settings: Settings | None = None, sink: Any = sys.stderr):
+    """Replace loguru's handlers with the configured one; call once per process"""
+    global _debug_sample_rate
+    settings = settings or get_settings()
+    _debug_sample_rate = settings.LOG_DEBUG_SAMPLE_RATE
+    logger.remove()
+    logger.configure(patcher=_patch)
+    if settings.LOG_ENQUEUE:
+        sink = BackgroundSink(sink, settings.LOG_QUEUE_SIZE)
+    logger.add(
+        sink,
+        level=settings.LOG_LEVEL,
+        format=TEXT_FORMAT,
+        serialize=settings.LOG_JSON,
+        filter=sample_filter(settings.LOG_DEBUG_SAMPLE_RATE),
+        # Tracebacks with local variables may contain credentials and message bodies
+        diagnose=False,
+    )
+
+
+async def flush_logs():
+    """Wait until queued records are written"""
+    await logger.complete()
+
+
+@contextmanager
+def log_context(**fields):
+    """Add correlation fields to every record logged within the block.
+
+    The outermost block, e.g. a request, decides whether its debug records
+    are sampled.
+    """
+    token = _context.set({**(_context.get() or {}), **fields})
+    sampled_token = None
+    if _sampled.get() is None:
+        sampled_token = _sampled.set(random.random() < _debug_sample_rate)
+    try:
+        yield
+    finally:
+        if sampled_token is not None:
+            _sampled.reset(sampled_token)
+        _context.reset(token)
+
+
+def add_log_context(**fields):
+    """Add fields to the enclosing ``log_context``, including for tasks started before"""
+    context = _context.get()
+    if context is not None:
+        context.update(fields)
+
+
+class RequestContextMiddleware:
+    """ASGI middleware running each HTTP request in a log context with its id.
+
+    The id is taken from the ``X-Request-ID`` header if the client sent one,
+    and returned in the same header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid4().hex
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-request-id", request_id.encode("latin-1")),
+                ]
+            await send(message)
+
+        with log_context(request_id=request_id):
+            await self.app(scope, receive, send_with_id)
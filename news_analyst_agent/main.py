@@ -1,50 +1,96 @@
+import asyncio
 from contextlib import asynccontextmanager
-from datetime import datetime
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 
-from news_analyst_agent.api import chat_agent, health, retrieve_db
-from news_analyst_agent.tasks.cleanup import cleanup_orphaned_threads
-
-# Initialize scheduler
-scheduler = AsyncIOScheduler()
+from news_analyst_agent.agents.checkpoint import close_checkpointer
+from news_analyst_agent.api import (
+    analytics,
+    chat_agent,
+    export,
+    health,
+    metrics,
+    news,
+    retrieve_db,
+)
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.db.database import dispose_engines
+from news_analyst_agent.log import RequestContextMiddleware, configure_logging, flush_logs
+from news_analyst_agent.memory import MemoryProfilingMiddleware, start_tracing
+from news_analyst_agent.tasks.scheduler import create_scheduler
+from news_analyst_agent.warmup import run_warmup
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan manager for the FastAPI application.
     Handles startup and shutdown events.
     """
+    settings = get_settings()
+    scheduler = None
     try:
-        # Startup: Schedule and start the cleanup task
-        scheduler.add_job(
-            cleanup_orphaned_threads,
-            'interval',
-            hours=1,
-            next_run_time=datetime.now(),
-            id='cleanup_orphaned_threads'
+        # Without a dedicated worker every API process also schedules the
+        # shared jobs; their locks keep each job from running more than once.
+        # Per-process jobs, like the prefetch into this process's retrieval
+        # cache, always run here
+        scheduler = create_scheduler(
+            settings, shared=settings.SCHEDULER_IN_API, per_process=True
         )
         scheduler.start()
-        logger.info("Started background cleanup task scheduler")
+        logger.info(
+            "Started background task scheduler with jobs: {}",
+            [job.id for job in scheduler.get_jobs()],
+        )
+        app.state.scheduler = scheduler
+
+        # Warm up in the background; /api/health/ready reports when it's done
+        app.state.warmup_task = asyncio.create_task(run_warmup())
         
         # Add startup log
         logger.info("Application startup complete")
         yield
     except Exception as e:
-        logger.error(f"Error during startup: {e}")
+        logger.error("Error during startup: {}", e)
         raise
     finally:
         # Shutdown: Clean up resources
         try:
-            scheduler.shutdown()
-            logger.info("Shut down cleanup task scheduler")
+            warmup_task = getattr(app.state, "warmup_task", None)
+            if warmup_task is not None:
+                warmup_task.cancel()
+            if scheduler is not None:
+                scheduler.shutdown()
+                logger.info("Shut down background task scheduler")
+            await close_checkpointer()
+            await dispose_engines()
         except Exception as e:
-            logger.error(f"Error during shutdown: {e}")
+            logger.error("Error during shutdown: {}", e)
+        await flush_logs()
+
+configure_logging()
+
+# Endpoints that return plain data rather than a typed response are encoded
+# with orjson instead of the standard library json module
+app = FastAPI(
+    title="News Analyst API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+if get_settings().MEMORY_PROFILING:
+    # Debug mode: tracemalloc only sees allocations made after it started
+    start_tracing(get_settings().MEMORY_PROFILING_FRAMES)
+    app.add_middleware(MemoryProfilingMiddleware)
 
-app = FastAPI(title="News Analyst API", lifespan=lifespan)
+# Outermost, so that every record of a request carries its id
+app.add_middleware(RequestContextMiddleware)
 
 # Include the API router
 app.include_router(health.router, prefix="/api")
 app.include_router(retrieve_db.router, prefix="/api")
-app.include_router(chat_agent.router, prefix="/api") 
\ No newline at end of file
+app.include_router(chat_agent.router, prefix="/api")
+app.include_router(export.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
+app.include_router(news.router, prefix="/api")
+app.include_router(analytics.router, prefix="/api") 
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""Per-request memory accounting.
+
+With ``MEMORY_PROFILING`` enabled, allocations are traced with tracemalloc and
+``MemoryProfilingMiddleware`` records two summaries per route:
+
+- ``request_memory_peak_bytes``: how far traced memory rose above its level
+  at the start of the request while the request was handled
+- ``request_memory_retained_bytes``: how much more memory was allocated when
+  the response was sent than when the request came in, e.g. by caches or
+  leaks
+
+Tracing slows down allocation-heavy code several times over, so this is meant
+for a debug deployment. The tracer is shared by concurrent requests, so their
+numbers include each other's allocations; send requests one at a time to
+measure a single one. ``/api/metrics/memory`` lists the largest allocations.
+"""
+import resource
+import sys
+import tracemalloc
+
+from news_analyst_agent.metrics import metrics
+
+# ru_maxrss is in kilobytes on Linux and in bytes on macOS
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def start_tracing(frames: int = 1):
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def memory_stats() -> dict[str, int]:
+    """Peak RSS of the process, plus traced memory while tracing"""
+    stats = {"max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_UNIT}
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        stats["traced_bytes"] = current
+        stats["traced_peak_bytes"] = peak
+    return stats
+
+
+def top_allocations(limit: int = 20, key_type: str = "lineno") -> list[dict]:
+    """The largest live allocations grouped by source line (or file), largest first"""
+    if not tracemalloc.is_tracing():
+        return []
+    snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+    return [
+        {
+            "location": str(stat.traceback[0]),
+            "size_bytes": stat.size,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics(key_type)[:limit]
+    ]
+
+
+class MemoryProfilingMiddleware:
+    """ASGI middleware recording the memory use of each HTTP request.
+
+    A streaming response is measured until its last chunk is sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracemalloc.is_tracing():
+            await self.app(scope, receive, send)
+            return
+
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            # FastAPI puts the matched route in the scope while routing
+            path = getattr(scope.get("route"), "path", "unmatched")
+            metrics.observe("request_memory_peak_bytes", max(peak - start, 0), path=path)
+            metrics.observe("request_memory_retained_bytes", max(current - start, 0), path=path)
+
+
+metrics.register_collector("memory", memory_stats)
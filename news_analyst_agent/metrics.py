@@ -0,0 +1,85 @@
+"""Minimal in-process metrics registry.
+
+Counters, gauges and timing summaries are kept in memory per process and
+exposed as JSON through ``/api/metrics``. Collectors are callables that are
+evaluated lazily whenever a snapshot is taken, which suits values such as
+connection pool state that are cheap to read but expensive to push.
+"""
+import threading
+from typing import Any, Callable
+
+
+def _series(name: str, labels: dict[str, Any]) -> str:
+    if not labels:
+        return name
+    label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+    return f"{name}{{{label_str}}}"
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = {}
+        self._gauges: dict[str, float] = {}
+        self._timings: dict[str, dict[str, float]] = {}
+        self._collectors: dict[str, Callable[[], dict[str, Any]]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increment a counter"""
+        key = _series(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """Set a gauge to an absolute value"""
+        key = _series(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record one observation (e.g. a duration in seconds) in a summary"""
+        key = _series(name, labels)
+        with self._lock:
+            summary = self._timings.setdefault(
+                key, {"count": 0, "sum": 0.0, "max": 0.0, "last": 0.0}
+            )
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["max"] = max(summary["max"], value)
+            summary["last"] = value
+
+    def register_collector(self, name: str, collector: Callable[[], dict[str, Any]]):
+        """Register a callable evaluated on every snapshot"""
+        with self._lock:
+            self._collectors[name] = collector
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a point-in-time copy of all metrics"""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            timings = {k: dict(v) for k, v in self._timings.items()}
+            collectors = dict(self._collectors)
+
+        collected = {}
+        for name, collector in collectors.items():
+            try:
+                collected[name] = collector()
+            except Exception as e:
+                collected[name] = {"error": str(e)}
+
+        return {
+            "counters": counters,
+            "gauges": gauges,
+            "timings": timings,
+            "collectors": collected,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timings.clear()
+
+
+metrics = Metrics()
@@ -0,0 +1,164 @@
+"""Database archive of retrieved articles shared by all processes.
+
+Every article fetched from an upstream source is upserted into the
+``news_articles`` table, so API workers, the scheduler and the Chainlit UI
+build one corpus between them. The archive is searched with Postgres
+full-text search as an additional retrieval source next to the live tools,
+and serves article content that is no longer in a process's news store.
+"""
+from datetime import timedelta
+
+from loguru import logger
+from sqlalchemy import Select, case, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.db.database import AsyncSessionLocal, get_sync_engine
+from news_analyst_agent.db.models import NewsArticle
+from news_analyst_agent.db.utils import parse_timestamp, utcnow
+from news_analyst_agent.metrics import metrics
+from news_analyst_agent.news_item import NewsItem
+from news_analyst_agent.news_store import clean_text
+
+
+def _article_row(item: NewsItem, fetched_at) -> dict:
+    content, truncated = clean_text(item.content)
+    try:
+        published_at = parse_timestamp(item.published)
+    except ValueError:
+        published_at = None
+    return {
+        "id": item.id,
+        "link": item.link,
+        "title": item.title,
+        "description": item.description,
+        "content": content,
+        "truncated": truncated,
+        "source": item.source,
+        "query": item.query,
+        "published_at": published_at,
+        "fetched_at": fetched_at,
+    }
+
+
+# What _news_item reads; the search vector can be larger than the content
+ITEM_COLUMNS = (
+    NewsArticle.id,
+    NewsArticle.title,
+    NewsArticle.link,
+    NewsArticle.source,
+    NewsArticle.description,
+    NewsArticle.content,
+    NewsArticle.truncated,
+    NewsArticle.query,
+    NewsArticle.published_at,
+)
+
+
+def _news_item(article) -> NewsItem:
+    return NewsItem(
+        id=article.id,
+        title=article.title,
+        link=article.link,
+        source=article.source,
+        description=article.description,
+        content=article.content,
+        truncated=article.truncated,
+        query=article.query,
+        published=article.published_at.isoformat() if article.published_at else None,
+    )
+
+
+def upsert_statement(items: list[NewsItem]):
+    """Insert or refresh the given articles in one statement.
+
+    An article retrieved again without content (e.g. from a search snippet)
+    keeps the content archived before.
+    """
+    fetched_at = utcnow()
+    # A statement may not update the same row twice
+    rows = {item.id: _article_row(item, fetched_at) for item in items}
+    stmt = insert(NewsArticle).values(list(rows.values()))
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[NewsArticle.id],
+        set_={
+            "title": excluded.title,
+            "description": func.coalesce(excluded.description, NewsArticle.description),
+            "content": func.coalesce(excluded.content, NewsArticle.content),
+            "truncated": case(
+                (excluded.content.is_(None), NewsArticle.truncated),
+                else_=excluded.truncated,
+            ),
+            "published_at": func.coalesce(excluded.published_at, NewsArticle.published_at),
+            "fetched_at": excluded.fetched_at,
+        },
+    )
+
+
+def archive_news(items: list[NewsItem]):
+    """Store freshly retrieved articles in the archive.
+
+    Failures are logged and otherwise ignored; retrieval works without the
+    archive.
+    """
+    if not items or not get_settings().NEWS_ARCHIVE_ENABLED:
+        return
+    try:
+        with get_sync_engine().begin() as conn:
+            conn.execute(upsert_statement(items))
+    except Exception as e:
+        logger.warning("Failed to archive {} news articles: {}", len(items), e)
+        metrics.inc("news_archive_errors_total", operation="upsert")
+        return
+    metrics.inc("news_archived_total", len(items))
+
+
+def search_query(query: str, limit: int, max_age_days: float) -> Select:
+    """Archived articles matching ``query``, best matches first, then newest first"""
+    tsquery = func.websearch_to_tsquery("english", query)
+    return (
+        select(*ITEM_COLUMNS)
+        .where(
+            NewsArticle.search.op("@@")(tsquery),
+            NewsArticle.fetched_at >= utcnow() - timedelta(days=max_age_days),
+        )
+        .order_by(
+            func.ts_rank_cd(NewsArticle.search, tsquery).desc(),
+            func.coalesce(NewsArticle.published_at, NewsArticle.fetched_at).desc(),
+        )
+        .limit(limit)
+    )
+
+
+def search_archive(query: str) -> list[NewsItem]:
+    """Search recently archived articles, returning no results if the archive is unavailable"""
+    settings = get_settings()
+    if not settings.NEWS_ARCHIVE_ENABLED:
+        return []
+    stmt = search_query(query, settings.NEWS_ARCHIVE_RESULTS, settings.NEWS_ARCHIVE_MAX_AGE_DAYS)
+    try:
+        with get_sync_engine().connect() as conn:
+            rows = conn.execute(stmt).all()
+    except Exception as e:
+        logger.warning("News archive search failed for {!r}: {}", query, e)
+        metrics.inc("news_archive_errors_total", operation="search")
+        return []
+    metrics.inc("news_archive_results_total", len(rows))
+    return [_news_item(row) for row in rows]
+
+
+async def get_archived(article_id: str) -> NewsItem | None:
+    """Return an archived article with its content, or None if unknown or the archive is unavailable"""
+    if not get_settings().NEWS_ARCHIVE_ENABLED:
+        return None
+    try:
+        async with AsyncSessionLocal() as session:
+            article = (
+                await session.execute(select(*ITEM_COLUMNS).where(NewsArticle.id == article_id))
+            ).one_or_none()
+    except Exception as e:
+        logger.warning("News archive lookup of {} failed: {}", article_id, e)
+        metrics.inc("news_archive_errors_total", operation="get")
+        return None
+    return _news_item(article) if article is not None else None
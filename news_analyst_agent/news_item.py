@@ -0,0 +1,37 @@
+import hashlib
+import sys
+from dataclasses import dataclass, replace
+
+
+def news_id(link: str) -> str:
+    """Stable id of an article, the same in every process and across restarts"""
+    return hashlib.sha1(link.strip().encode("utf8")).hexdigest()[:16]
+
+
+@dataclass(slots=True)
+class NewsItem:
+    """A retrieved article as it flows from the tools to the API.
+
+    Items are only turned into dicts/JSON at the edges (tool messages, API
+    responses, streaming). ``source`` values are interned since every item
+    repeats one of a handful of names.
+    """
+
+    title: str
+    link: str
+    source: str
+    description: str | None = None
+    content: str | None = None
+    query: str | None = None
+    published: str | None = None
+    truncated: bool = False
+    id: str = ""
+
+    def __post_init__(self):
+        self.source = sys.intern(self.source)
+        if not self.id:
+            self.id = news_id(self.link)
+
+    def summary(self) -> "NewsItem":
+        """The same item without its content"""
+        return replace(self, content=None, truncated=False)
@@ -0,0 +1,60 @@
+"""Server-side store for retrieved article content.
+
+Agent state and API responses only carry lightweight news summaries. The
+cleaned, size-capped article text is kept here under a stable id derived from
+the article link and served by ``GET /api/news/{id}``.
+"""
+import re
+import unicodedata
+from dataclasses import replace
+
+from news_analyst_agent.cache import TTLCache
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.metrics import metrics
+from news_analyst_agent.news_item import NewsItem
+
+settings = get_settings()
+
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+_SPACES = re.compile(r"[ \t]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+news_store = TTLCache(maxsize=settings.NEWS_STORE_SIZE, ttl=settings.NEWS_STORE_TTL_SECONDS)
+metrics.register_collector("news_store", news_store.stats)
+
+
+def clean_text(text: str | None, max_chars: int | None = None) -> tuple[str | None, bool]:
+    """Normalize scraped page text and cap its length.
+
+    Returns the cleaned text and whether it was truncated.
+    """
+    if not text:
+        return None, False
+    max_chars = max_chars or settings.NEWS_CONTENT_MAX_CHARS
+    text = unicodedata.normalize("NFKC", text)
+    text = _CONTROL_CHARS.sub("", text.replace("\r\n", "\n").replace("\r", "\n"))
+    lines = (_SPACES.sub(" ", line).strip() for line in text.split("\n"))
+    text = _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+    if len(text) <= max_chars:
+        return text, False
+    return text[:max_chars].rstrip(), True
+
+
+def store_news(items: list[NewsItem]) -> list[NewsItem]:
+    """Keep the content of retrieved items in the store and return their summaries"""
+    summaries = []
+    for item in items:
+        content, truncated = clean_text(item.content)
+        # Keep content already fetched under the same id by another tool
+        stored = news_store.get(item.id)
+        if content is None and stored is not None:
+            content, truncated = stored.content, stored.truncated
+        news_store.set(item.id, replace(item, content=content, truncated=truncated))
+        summaries.append(item.summary())
+    metrics.inc("news_stored_total", len(summaries))
+    return summaries
+
+
+def get_news(article_id: str) -> NewsItem | None:
+    """Return a stored article with its content, or None if unknown or expired"""
+    return news_store.get(article_id)
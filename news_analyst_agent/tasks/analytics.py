@@ -0,0 +1,147 @@
+import time
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+
+from loguru import logger
+from sqlalchemy import text
+
+from news_analyst_agent.db.database import AsyncSessionLocal
+from news_analyst_agent.metrics import metrics
+from news_analyst_agent.tasks.scheduler import lock_key
+
+# Writes to a thread's steps and feedbacks bump threads."updatedAt" (see the
+# c5e8a2f1d694 migration), so the days to recompute are those of threads and
+# steps of threads updated since the last refresh. Each of those days is then
+# recomputed as a whole, which makes overlapping refreshes harmless.
+AFFECTED_DAYS = """
+    SELECT DISTINCT day FROM (
+        SELECT ("createdAt" AT TIME ZONE 'UTC')::date AS day
+        FROM threads
+        WHERE "updatedAt" > :since
+        UNION
+        SELECT (s."createdAt" AT TIME ZONE 'UTC')::date
+        FROM steps s JOIN threads t ON t.id = s."threadId"
+        WHERE t."updatedAt" > :since
+    ) changed
+    WHERE day IS NOT NULL
+"""
+
+# Deleted threads leave nothing for AFFECTED_DAYS to find, so a full refresh
+# also recomputes every day that has summaries
+SUMMARY_DAYS = """
+    SELECT day FROM analytics_threads_daily
+    UNION
+    SELECT day FROM analytics_steps_daily
+    UNION
+    SELECT day FROM analytics_feedback_daily
+"""
+
+_PROFILE = "coalesce(t.metadata ->> 'chat_profile', 'unknown')"
+
+
+def _in_days(column: str) -> str:
+    # The range lets the createdAt indexes narrow the scan down to the days
+    return f"""
+        {column} >= :start AND {column} < :end
+        AND ({column} AT TIME ZONE 'UTC')::date = ANY(CAST(:days AS date[]))
+    """
+
+
+REFRESH_STATEMENTS = {
+    "threads": [
+        "DELETE FROM analytics_threads_daily WHERE day = ANY(CAST(:days AS date[]))",
+        f"""
+        INSERT INTO analytics_threads_daily (day, chat_profile, threads)
+        SELECT (t."createdAt" AT TIME ZONE 'UTC')::date, {_PROFILE}, count(*)
+        FROM threads t
+        WHERE {_in_days('t."createdAt"')}
+        GROUP BY 1, 2
+        """,
+    ],
+    "steps": [
+        "DELETE FROM analytics_steps_daily WHERE day = ANY(CAST(:days AS date[]))",
+        f"""
+        INSERT INTO analytics_steps_daily (
+            day, chat_profile, step_type, steps, error_steps,
+            timed_steps, latency_seconds_sum, latency_seconds_max
+        )
+        SELECT (s."createdAt" AT TIME ZONE 'UTC')::date, {_PROFILE}, s.type,
+               count(*),
+               count(*) FILTER (WHERE s."isError"),
+               count(s."end" - s.start),
+               coalesce(sum(extract(epoch FROM s."end" - s.start)), 0),
+               max(extract(epoch FROM s."end" - s.start))
+        FROM steps s JOIN threads t ON t.id = s."threadId"
+        WHERE {_in_days('s."createdAt"')}
+        GROUP BY 1, 2, 3
+        """,
+    ],
+    "feedbacks": [
+        "DELETE FROM analytics_feedback_daily WHERE day = ANY(CAST(:days AS date[]))",
+        f"""
+        INSERT INTO analytics_feedback_daily (day, chat_profile, value, feedbacks)
+        SELECT (t."createdAt" AT TIME ZONE 'UTC')::date, {_PROFILE}, f.value, count(*)
+        FROM feedbacks f JOIN threads t ON t.id = f."threadId"
+        WHERE {_in_days('t."createdAt"')}
+        GROUP BY 1, 2, 3
+        """,
+    ],
+}
+
+# Not the job's own key: the scheduled job already holds that one while it runs
+REFRESH_LOCK_KEY = lock_key("analytics_summaries")
+
+# Threads are touched before the writing transaction commits, which may be
+# after a refresh has read past the touch time
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, dt_time.min, tzinfo=timezone.utc)
+
+
+async def refresh_analytics(full: bool = False) -> dict[str, int]:
+    """Recompute the analytics summaries of days with changes since the last refresh.
+
+    Deleted threads don't count as changes, so their days keep overcounting
+    until a ``full`` refresh, which recomputes every day; the
+    ``refresh_analytics_full`` job runs one every ANALYTICS_FULL_REFRESH_HOURS.
+    Returns the number of recomputed days.
+    """
+    start_time = time.perf_counter()
+    async with AsyncSessionLocal() as session, session.begin():
+        # Refreshes from the scheduler and the API run one after the other
+        await session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": REFRESH_LOCK_KEY})
+        refreshed_at = await session.scalar(text("SELECT now()"))
+        since = None if full else await session.scalar(
+            text("SELECT refreshed_at FROM analytics_refresh WHERE name = 'summaries'")
+        )
+        since = datetime.min.replace(tzinfo=timezone.utc) if since is None else since - WATERMARK_OVERLAP
+
+        result = await session.execute(text(AFFECTED_DAYS), {"since": since})
+        days = {row.day for row in result}
+        if full:
+            days.update((await session.scalars(text(SUMMARY_DAYS))).all())
+        days = sorted(days)
+        if days:
+            params = {
+                "days": days,
+                "start": _day_start(days[0]),
+                "end": _day_start(days[-1] + timedelta(days=1)),
+            }
+            for statements in REFRESH_STATEMENTS.values():
+                for statement in statements:
+                    await session.execute(text(statement), params)
+
+        await session.execute(
+            text("""
+                INSERT INTO analytics_refresh (name, refreshed_at)
+                VALUES ('summaries', :refreshed_at)
+                ON CONFLICT (name) DO UPDATE SET refreshed_at = excluded.refreshed_at
+            """),
+            {"refreshed_at": refreshed_at},
+        )
+
+    duration = time.perf_counter() - start_time
+    metrics.observe("analytics_refresh_seconds", duration)
+    logger.info("Refreshed analytics for {} days in {:.2f}s", len(days), duration)
+    return {"days": len(days)}
@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+from loguru import logger
+from sqlalchemy import text
+
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.db.database import AsyncSessionLocal
+from news_analyst_agent.metrics import metrics
+
+# Tables are owned by langgraph-checkpoint-postgres (see agents/checkpoint.py).
+# Checkpoint ids are time-ordered, so the newest checkpoints sort last.
+# Each statement deletes at most :batch_size rows, picked by ctid, and is
+# repeated until it deletes fewer.
+PRUNE_STATEMENTS = {
+    # Whole conversations that haven't been touched for the retention period
+    "expired": """
+        DELETE FROM checkpoints
+        WHERE ctid IN (
+            SELECT c.ctid
+            FROM checkpoints c
+            JOIN (
+                SELECT thread_id
+                FROM checkpoints
+                GROUP BY thread_id
+                HAVING max((checkpoint ->> 'ts')::timestamptz) < now() - make_interval(secs => :ttl_seconds)
+            ) expired ON expired.thread_id = c.thread_id
+            LIMIT :batch_size
+        )
+    """,
+    # All but the newest checkpoints of each conversation
+    "checkpoints": """
+        DELETE FROM checkpoints
+        WHERE ctid IN (
+            SELECT ctid
+            FROM (
+                SELECT ctid,
+                       row_number() OVER (
+                           PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+                       ) AS position
+                FROM checkpoints
+            ) ranked
+            WHERE position > :keep_last
+            LIMIT :batch_size
+        )
+    """,
+    # Pending writes of checkpoints that no longer exist
+    "checkpoint_writes": """
+        DELETE FROM checkpoint_writes
+        WHERE ctid IN (
+            SELECT w.ctid
+            FROM checkpoint_writes w
+            WHERE NOT EXISTS (
+                SELECT 1 FROM checkpoints c
+                WHERE c.thread_id = w.thread_id
+                  AND c.checkpoint_ns = w.checkpoint_ns
+                  AND c.checkpoint_id = w.checkpoint_id
+            )
+            LIMIT :batch_size
+        )
+    """,
+    # Channel values no remaining checkpoint refers to
+    "checkpoint_blobs": """
+        DELETE FROM checkpoint_blobs
+        WHERE ctid IN (
+            SELECT b.ctid
+            FROM checkpoint_blobs b
+            WHERE NOT EXISTS (
+                SELECT 1
+                FROM checkpoints c,
+                     jsonb_each_text(c.checkpoint -> 'channel_versions') AS v(channel, version)
+                WHERE c.thread_id = b.thread_id
+                  AND c.checkpoint_ns = b.checkpoint_ns
+                  AND v.channel = b.channel
+                  AND v.version = b.version
+            )
+            LIMIT :batch_size
+        )
+    """,
+}
+
+
+async def _prune(statement: str, params: dict) -> int:
+    """Run one prune statement in batches, committing after each"""
+    deleted = 0
+    while True:
+        async with AsyncSessionLocal() as session, session.begin():
+            result = await session.execute(text(statement), params)
+        deleted += result.rowcount
+        if result.rowcount == 0 or result.rowcount < params["batch_size"]:
+            return deleted
+        # Let other tasks on the event loop run between batches
+        await asyncio.sleep(0)
+
+
+async def prune_checkpoints(
+    keep_last: int | None = None,
+    ttl_days: float | None = None,
+    batch_size: int | None = None,
+) -> dict[str, int]:
+    """Keep the newest ``keep_last`` checkpoints of each conversation.
+
+    Conversations idle for more than ``ttl_days`` are dropped entirely, then
+    writes and blobs that are no longer referenced are removed. Rows are
+    deleted ``batch_size`` at a time, each batch in its own short transaction.
+    """
+    settings = get_settings()
+    keep_last = settings.CHECKPOINT_KEEP_LAST if keep_last is None else keep_last
+    ttl_days = settings.CHECKPOINT_TTL_DAYS if ttl_days is None else ttl_days
+    batch_size = settings.CHECKPOINT_PRUNE_BATCH_SIZE if batch_size is None else batch_size
+    params = {"keep_last": keep_last, "ttl_seconds": ttl_days * 86400, "batch_size": batch_size}
+
+    deleted = {}
+    start = time.perf_counter()
+    try:
+        for name, statement in PRUNE_STATEMENTS.items():
+            deleted[name] = await _prune(statement, params)
+    except Exception:
+        # Failed with what was deleted so far; the scheduler records the error
+        logger.error("Checkpoint pruning failed after deleting {}", deleted)
+        raise
+    finally:
+        metrics.observe("checkpoint_prune_seconds", time.perf_counter() - start)
+        for name, count in deleted.items():
+            metrics.inc("checkpoint_pruned_total", count, kind=name)
+
+    logger.info("Pruned checkpoints: {}", deleted)
+    return deleted
@@ -1,35 +1,112 @@
+import asyncio
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 
 from loguru import logger
-from sqlalchemy import and_, delete, or_
+from sqlalchemy import and_, delete, or_, select
 
+from news_analyst_agent.config import get_settings
 from news_analyst_agent.db.database import AsyncSessionLocal
-from news_analyst_agent.db.models import Thread
+from news_analyst_agent.db.models import Element, Feedback, Step, Thread
+from news_analyst_agent.db.utils import utcnow
+from news_analyst_agent.metrics import metrics
 
+# Children are deleted before their thread since their foreign keys don't cascade
+CHILD_MODELS = (Feedback, Element, Step)
 
-async def cleanup_orphaned_threads():
-    """Delete threads that don't have a userIdentifier and are older than 24 hours
+
+@dataclass
+class CleanupStats:
+    threads: int = 0
+    steps: int = 0
+    feedbacks: int = 0
+    elements: int = 0
+    batches: int = 0
+    duration: float = 0.0
+    complete: bool = True
+
+
+def orphaned_threads_filter(cutoff: datetime):
+    """Anonymous threads older than ``cutoff`` or without a creation time.
+
+    Threads of a user are always kept, also if their creation time is unknown.
     """
-    try:
-        async with AsyncSessionLocal() as session:
-            # Find threads without userIdentifier that are older than 1 hour
-            one_day_ago = (datetime.now() - timedelta(hours=1)).isoformat()
-            
-            delete_stmt = delete(Thread).where(
-                or_(
-                    and_(
-                        Thread.userIdentifier.is_(None),
-                        Thread.createdAt < one_day_ago
-                    ),
-                    Thread.createdAt.is_(None)
-                )
+    return and_(
+        Thread.userIdentifier.is_(None),
+        or_(Thread.createdAt < cutoff, Thread.createdAt.is_(None))
+    )
+
+
+async def _delete_batch(cutoff: datetime, batch_size: int, stats: CleanupStats) -> int:
+    """Delete one batch of orphaned threads and their children in a single transaction"""
+    async with AsyncSessionLocal() as session, session.begin():
+        thread_ids = (
+            await session.execute(
+                select(Thread.id)
+                .where(orphaned_threads_filter(cutoff))
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+        ).scalars().all()
+        if not thread_ids:
+            return 0
+
+        for model in CHILD_MODELS:
+            result = await session.execute(
+                delete(model).where(model.threadId.in_(thread_ids))
             )
-            
-            result = await session.execute(delete_stmt)
-            await session.commit()
-            
-            deleted_count = result.rowcount
-            logger.info(f"Cleaned up {deleted_count} orphaned threads")
-            
-    except Exception as e:
-        logger.error(f"Error during thread cleanup: {str(e)}") 
\ No newline at end of file
+            table = model.__tablename__
+            setattr(stats, table, getattr(stats, table) + result.rowcount)
+
+        result = await session.execute(delete(Thread).where(Thread.id.in_(thread_ids)))
+        stats.threads += result.rowcount
+    stats.batches += 1
+    return len(thread_ids)
+
+
+async def cleanup_orphaned_threads(
+    batch_size: int | None = None,
+    time_budget: float | None = None,
+) -> CleanupStats:
+    """Delete orphaned threads and their steps, feedbacks and elements in bounded batches.
+
+    Each batch runs in its own short transaction. The run stops once the time
+    budget is spent and leaves the rest of the backlog for the next run.
+    """
+    settings = get_settings()
+    batch_size = batch_size or settings.CLEANUP_BATCH_SIZE
+    time_budget = time_budget or settings.CLEANUP_TIME_BUDGET_SECONDS
+    cutoff = utcnow() - timedelta(hours=settings.CLEANUP_ORPHAN_AGE_HOURS)
+
+    stats = CleanupStats()
+    start = time.perf_counter()
+    try:
+        while True:
+            if time.perf_counter() - start >= time_budget:
+                stats.complete = False
+                break
+            deleted = await _delete_batch(cutoff, batch_size, stats)
+            if deleted < batch_size:
+                break
+            # Let other tasks on the event loop run between batches
+            await asyncio.sleep(0)
+    except Exception:
+        # The scheduler records the error; batches committed so far stay deleted
+        stats.complete = False
+        logger.error("Thread cleanup failed after {} batches", stats.batches)
+        raise
+    finally:
+        stats.duration = time.perf_counter() - start
+        metrics.observe("cleanup_run_seconds", stats.duration)
+        metrics.inc("cleanup_batches_total", stats.batches)
+        for table in ("threads", "steps", "feedbacks", "elements"):
+            metrics.inc("cleanup_deleted_total", getattr(stats, table), table=table)
+        metrics.set_gauge("cleanup_last_run_complete", int(stats.complete))
+
+    logger.info(
+        "Cleaned up {} orphaned threads ({} steps, {} feedbacks, {} elements) in {} batches, {:.2f}s{}",
+        stats.threads, stats.steps, stats.feedbacks, stats.elements, stats.batches, stats.duration,
+        "" if stats.complete else ", backlog remaining",
+    )
+    return stats
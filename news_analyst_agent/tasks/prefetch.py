@@ -0,0 +1,73 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+
+from loguru import logger
+
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.metrics import metrics
+
+
+@dataclass
+class PrefetchStats:
+    fetched: int = 0
+    empty: int = 0
+    failed: int = 0
+    duration: float = 0.0
+
+
+def prefetch_ttl() -> float:
+    """Keep prefetched entries until shortly after the next run has refreshed them"""
+    settings = get_settings()
+    return max(
+        settings.RETRIEVAL_CACHE_TTL_SECONDS,
+        settings.PREFETCH_INTERVAL_MINUTES * 60 + 2 * settings.PREFETCH_JITTER_SECONDS,
+    )
+
+
+async def prefetch_watchlist(watchlist: list[str] | None = None) -> PrefetchStats:
+    """Refresh the retrieval cache with news for every watchlist entry.
+
+    Each entry is searched with both the Yahoo Finance and the DuckDuckGo
+    tool. Calls are shuffled and capped in concurrency, and they are paced by
+    the same upstream rate limits as chat requests, waiting up to
+    PREFETCH_MAX_WAIT_SECONDS for them, so a run never bursts against the
+    upstream APIs.
+    """
+    from news_analyst_agent.tools.ddg_search import ddg_search
+    from news_analyst_agent.tools.retrieval_cache import refresh
+    from news_analyst_agent.tools.upstream import upstream_max_wait
+    from news_analyst_agent.tools.yfinance_news import yf_tool
+
+    settings = get_settings()
+    watchlist = settings.NEWS_WATCHLIST if watchlist is None else watchlist
+    calls = [(tool, query) for query in watchlist for tool in (yf_tool, ddg_search)]
+    random.shuffle(calls)
+
+    semaphore = asyncio.Semaphore(settings.PREFETCH_CONCURRENCY)
+    ttl = prefetch_ttl()
+    stats = PrefetchStats()
+
+    async def fetch(tool, query):
+        async with semaphore:
+            try:
+                with upstream_max_wait(settings.PREFETCH_MAX_WAIT_SECONDS):
+                    results = await asyncio.to_thread(refresh, tool, query, ttl)
+                outcome = "fetched" if results else "empty"
+            except Exception as e:
+                logger.warning("Prefetch of {} for {!r} failed: {}", tool.name, query, e)
+                outcome = "failed"
+        setattr(stats, outcome, getattr(stats, outcome) + 1)
+        metrics.inc("prefetch_calls_total", tool=tool.name, result=outcome)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(fetch(tool, query) for tool, query in calls))
+    stats.duration = time.perf_counter() - start
+
+    metrics.observe("prefetch_run_seconds", stats.duration)
+    logger.info(
+        "Prefetched news for {} watchlist entries: {} fetched, {} empty, {} failed in {:.2f}s",
+        len(watchlist), stats.fetched, stats.empty, stats.failed, stats.duration,
+    )
+    return stats
@@ -0,0 +1,230 @@
+"""Scheduled background jobs.
+
+Shared jobs run either in the dedicated worker (``news_analyst_agent.worker``)
+or, with ``SCHEDULER_IN_API``, in each API process. Either way every run takes
+a Postgres advisory lock for its job and is skipped if another process holds
+it or has run the job recently, so each job runs once per interval across all
+processes.
+
+Per-process jobs, such as the watchlist prefetch that fills the process's own
+retrieval cache, run in every API process without a lock and never in the
+worker. Runs of both kinds are recorded in the ``job_runs`` table.
+"""
+import socket
+import time
+import zlib
+from dataclasses import asdict, dataclass, field, is_dataclass
+from datetime import datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from loguru import logger
+from sqlalchemy import func, insert, select, text
+
+from news_analyst_agent.config import Settings, get_settings
+from news_analyst_agent.db.database import AsyncSessionLocal, get_async_engine
+from news_analyst_agent.db.models import JobRun
+from news_analyst_agent.db.utils import utcnow
+from news_analyst_agent.log import log_context
+from news_analyst_agent.metrics import metrics
+
+if TYPE_CHECKING:
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+HOST = socket.gethostname()
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    interval: timedelta
+    # Extra arguments of APScheduler's add_job, e.g. jitter or next_run_time
+    options: dict[str, Any] = field(default_factory=dict)
+    # Runs in every API process, without the job lock, as its results are
+    # kept in process memory
+    per_process: bool = False
+
+
+def scheduled_jobs(settings: Settings) -> list[ScheduledJob]:
+    # Job modules are imported when a scheduler is created
+    from news_analyst_agent.tasks.analytics import refresh_analytics
+    from news_analyst_agent.tasks.checkpoints import prune_checkpoints
+    from news_analyst_agent.tasks.cleanup import cleanup_orphaned_threads
+    from news_analyst_agent.tasks.prefetch import prefetch_watchlist
+
+    jobs = [
+        ScheduledJob(
+            "cleanup_orphaned_threads",
+            cleanup_orphaned_threads,
+            timedelta(hours=1),
+            {"next_run_time": datetime.now()},
+        ),
+        ScheduledJob(
+            "prune_checkpoints",
+            prune_checkpoints,
+            timedelta(hours=settings.CHECKPOINT_PRUNE_INTERVAL_HOURS),
+        ),
+        ScheduledJob(
+            "refresh_analytics",
+            refresh_analytics,
+            timedelta(minutes=settings.ANALYTICS_REFRESH_MINUTES),
+        ),
+        ScheduledJob(
+            "refresh_analytics_full",
+            partial(refresh_analytics, full=True),
+            timedelta(hours=settings.ANALYTICS_FULL_REFRESH_HOURS),
+        ),
+    ]
+    if settings.PREFETCH_ENABLED and settings.NEWS_WATCHLIST:
+        # Fills the in-process retrieval cache, so every API process runs it.
+        # The first run comes one interval after the warm-up fetch; jitter
+        # keeps replicas from refreshing in lockstep
+        jobs.append(
+            ScheduledJob(
+                "prefetch_watchlist",
+                prefetch_watchlist,
+                timedelta(minutes=settings.PREFETCH_INTERVAL_MINUTES),
+                {"jitter": settings.PREFETCH_JITTER_SECONDS, "coalesce": True},
+                per_process=True,
+            )
+        )
+    return jobs
+
+
+def lock_key(job: str) -> int:
+    """Advisory lock key of a job, the same in every process"""
+    return zlib.crc32(f"job:{job}".encode("utf8"))
+
+
+def _result_json(result: Any) -> Any:
+    if is_dataclass(result):
+        return asdict(result)
+    return result if isinstance(result, (dict, list, int, float, str)) else None
+
+
+async def _record(
+    job: str,
+    status: str,
+    started_at: datetime,
+    duration: float | None = None,
+    result: Any = None,
+    error: str | None = None,
+):
+    try:
+        async with AsyncSessionLocal() as session, session.begin():
+            await session.execute(
+                insert(JobRun).values(
+                    job=job,
+                    status=status,
+                    started_at=started_at,
+                    finished_at=utcnow(),
+                    duration_seconds=duration,
+                    host=HOST,
+                    result=_result_json(result),
+                    error=error,
+                )
+            )
+    except Exception as e:
+        logger.error("Failed to record run of job {}: {}", job, e)
+
+
+async def _execute(job: str, job_func: Callable[[], Awaitable[Any]]) -> tuple[str, Any, str | None, float]:
+    logger.info("Running job {}", job)
+    start = time.perf_counter()
+    try:
+        result = await job_func()
+        status, error = "ok", None
+    except Exception as e:
+        logger.exception("Job {} failed: {}", job, e)
+        status, result, error = "failed", None, str(e)
+    duration = time.perf_counter() - start
+    metrics.observe("job_seconds", duration, job=job)
+    return status, result, error, duration
+
+
+async def run_local_job(job: str, job_func: Callable[[], Awaitable[Any]]) -> str:
+    """Run a per-process job in this process, whatever other processes do.
+
+    Returns ``ok`` or ``failed``.
+    """
+    with log_context(job=job):
+        started_at = utcnow()
+        status, result, error, duration = await _execute(job, job_func)
+        await _record(job, status, started_at, duration, result, error)
+    metrics.inc("job_runs_total", job=job, status=status)
+    return status
+
+
+async def run_job(job: str, job_func: Callable[[], Awaitable[Any]], min_interval: timedelta) -> str:
+    """Run a job unless another process is running it or ran it within ``min_interval``.
+
+    Returns the status of the run: ``ok``, ``failed``, ``locked`` (another
+    process holds the lock) or ``skipped`` (the job ran recently). Locked runs
+    aren't recorded.
+    """
+    with log_context(job=job):
+        return await _run_job(job, job_func, min_interval)
+
+
+async def _run_job(job: str, job_func: Callable[[], Awaitable[Any]], min_interval: timedelta) -> str:
+    started_at = utcnow()
+    # A session-level lock is released with its connection, so a process that
+    # dies mid-run doesn't leave the job locked
+    async with get_async_engine().connect() as conn:
+        locked = await conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": lock_key(job)})
+        await conn.commit()
+        if not locked:
+            logger.debug("Job {} is running elsewhere, skipping", job)
+            metrics.inc("job_runs_total", job=job, status="locked")
+            return "locked"
+        try:
+            last_run = await conn.scalar(
+                select(func.max(JobRun.started_at)).where(
+                    JobRun.job == job, JobRun.status != "skipped"
+                )
+            )
+            await conn.commit()
+            if last_run is not None and last_run > started_at - min_interval:
+                logger.debug("Job {} ran at {}, skipping", job, last_run)
+                status, result, error, duration = "skipped", None, None, None
+            else:
+                status, result, error, duration = await _execute(job, job_func)
+            await _record(job, status, started_at, duration, result, error)
+        finally:
+            await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": lock_key(job)})
+            await conn.commit()
+
+    metrics.inc("job_runs_total", job=job, status=status)
+    return status
+
+
+def create_scheduler(
+    settings: Settings | None = None, shared: bool = True, per_process: bool = False
+) -> "AsyncIOScheduler":
+    """Create a scheduler with the shared and/or per-process jobs; the caller starts it"""
+    # Imported here so that importing the app stays cheap for tooling and tests
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+    settings = settings or get_settings()
+    scheduler = AsyncIOScheduler()
+    for job in scheduled_jobs(settings):
+        if job.per_process:
+            if not per_process:
+                continue
+            func, args = run_local_job, [job.name, job.func]
+        else:
+            if not shared:
+                continue
+            # Other processes may have run the job shortly before this one's
+            # turn; a run counts for most of an interval
+            func, args = run_job, [job.name, job.func, job.interval * 0.9]
+        scheduler.add_job(
+            func,
+            'interval',
+            args=args,
+            seconds=job.interval.total_seconds(),
+            id=job.name,
+            **job.options,
+        )
+    return scheduler
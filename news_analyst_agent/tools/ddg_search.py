@@ -7,6 +7,10 @@ from langchain_core.tools import BaseTool
 from loguru import logger
 from pydantic import BaseModel, Field
 
+from news_analyst_agent.cassette import cassette_call
+from news_analyst_agent.news_item import NewsItem
+from news_analyst_agent.tools.upstream import UpstreamUnavailable, get_upstream
+
 
 class DDGInput(BaseModel):
     """Input for the DuckDuckGo search tool."""
@@ -42,19 +46,28 @@ class DuckDuckGoSearchResults(BaseTool):  # type: ignore[override, override]
         self,
         query: str,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> list[dict]:
+    ) -> list[NewsItem]:
         """Use the tool."""
-        logger.debug(f"Use ddg_search tool with query: {query}")
+        logger.debug("Use ddg_search tool with query: {}", query)
         try:
-            raw_results = self.api_wrapper.results(
-                query, self.max_results, source=self.backend
+            # The cassette records the search itself, without rate limit waits
+            raw_results = get_upstream("ddg_search").call(
+                cassette_call,
+                "ddg_search",
+                (query, self.max_results, self.backend),
+                self.api_wrapper.results,
+                query,
+                self.max_results,
+                source=self.backend,
             )
+        except UpstreamUnavailable:
+            raise
         except Exception as e:
-            logger.exception(f"ddg_search: Search error {e}")
+            logger.exception("ddg_search: Search error {}", e)
             raise
         
         if not raw_results:
-            logger.warning(f"ddg_search: No news found for {query}.")
+            logger.warning("ddg_search: No news found for {}.", query)
             return []
 
         filtered_results = [
@@ -71,28 +84,28 @@ class DuckDuckGoSearchResults(BaseTool):  # type: ignore[override, override]
         # docs = loader.load()
         # formatted_results = self._format_results(docs)
         
-        formatted_results = [{
-            "title": d["title"],
-            "description": d["snippet"],
-            "content": None,
-            "link": d["link"],
-            "query": query,
-            "source": "ddg",
-        } for d in filtered_results]
+        formatted_results = [NewsItem(
+            title=d["title"],
+            description=d["snippet"],
+            link=d["link"],
+            query=query,
+            source="ddg",
+            published=d.get("date"),
+        ) for d in filtered_results]
         return formatted_results
 
     @staticmethod
-    def _format_results(docs: Iterable[Document], query: str) -> list[dict]:
+    def _format_results(docs: Iterable[Document], query: str) -> list[NewsItem]:
         formatted_docs = []
         for doc in docs:
-            formatted_docs.append({ 
-                "title": doc.metadata["title"],
-                "description": doc.metadata["description"],
-                "content": doc.page_content,
-                "link": doc.metadata["source"],
-                "query": query,
-                "source": "ddg",
-            })
+            formatted_docs.append(NewsItem(
+                title=doc.metadata["title"],
+                description=doc.metadata["description"],
+                content=doc.page_content,
+                link=doc.metadata["source"],
+                query=query,
+                source="ddg",
+            ))
         return formatted_docs
 
 wrapper = DuckDuckGoSearchAPIWrapper()
@@ -0,0 +1,58 @@
+from typing import Any
+
+from loguru import logger
+
+from news_analyst_agent.agents.utils import retry_with_backoff
+from news_analyst_agent.cache import TTLCache
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.metrics import metrics
+from news_analyst_agent.news_archive import archive_news
+from news_analyst_agent.news_item import NewsItem
+
+settings = get_settings()
+
+# Formatted results of the retrieval tools keyed by (tool name, query). Filled
+# by interactive requests and by the warm-up for the configured watchlist.
+retrieval_cache = TTLCache(
+    maxsize=settings.RETRIEVAL_CACHE_SIZE, ttl=settings.RETRIEVAL_CACHE_TTL_SECONDS
+)
+metrics.register_collector("retrieval_cache", retrieval_cache.stats)
+
+
+def retrieval_key(tool: Any, query: str) -> tuple[str, str]:
+    return tool.name, " ".join(query.lower().split())
+
+
+def cached_invoke(tool: Any, query: str) -> list[NewsItem]:
+    """Invoke a retrieval tool with retries, serving repeated queries from the cache.
+
+    Empty results are not cached since they are also what a failed call returns.
+    Fetched results are also added to the shared news archive.
+    """
+    key = retrieval_key(tool, query)
+    results = retrieval_cache.get(key)
+    if results is not None:
+        metrics.inc("retrieval_cache_total", tool=tool.name, result="hit")
+        return results
+
+    metrics.inc("retrieval_cache_total", tool=tool.name, result="miss")
+    results = retry_with_backoff(tool.invoke, query)
+    if results:
+        retrieval_cache.set(key, results)
+        archive_news(results)
+    else:
+        logger.debug("Not caching empty {} results for {!r}", tool.name, query)
+    return results
+
+
+def refresh(tool: Any, query: str, ttl: float | None = None) -> list[NewsItem]:
+    """Fetch fresh results into the cache, keeping the cached ones if the call fails.
+
+    Unlike ``cached_invoke``, a call that fails after its retries raises, so
+    callers can tell a failure from a search without results.
+    """
+    results = retry_with_backoff(tool.invoke, query, reraise=True)
+    if results:
+        retrieval_cache.set(retrieval_key(tool, query), results, ttl=ttl)
+        archive_news(results)
+    return results
@@ -0,0 +1,293 @@
+"""Protection of the upstream news sources against overload.
+
+Every source (DuckDuckGo search, Yahoo Finance search, article fetching) has a
+token bucket that limits how fast it is called and a circuit breaker that
+stops calling it after repeated failures. While a source is throttled beyond
+``UPSTREAM_MAX_WAIT_SECONDS`` or its circuit is open, calls fail immediately
+with ``UpstreamUnavailable`` instead of adding to the load and waiting for
+retries; ``retry_with_backoff`` gives up on them right away.
+
+Buckets are per process by default. With ``UPSTREAM_SHARED_BUCKETS`` they are
+kept in the ``upstream_buckets`` table so that all API and worker processes
+share one budget per source.
+
+Background jobs such as the watchlist prefetch share the same buckets as chat
+requests, but wait longer for their turn (``upstream_max_wait``).
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable
+
+from loguru import logger
+from sqlalchemy import text
+
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.metrics import metrics
+
+
+# Set by upstream_max_wait; copied into tool threads with the context
+_max_wait: ContextVar[float | None] = ContextVar("upstream_max_wait", default=None)
+
+
+@contextmanager
+def upstream_max_wait(seconds: float):
+    """Let upstream calls made within the block wait up to ``seconds`` for a rate limit"""
+    token = _max_wait.set(seconds)
+    try:
+        yield
+    finally:
+        _max_wait.reset(token)
+
+
+class UpstreamUnavailable(RuntimeError):
+    """Raised instead of calling a source that is rate limited or failing"""
+
+    def __init__(self, source: str, reason: str):
+        super().__init__(f"{source} is unavailable: {reason}")
+        self.source = source
+        self.reason = reason
+
+
+class TokenBucket:
+    """Allows ``rate`` calls per second on average and bursts of ``burst`` calls"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            return self._refill()
+
+    def _refill(self) -> float:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return self._tokens
+
+    def acquire(self, cost: float = 1, max_wait: float = 0) -> bool:
+        """Take ``cost`` tokens, waiting at most ``max_wait`` seconds for them.
+
+        Tokens are reserved before waiting, so concurrent callers queue up
+        behind each other instead of all waking up at once.
+        """
+        with self._lock:
+            wait = (cost - self._refill()) / self.rate
+            if wait > max_wait:
+                return False
+            self._tokens -= cost
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+
+class SharedTokenBucket(TokenBucket):
+    """Token bucket kept in the database and shared by all processes.
+
+    A single upsert refills the bucket from the time elapsed since it was
+    last updated and reserves the tokens, so it is atomic across processes.
+    If the database can't be reached the process falls back to its own
+    bucket, and keeps using it for ``retry_after`` seconds rather than
+    waiting on the database again for every call.
+    """
+
+    ACQUIRE = """
+        INSERT INTO upstream_buckets (source, tokens, updated_at)
+        VALUES (:source, :burst - :cost, now())
+        ON CONFLICT (source) DO UPDATE
+        SET tokens = LEAST(
+                :burst,
+                upstream_buckets.tokens
+                + EXTRACT(EPOCH FROM now() - upstream_buckets.updated_at) * :rate
+            ) - :cost,
+            updated_at = now()
+        WHERE LEAST(
+                :burst,
+                upstream_buckets.tokens
+                + EXTRACT(EPOCH FROM now() - upstream_buckets.updated_at) * :rate
+            ) - :cost >= -:rate * :max_wait
+        RETURNING tokens
+    """
+
+    def __init__(self, source: str, rate: float, burst: int, retry_after: float = 30):
+        super().__init__(rate, burst)
+        self.source = source
+        self.retry_after = retry_after
+        self._local_until = 0.0
+
+    def acquire(self, cost: float = 1, max_wait: float = 0) -> bool:
+        from news_analyst_agent.db.database import get_sync_engine
+
+        if time.monotonic() < self._local_until:
+            return super().acquire(cost, max_wait)
+
+        params = {
+            "source": self.source,
+            "rate": self.rate,
+            "burst": self.burst,
+            "cost": cost,
+            "max_wait": max_wait,
+        }
+        try:
+            with get_sync_engine().begin() as conn:
+                tokens = conn.execute(text(self.ACQUIRE), params).scalar_one_or_none()
+        except Exception as e:
+            logger.warning(
+                "Shared rate limit of {} unavailable, using the local one for {}s: {}",
+                self.source, self.retry_after, e,
+            )
+            metrics.inc("upstream_shared_bucket_errors_total", source=self.source)
+            self._local_until = time.monotonic() + self.retry_after
+            return super().acquire(cost, max_wait)
+
+        if tokens is None:
+            return False
+        if tokens < 0:
+            time.sleep(-tokens / self.rate)
+        return True
+
+
+class CircuitBreaker:
+    """Stops calls to a source after ``failure_threshold`` consecutive failures.
+
+    After ``reset_timeout`` seconds a single trial call is let through (half
+    open); its success closes the circuit again, its failure keeps it open for
+    another ``reset_timeout``.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "open" or self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def release(self):
+        """Give back the trial call of a half-open circuit that wasn't made"""
+        with self._lock:
+            self._trial = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> bool:
+        """Count a failure and return whether it opened the circuit"""
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                reopened = self._opened_at is None or self._trial
+                self._opened_at = time.monotonic()
+                self._trial = False
+                return reopened
+            return False
+
+
+class Upstream:
+    """A rate limited, circuit-broken upstream source"""
+
+    def __init__(self, name: str, bucket: TokenBucket, breaker: CircuitBreaker, max_wait: float):
+        self.name = name
+        self.bucket = bucket
+        self.breaker = breaker
+        self.max_wait = max_wait
+
+    def call(self, func: Callable, *args, cost: float = 1, **kwargs) -> Any:
+        """Call ``func`` unless the source is throttled or its circuit is open.
+
+        ``cost`` is the number of upstream requests the call makes, e.g. the
+        number of pages an article loader fetches.
+        """
+        if not self.breaker.allow():
+            metrics.inc("upstream_calls_total", source=self.name, result="circuit_open")
+            raise UpstreamUnavailable(self.name, "circuit open")
+        max_wait = _max_wait.get()
+        if not self.bucket.acquire(
+            min(cost, self.bucket.burst), self.max_wait if max_wait is None else max_wait
+        ):
+            self.breaker.release()
+            metrics.inc("upstream_calls_total", source=self.name, result="rate_limited")
+            raise UpstreamUnavailable(self.name, "rate limited")
+
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            metrics.inc("upstream_calls_total", source=self.name, result="error")
+            if self.breaker.record_failure():
+                logger.warning(
+                    "Circuit of {} opened after {} failures", self.name, self.breaker.failures
+                )
+            raise
+        self.breaker.record_success()
+        metrics.inc("upstream_calls_total", source=self.name, result="ok")
+        return result
+
+    def wrap(self, func: Callable, cost: float = 1) -> Callable:
+        """``func`` with every call going through ``call``"""
+        return lambda *args, **kwargs: self.call(func, *args, cost=cost, **kwargs)
+
+    def stats(self) -> dict:
+        return {
+            "circuit": self.breaker.state,
+            "failures": self.breaker.failures,
+            "tokens": round(self.bucket.tokens, 2),
+        }
+
+
+_upstreams: dict[str, Upstream] = {}
+_upstreams_lock = threading.Lock()
+
+
+def get_upstream(name: str) -> Upstream:
+    """Return the process-wide protection of a source, configured from the settings"""
+    with _upstreams_lock:
+        if name not in _upstreams:
+            settings = get_settings()
+            rate = settings.UPSTREAM_RATE_PER_SECOND.get(name, 1)
+            if settings.UPSTREAM_SHARED_BUCKETS:
+                bucket = SharedTokenBucket(
+                    name, rate, settings.UPSTREAM_BURST, settings.UPSTREAM_SHARED_RETRY_SECONDS
+                )
+            else:
+                bucket = TokenBucket(rate, settings.UPSTREAM_BURST)
+            breaker = CircuitBreaker(
+                settings.UPSTREAM_FAILURE_THRESHOLD, settings.UPSTREAM_RESET_SECONDS
+            )
+            _upstreams[name] = Upstream(name, bucket, breaker, settings.UPSTREAM_MAX_WAIT_SECONDS)
+        return _upstreams[name]
+
+
+def upstream_stats() -> dict:
+    with _upstreams_lock:
+        upstreams = list(_upstreams.values())
+    return {upstream.name: upstream.stats() for upstream in upstreams}
+
+
+metrics.register_collector("upstream", upstream_stats)
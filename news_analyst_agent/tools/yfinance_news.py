@@ -1,6 +1,6 @@
+from datetime import datetime, timezone
 from typing import Iterable, Optional, Type
 
-from langchain_community.document_loaders.web_base import WebBaseLoader
 from langchain_core.callbacks import CallbackManagerForToolRun
 from langchain_core.documents import Document
 from langchain_core.tools import BaseTool
@@ -9,6 +9,18 @@ from pydantic import BaseModel, Field
 from requests.exceptions import HTTPError, ReadTimeout
 from urllib3.exceptions import ConnectionError
 
+from news_analyst_agent.cassette import cassette_call
+from news_analyst_agent.news_item import NewsItem
+from news_analyst_agent.tools.upstream import get_upstream
+
+
+def _encode_docs(docs: list[Document]) -> list[dict]:
+    return [{"page_content": d.page_content, "metadata": d.metadata} for d in docs]
+
+
+def _decode_docs(payload: list[dict]) -> list[Document]:
+    return [Document(**d) for d in payload]
+
 
 class YahooFinanceNewsInput(BaseModel):
     """Input for the YahooFinanceNews tool."""
@@ -35,10 +47,10 @@ class YahooFinanceNewsTool(BaseTool):  # type: ignore[override, override]
         self,
         entity: str,
         run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> list[dict]:
+    ) -> list[NewsItem]:
         """Use the Yahoo Finance News tool."""
         entity = entity.lower()
-        logger.debug(f"Use yfinance_news tool with query: {entity}")
+        logger.debug("Use yfinance_news tool with query: {}", entity)
         try:
             import yfinance
         except ImportError:
@@ -47,43 +59,72 @@ class YahooFinanceNewsTool(BaseTool):  # type: ignore[override, override]
                 "Please install it with `pip install yfinance`."
             )
 
-        retrieved_news = yfinance.Search(entity, news_count=self.top_k).news
+        # Cassettes record the upstream calls themselves, without rate limit waits
+        retrieved_news = get_upstream("yfinance_search").call(
+            cassette_call,
+            "yfinance_search",
+            (entity, self.top_k),
+            lambda: yfinance.Search(entity, news_count=self.top_k).news,
+        )
         links = []
+        published = {}
         try:
             links = [n["link"] for n in retrieved_news if n["type"] == "STORY"]
-        except (HTTPError, ReadTimeout, ConnectionError):
-            logger.exception(f"yfinance_news: Network error {e}")
+            published = {
+                n["link"]: datetime.fromtimestamp(
+                    n["providerPublishTime"], tz=timezone.utc
+                ).isoformat()
+                for n in retrieved_news
+                if n.get("providerPublishTime")
+            }
+        except (HTTPError, ReadTimeout, ConnectionError) as e:
+            logger.exception("yfinance_news: Network error {}", e)
             raise
         except Exception as e:
-            logger.exception(f"yfinance_news: Retrieve Error {e}")
+            logger.exception("yfinance_news: Retrieve Error {}", e)
             raise
 
         if not links:
-            logger.warning(f"yfinance_news: No news found for {entity}.")
+            logger.warning("yfinance_news: No news found for {}.", entity)
             return []
         
+        from langchain_community.document_loaders.web_base import WebBaseLoader
+
         loader = WebBaseLoader(web_paths=links)
-        docs = loader.load()
+        docs = get_upstream("article_fetch").call(
+            cassette_call,
+            "article_fetch",
+            (links,),
+            loader.load,
+            # One request per article page
+            cost=len(links),
+            encode=_encode_docs,
+            decode=_decode_docs,
+        )
 
-        result = self._format_results(docs, entity)
+        result = self._format_results(docs, entity, published)
         if not result:
-            logger.warning(f"yfinance_news: No news found for {entity}.")
+            logger.warning("yfinance_news: No news found for {}.", entity)
             return []
         return result
 
     @staticmethod
-    def _format_results(docs: Iterable[Document], entity: str) -> list[dict]:
+    def _format_results(
+        docs: Iterable[Document], entity: str, published: dict[str, str] | None = None
+    ) -> list[NewsItem]:
+        published = published or {}
         formatted_docs = []
         for doc in docs:
             if entity in doc.metadata["description"].lower() or entity in doc.metadata["title"].lower():
-                formatted_docs.append({ 
-                    "title": doc.metadata["title"],
-                    "description": doc.metadata["description"],
-                    "content": doc.page_content,
-                    "link": doc.metadata["source"],
-                    "query": entity,
-                    "source": "yfinance",
-                })
+                formatted_docs.append(NewsItem(
+                    title=doc.metadata["title"],
+                    description=doc.metadata["description"],
+                    content=doc.page_content,
+                    link=doc.metadata["source"],
+                    query=entity,
+                    source="yfinance",
+                    published=published.get(doc.metadata["source"]),
+                ))
         return formatted_docs
 
 yf_tool = YahooFinanceNewsTool()
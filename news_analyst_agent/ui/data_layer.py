@@ -0,0 +1,73 @@
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Union
+
+from chainlit.data.sql_alchemy import SQLAlchemyDataLayer
+from chainlit.data.utils import queue_until_user_message
+
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.db.utils import format_timestamp, parse_timestamp
+from news_analyst_agent.ui.write_behind import StepWriteBuffer, step_row, write_steps
+
+# Tables whose timestamp columns are timestamptz rather than text
+_TIMESTAMP_WRITE = re.compile(r"INSERT\s+INTO\s+(threads|steps)\b", re.IGNORECASE)
+_TIMESTAMP_PARAMS = ("createdAt", "start", "end")
+
+
+class NewsAnalystDataLayer(SQLAlchemyDataLayer):
+    """Chainlit data layer adapted to the typed timestamp columns.
+
+    Chainlit passes timestamps as ISO strings and expects strings back, while
+    asyncpg only binds ``datetime`` objects to timestamptz parameters.
+
+    Step writes (including every update of a streamed message) are buffered
+    and written in batches, see ``news_analyst_agent.ui.write_behind``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        settings = get_settings()
+        self.step_buffer = StepWriteBuffer(
+            self._write_steps,
+            interval=settings.UI_STEP_FLUSH_INTERVAL_SECONDS,
+            max_pending=settings.UI_STEP_FLUSH_MAX_PENDING,
+        )
+
+    async def _write_steps(self, rows: list[dict]):
+        async with self.async_session() as session, session.begin():
+            await write_steps(session, rows)
+
+    async def flush(self):
+        """Write all buffered steps"""
+        await self.step_buffer.flush()
+
+    # update_step of the base class goes through create_step as well. The
+    # step's thread is created when the step is written, see write_steps.
+    @queue_until_user_message()
+    async def create_step(self, step_dict):
+        self.step_buffer.add(step_row(step_dict))
+
+    @queue_until_user_message()
+    async def delete_step(self, step_id: str):
+        await self.step_buffer.discard(step_id)
+        await super().delete_step(step_id)
+
+    async def get_thread(self, thread_id: str):
+        # Threads are read back when resumed; include steps not yet written
+        await self.flush()
+        return await super().get_thread(thread_id)
+
+    async def execute_sql(
+        self, query: str, parameters: dict
+    ) -> Union[List[Dict[str, Any]], int, None]:
+        if _TIMESTAMP_WRITE.search(query):
+            parameters = {
+                key: parse_timestamp(value) if key in _TIMESTAMP_PARAMS else value
+                for key, value in parameters.items()
+            }
+        return await super().execute_sql(query, parameters)
+
+    def clean_result(self, obj):
+        if isinstance(obj, datetime):
+            return format_timestamp(obj)
+        return super().clean_result(obj)
@@ -0,0 +1,165 @@
+"""Write-behind persistence of Chainlit steps.
+
+Chainlit persists a message every time it is updated, which for a streamed
+answer means one upsert per token. ``StepWriteBuffer`` keeps the latest state
+of each step in memory instead and writes all pending steps in one batched
+upsert, a short interval after the first change and whenever it is flushed
+explicitly, e.g. when a message is complete or the client disconnects.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from news_analyst_agent.db.models import Step, Thread
+from news_analyst_agent.db.utils import parse_timestamp, utcnow
+from news_analyst_agent.metrics import metrics
+
+_STEP_COLUMNS = {column.name for column in Step.__table__.columns}
+_TIMESTAMP_COLUMNS = ("createdAt", "start", "end")
+
+
+def step_row(step_dict: dict) -> dict:
+    """Convert a Chainlit step dict to a row of the steps table.
+
+    Like Chainlit's own data layer, empty values are left out so that they
+    don't overwrite what is already stored.
+    """
+    row = {
+        key: value
+        for key, value in step_dict.items()
+        if key in _STEP_COLUMNS and value is not None and not (isinstance(value, dict) and not value)
+    }
+    if "showInput" in row:
+        row["showInput"] = str(row["showInput"]).lower()
+    for key in _TIMESTAMP_COLUMNS:
+        if key in row:
+            row[key] = parse_timestamp(row[key])
+    return row
+
+
+def upsert_steps(rows: list[dict]):
+    """Insert or update steps in one statement, keeping stored values that a row leaves out"""
+    table = Step.__table__
+    columns = sorted({key for row in rows for key in row})
+    stmt = insert(table).values([{key: row.get(key) for key in columns} for row in rows])
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_={
+            key: func.coalesce(stmt.excluded[key], table.c[key])
+            for key in columns
+            if key != "id"
+        },
+    )
+
+
+def insert_threads(rows: list[dict]):
+    """Create the threads the steps refer to that don't exist yet.
+
+    Chainlit creates a step's thread along with the step, and the buffered
+    steps would otherwise violate their foreign key when they are written
+    before the thread is.
+    """
+    thread_ids = sorted({str(row["threadId"]) for row in rows if row.get("threadId")})
+    if not thread_ids:
+        return None
+    now = utcnow()
+    stmt = insert(Thread.__table__).values([{"id": id, "createdAt": now} for id in thread_ids])
+    return stmt.on_conflict_do_nothing(index_elements=[Thread.__table__.c.id])
+
+
+async def write_steps(session, rows: list[dict]):
+    """Write a batch of step rows, and their threads first"""
+    threads = insert_threads(rows)
+    if threads is not None:
+        await session.execute(threads)
+    await session.execute(upsert_steps(rows))
+
+
+class StepWriteBuffer:
+    """Buffers step rows by id and writes them in batches with ``write``"""
+
+    def __init__(
+        self,
+        write: Callable[[list[dict]], Awaitable[Any]],
+        interval: float = 1.0,
+        max_pending: int = 100,
+    ):
+        self.write = write
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending: dict[str, dict] = {}
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.Task | None = None
+        # Flushes started by add once max_pending steps are buffered
+        self._flushes: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, row: dict):
+        """Record the new state of a step; fields it leaves out keep their buffered values"""
+        pending = self._pending.get(row["id"])
+        self._pending[row["id"]] = {**pending, **row} if pending else row
+        metrics.inc("ui_step_updates_total")
+        if len(self._pending) >= self.max_pending:
+            task = asyncio.create_task(self.flush())
+            self._flushes.add(task)
+            task.add_done_callback(self._flush_done)
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+            self._timer.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: asyncio.Task):
+        self._flushes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.opt(exception=task.exception()).error("Background flush of buffered steps failed")
+            metrics.inc("ui_step_write_errors_total")
+
+    async def discard(self, step_id: str):
+        """Drop the buffered state of a step.
+
+        Waits for a flush in progress, which may be writing the step, so that
+        a step deleted afterwards isn't written back.
+        """
+        async with self._lock:
+            self._pending.pop(step_id, None)
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.interval)
+        # From here on the flush must not be cancelled by an explicit one
+        self._timer = None
+        await self.flush()
+
+    async def flush(self):
+        """Write all pending steps.
+
+        If the batch fails, each step is written on its own so that one bad
+        row (e.g. of a thread that was deleted meanwhile) can't hold back the
+        others.
+        """
+        if self._timer is not None:
+            # This flush also writes what the timer was waiting for
+            self._timer.cancel()
+            self._timer = None
+        async with self._lock:
+            rows, self._pending = list(self._pending.values()), {}
+            if not rows:
+                return
+            try:
+                await self.write(rows)
+                metrics.inc("ui_step_batches_total")
+                metrics.inc("ui_step_rows_written_total", len(rows))
+                return
+            except Exception as e:
+                logger.warning("Failed to write {} buffered steps, retrying one by one: {}", len(rows), e)
+
+            for row in rows:
+                try:
+                    await self.write([row])
+                    metrics.inc("ui_step_rows_written_total")
+                except Exception as e:
+                    logger.error("Dropping update of step {}: {}", row["id"], e)
+                    metrics.inc("ui_step_write_errors_total")
@@ -0,0 +1,134 @@
+"""Startup warm-up so that the first requests after a deploy aren't cold.
+
+The warm-up runs in the background from the application lifespan. It opens
+the database pool, loads the agent stack and the configured chat models (one
+short completion each, which also sets up their HTTP connection pools) and
+optionally fetches news for a watchlist into the retrieval cache. The
+readiness endpoint reports ready once it has finished.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+from loguru import logger
+from sqlalchemy import text
+
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.db.database import get_async_engine
+from news_analyst_agent.metrics import metrics
+
+
+@dataclass
+class WarmupState:
+    ready: bool = False
+    started_at: float | None = None
+    duration: float | None = None
+    # Step name -> "ok", "skipped" or the error it failed with
+    steps: dict[str, str] = field(default_factory=dict)
+
+
+warmup_state = WarmupState()
+
+
+async def warm_db_pool():
+    """Open as many connections as the pool keeps idle"""
+    engine = get_async_engine()
+
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(get_settings().DB_POOL_SIZE)))
+
+
+async def warm_agent_stack():
+    """Import the agent, its tools and their clients off the event loop"""
+
+    def load():
+        import news_analyst_agent.agents.news_agent  # noqa: F401
+        import news_analyst_agent.tools.ddg_search  # noqa: F401
+        import news_analyst_agent.tools.retrieval_cache  # noqa: F401
+        import news_analyst_agent.tools.yfinance_news  # noqa: F401
+
+    await asyncio.to_thread(load)
+
+
+async def warm_models():
+    """Load each configured model and send it a one-word prompt"""
+    from news_analyst_agent.agents.utils import get_chat_model
+
+    async def ping(model_name):
+        await get_chat_model(model_name).ainvoke("ping")
+
+    await asyncio.gather(*(ping(name) for name in get_settings().WARMUP_MODELS))
+
+
+async def warm_watchlist():
+    """Fetch news for the watchlist into the retrieval cache"""
+    from news_analyst_agent.tasks.prefetch import prefetch_watchlist
+
+    await prefetch_watchlist()
+
+
+WARMUP_STEPS = {
+    "db_pool": warm_db_pool,
+    "agent_stack": warm_agent_stack,
+    "models": warm_models,
+    "watchlist": warm_watchlist,
+}
+# Steps within a phase run concurrently. Models and the watchlist come after
+# the agent stack so its modules are imported by a single thread.
+WARMUP_PHASES = [("db_pool", "agent_stack"), ("models", "watchlist")]
+
+
+async def _run_step(name: str, step) -> str:
+    start = time.perf_counter()
+    try:
+        await step()
+        status = "ok"
+    except Exception as e:
+        logger.warning("Warm-up step {} failed: {}", name, e)
+        status = f"failed: {e}"
+    metrics.observe("warmup_step_seconds", time.perf_counter() - start, step=name)
+    return status
+
+
+async def run_warmup(state: WarmupState = warmup_state) -> WarmupState:
+    """Run all warm-up steps, then mark the application ready.
+
+    Failing or timed-out steps are logged and reported but don't keep the
+    application from becoming ready; they only mean the first requests are
+    slower.
+    """
+    settings = get_settings()
+    state.started_at = time.time()
+    start = time.perf_counter()
+    if settings.WARMUP_ENABLED:
+        skipped = set()
+        if not settings.WARMUP_MODELS:
+            skipped.add("models")
+        if not settings.NEWS_WATCHLIST:
+            skipped.add("watchlist")
+        state.steps.update(dict.fromkeys(skipped, "skipped"))
+
+        async def run_phases():
+            for phase in WARMUP_PHASES:
+                names = [name for name in phase if name not in skipped]
+                results = await asyncio.gather(
+                    *(_run_step(name, WARMUP_STEPS[name]) for name in names)
+                )
+                state.steps.update(zip(names, results))
+
+        try:
+            await asyncio.wait_for(run_phases(), timeout=settings.WARMUP_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning("Warm-up did not finish within {}s", settings.WARMUP_TIMEOUT_SECONDS)
+            for name in WARMUP_STEPS:
+                state.steps.setdefault(name, "timed out")
+
+    state.duration = time.perf_counter() - start
+    state.ready = True
+    metrics.set_gauge("warmup_ready", 1)
+    metrics.observe("warmup_seconds", state.duration)
+    logger.info("Warm-up finished in {:.2f}s: {}", state.duration, state.steps)
+    return state
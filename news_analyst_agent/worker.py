@@ -0,0 +1,48 @@
+"""Worker process that owns the scheduled background jobs.
+
+Run with ``python -m news_analyst_agent.worker`` and set ``SCHEDULER_IN_API``
+to false for the API, so that cleanup, pruning and analytics refreshes run
+outside the event loops serving chat requests. The watchlist prefetch fills
+each API process's own retrieval cache, so it stays in the API processes.
+"""
+import asyncio
+import signal
+
+from loguru import logger
+
+from news_analyst_agent.agents.checkpoint import close_checkpointer
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.db.database import dispose_engines
+from news_analyst_agent.log import configure_logging, flush_logs
+from news_analyst_agent.tasks.scheduler import create_scheduler
+
+
+async def run_worker():
+    """Run the scheduler until the process receives SIGINT or SIGTERM"""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    scheduler = create_scheduler(get_settings())
+    scheduler.start()
+    logger.info("Worker started with jobs: {}", [job.id for job in scheduler.get_jobs()])
+    try:
+        await stop.wait()
+    finally:
+        # Job locks are released with their connections, also for
+        # interrupted runs
+        scheduler.shutdown()
+        await close_checkpointer()
+        await dispose_engines()
+        logger.info("Worker stopped")
+        await flush_logs()
+
+
+def main():
+    configure_logging()
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import base64
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from news_analyst_agent.db.database import AsyncSessionLocal, dispose_engines
+from news_analyst_agent.db.models import (
+    AnalyticsFeedbackDaily,
+    AnalyticsRefresh,
+    AnalyticsStepsDaily,
+    AnalyticsThreadsDaily,
+    Feedback,
+    Step,
+    Thread,
+)
+from news_analyst_agent.main import app
+from news_analyst_agent.tasks.analytics import refresh_analytics
+
+
+@pytest.fixture
+def auth_headers():
+    credentials = base64.b64encode(b"admin:admin").decode()
+    return {"Authorization": f"Basic {credentials}"}
+
+
+@pytest.fixture
+async def profile():
+    """A chat profile of its own, with two threads of it created today"""
+    name = f"test_profile_{uuid.uuid4().hex[:8]}"
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.execute(select(AnalyticsRefresh))
+    except (OSError, OperationalError, ProgrammingError):
+        pytest.skip("Database is not available or not migrated to head")
+
+    now = datetime.now(timezone.utc)
+    thread_ids = [uuid.uuid4(), uuid.uuid4()]
+    steps = [
+        # An answer that took two seconds, a failed tool call and one still running
+        (thread_ids[0], "assistant_message", now, now + timedelta(seconds=2), False),
+        (thread_ids[0], "tool", now, now + timedelta(seconds=1), True),
+        (thread_ids[1], "assistant_message", now, None, None),
+    ]
+    async with AsyncSessionLocal() as session, session.begin():
+        await session.execute(
+            insert(Thread),
+            [{"id": id, "createdAt": now, "metadata_": {"chat_profile": name}} for id in thread_ids],
+        )
+        await session.execute(
+            insert(Step),
+            [
+                {
+                    "id": uuid.uuid4(), "name": type, "type": type, "threadId": thread_id,
+                    "streaming": False, "createdAt": created_at, "start": created_at,
+                    "end": end, "isError": is_error,
+                }
+                for thread_id, type, created_at, end, is_error in steps
+            ],
+        )
+        await session.execute(
+            insert(Feedback),
+            [
+                {"id": uuid.uuid4(), "forId": uuid.uuid4(), "threadId": thread_ids[0], "value": 1},
+                {"id": uuid.uuid4(), "forId": uuid.uuid4(), "threadId": thread_ids[1], "value": 0},
+                {"id": uuid.uuid4(), "forId": uuid.uuid4(), "threadId": thread_ids[1], "value": 1},
+            ],
+        )
+    yield name
+
+    async with AsyncSessionLocal() as session, session.begin():
+        for model in (Feedback, Step):
+            await session.execute(delete(model).where(model.threadId.in_(thread_ids)))
+        await session.execute(delete(Thread).where(Thread.id.in_(thread_ids)))
+        for model in (AnalyticsThreadsDaily, AnalyticsStepsDaily, AnalyticsFeedbackDaily):
+            await session.execute(delete(model).where(model.chat_profile == name))
+    await dispose_engines()
+
+
+@pytest.mark.asyncio
+async def test_refresh_aggregates_new_threads(profile, auth_headers):
+    result = await refresh_analytics()
+    assert result["days"] >= 1
+    params = {"chat_profile": profile}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        usage = (await ac.get("/api/analytics/usage", params=params, headers=auth_headers)).json()
+        feedback = (await ac.get("/api/analytics/feedback", params=params, headers=auth_headers)).json()
+        latency = (await ac.get("/api/analytics/latency", params=params, headers=auth_headers)).json()
+
+    assert [(row["threads"], row["steps"], row["error_steps"]) for row in usage] == [(2, 3, 1)]
+    assert usage[0]["error_rate"] == pytest.approx(1 / 3)
+
+    assert feedback == [
+        {
+            "chat_profile": profile,
+            "feedbacks": 3,
+            "average": pytest.approx(2 / 3),
+            "distribution": {"0": 1, "1": 2},
+        }
+    ]
+
+    by_type = {row["step_type"]: row for row in latency}
+    assert by_type["assistant_message"]["steps"] == 2
+    assert by_type["assistant_message"]["timed_steps"] == 1
+    assert by_type["assistant_message"]["avg_seconds"] == pytest.approx(2)
+    assert by_type["tool"]["error_rate"] == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_recomputes_changed_days(profile):
+    await refresh_analytics()
+    async with AsyncSessionLocal() as session, session.begin():
+        thread_id = await session.scalar(
+            select(Thread.id).where(Thread.metadata_["chat_profile"].as_string() == profile).limit(1)
+        )
+        # Bumps the thread's updatedAt, so its day is recomputed
+        await session.execute(delete(Feedback).where(Feedback.threadId == thread_id))
+
+    await refresh_analytics()
+    async with AsyncSessionLocal() as session:
+        feedbacks = await session.scalar(
+            select(AnalyticsFeedbackDaily.feedbacks).where(
+                AnalyticsFeedbackDaily.chat_profile == profile, AnalyticsFeedbackDaily.value == 1
+            )
+        )
+    assert feedbacks == 1
+
+
+@pytest.mark.asyncio
+async def test_full_refresh_drops_deleted_threads(profile):
+    await refresh_analytics()
+    async with AsyncSessionLocal() as session, session.begin():
+        thread_ids = select(Thread.id).where(Thread.metadata_["chat_profile"].as_string() == profile)
+        for model in (Feedback, Step):
+            await session.execute(delete(model).where(model.threadId.in_(thread_ids)))
+        await session.execute(delete(Thread).where(Thread.id.in_(thread_ids)))
+
+    async def summary_threads():
+        async with AsyncSessionLocal() as session:
+            return await session.scalar(
+                select(AnalyticsThreadsDaily.threads).where(AnalyticsThreadsDaily.chat_profile == profile)
+            )
+
+    # Deletions leave nothing for an incremental refresh to find
+    await refresh_analytics()
+    assert await summary_threads() == 2
+
+    await refresh_analytics(full=True)
+    assert await summary_threads() is None
@@ -0,0 +1,86 @@
+import uuid
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+from sqlalchemy import text
+
+from news_analyst_agent.agents.news_agent import NewsAnalystAgent
+from news_analyst_agent.agents.utils import ModelName
+from news_analyst_agent.db.database import AsyncSessionLocal, dispose_engines
+from news_analyst_agent.tasks.checkpoints import prune_checkpoints
+
+pytest.importorskip("langgraph.checkpoint.postgres")
+
+
+@pytest.fixture
+async def checkpointer():
+    from news_analyst_agent.agents.checkpoint import close_checkpointer, get_checkpointer
+
+    try:
+        saver = await get_checkpointer()
+    except Exception:
+        await close_checkpointer()
+        pytest.skip("Database is not available")
+    yield saver
+    await close_checkpointer()
+    await dispose_engines()
+
+
+@pytest.fixture
+async def thread_id(checkpointer):
+    thread_id = f"test-{uuid.uuid4()}"
+    yield thread_id
+    await checkpointer.adelete_thread(thread_id)
+
+
+async def checkpoint_count(thread_id: str) -> int:
+    async with AsyncSessionLocal() as session:
+        return await session.scalar(
+            text("SELECT count(*) FROM checkpoints WHERE thread_id = :thread_id"),
+            {"thread_id": thread_id},
+        )
+
+
+async def run_turns(checkpointer, thread_id, questions):
+    seen = []
+
+    def fake_model(messages):
+        seen.append([m.content for m in messages[1:]])  # skip the system prompt
+        return AIMessage(content=f"answer {len(seen)}")
+
+    results = None
+    for question in questions:
+        agent = NewsAnalystAgent(
+            model_name=ModelName.LLAMA_3_2, checkpointer=checkpointer, thread_id=thread_id
+        )
+        agent.model = RunnableLambda(fake_model)
+        results = await agent.arun([HumanMessage(content=question)])
+    return seen, results
+
+
+@pytest.mark.asyncio
+async def test_thread_resumes_from_postgres_checkpoint(checkpointer, thread_id):
+    seen, results = await run_turns(checkpointer, thread_id, ["first question", "second question"])
+
+    assert seen[-1] == ["first question", "answer 1", "second question"]
+    assert [m.content for m in results["messages"]][-1] == "answer 2"
+    state = await checkpointer.aget_tuple({"configurable": {"thread_id": thread_id}})
+    assert [m.content for m in state.checkpoint["channel_values"]["messages"]] == [
+        "first question", "answer 1", "second question", "answer 2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_prune_keeps_newest_checkpoints_in_batches(checkpointer, thread_id):
+    await run_turns(checkpointer, thread_id, ["first question", "second question"])
+    assert await checkpoint_count(thread_id) > 2
+
+    deleted = await prune_checkpoints(keep_last=2, batch_size=1)
+
+    assert deleted["checkpoints"] >= 1
+    assert await checkpoint_count(thread_id) == 2
+    # The conversation still resumes from its latest checkpoint
+    seen, _ = await run_turns(checkpointer, thread_id, ["third question"])
+    assert seen[-1][-1] == "third question"
+    assert seen[-1][:4] == ["first question", "answer 1", "second question", "answer 2"]
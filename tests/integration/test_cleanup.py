@@ -0,0 +1,89 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from news_analyst_agent.db.database import AsyncSessionLocal, dispose_engines
+from news_analyst_agent.db.models import Element, Feedback, Step, Thread
+from news_analyst_agent.tasks import cleanup
+
+
+@pytest.fixture
+async def threads():
+    """Five old anonymous threads with children, an old thread of a user and a new anonymous one"""
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.execute(select(Thread.id).limit(1))
+    except (OSError, OperationalError, ProgrammingError):
+        pytest.skip("Database is not available or not migrated to head")
+
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(days=2)
+    orphans = [uuid.uuid4() for _ in range(5)]
+    user_thread, user_thread_no_time, recent = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    async with AsyncSessionLocal() as session, session.begin():
+        await session.execute(
+            insert(Thread),
+            [{"id": id, "createdAt": old} for id in orphans]
+            + [
+                {"id": user_thread, "createdAt": old, "userIdentifier": "test_cleanup_user"},
+                {"id": user_thread_no_time, "createdAt": None, "userIdentifier": "test_cleanup_user"},
+                {"id": recent, "createdAt": now},
+            ],
+        )
+        for thread_id in [*orphans, user_thread]:
+            await session.execute(
+                insert(Step),
+                [{"id": uuid.uuid4(), "name": "step", "type": "run", "threadId": thread_id, "streaming": False}],
+            )
+            await session.execute(
+                insert(Feedback), [{"id": uuid.uuid4(), "forId": uuid.uuid4(), "threadId": thread_id, "value": 1}]
+            )
+            await session.execute(insert(Element), [{"id": uuid.uuid4(), "threadId": thread_id, "name": "chart"}])
+
+    all_ids = [*orphans, user_thread, user_thread_no_time, recent]
+    yield orphans, [user_thread, user_thread_no_time, recent]
+
+    async with AsyncSessionLocal() as session, session.begin():
+        for model in (Feedback, Element, Step):
+            await session.execute(delete(model).where(model.threadId.in_(all_ids)))
+        await session.execute(delete(Thread).where(Thread.id.in_(all_ids)))
+    await dispose_engines()
+
+
+async def remaining(model, thread_ids) -> int:
+    column = model.id if model is Thread else model.threadId
+    async with AsyncSessionLocal() as session:
+        return await session.scalar(select(func.count()).where(column.in_(thread_ids)))
+
+
+@pytest.mark.asyncio
+async def test_cleanup_deletes_orphans_with_children_in_batches(threads):
+    orphans, kept = threads
+
+    stats = await cleanup.cleanup_orphaned_threads(batch_size=2)
+
+    # Other orphans in the database may be deleted along with ours
+    assert stats.complete
+    assert stats.batches >= 3
+    assert stats.threads >= 5 and stats.steps >= 5 and stats.feedbacks >= 5 and stats.elements >= 5
+    for model in (Thread, Step, Feedback, Element):
+        assert await remaining(model, orphans) == 0
+    assert await remaining(Thread, kept) == 3
+    assert await remaining(Step, kept) == 1
+
+
+@pytest.mark.asyncio
+async def test_cleanup_stops_when_its_time_budget_is_spent(threads, monkeypatch):
+    orphans, _ = threads
+    clock = iter(range(100))
+    monkeypatch.setattr(cleanup.time, "perf_counter", lambda: next(clock))
+
+    # The budget runs out after the first batch
+    stats = await cleanup.cleanup_orphaned_threads(batch_size=2, time_budget=1.5)
+
+    assert not stats.complete
+    assert stats.batches == 1
+    assert await remaining(Thread, orphans) >= 3
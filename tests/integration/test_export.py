@@ -0,0 +1,105 @@
+import base64
+import gzip
+import json
+import subprocess
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from news_analyst_agent import export
+from news_analyst_agent.db.database import AsyncSessionLocal, dispose_engines
+from news_analyst_agent.db.models import Feedback, Step, Thread
+from news_analyst_agent.main import app
+
+
+@pytest.fixture
+def auth_headers():
+    credentials = base64.b64encode(b"admin:admin").decode()
+    return {"Authorization": f"Basic {credentials}"}
+
+
+def step_row(thread_id, created_at):
+    return {
+        "id": uuid.uuid4(), "name": "step", "type": "assistant_message",
+        "threadId": thread_id, "streaming": False, "createdAt": created_at,
+    }
+
+
+@pytest.fixture
+async def user():
+    """A user of its own with two threads, each with a step, and a feedback"""
+    user = f"test_user_{uuid.uuid4().hex[:8]}"
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.execute(select(Thread.id).limit(1))
+    except (OSError, OperationalError, ProgrammingError):
+        pytest.skip("Database is not available or not migrated to head")
+
+    now = datetime.now(timezone.utc)
+    thread_ids = [uuid.uuid4(), uuid.uuid4()]
+    async with AsyncSessionLocal() as session, session.begin():
+        await session.execute(
+            insert(Thread),
+            [
+                {"id": id, "userIdentifier": user, "createdAt": now + timedelta(seconds=i)}
+                for i, id in enumerate(thread_ids)
+            ],
+        )
+        await session.execute(insert(Step), [step_row(id, now) for id in thread_ids])
+        await session.execute(
+            insert(Feedback), [{"id": uuid.uuid4(), "forId": uuid.uuid4(), "threadId": thread_ids[0], "value": 1}]
+        )
+    yield user
+
+    async with AsyncSessionLocal() as session, session.begin():
+        threads = select(Thread.id).where(Thread.userIdentifier == user)
+        for model in (Feedback, Step):
+            await session.execute(delete(model).where(model.threadId.in_(threads)))
+        await session.execute(delete(Thread).where(Thread.userIdentifier == user))
+    await dispose_engines()
+
+
+@pytest.mark.asyncio
+async def test_export_reads_one_snapshot(user):
+    records = []
+    async for record in export.iter_export_records(user=user):
+        if not records:
+            # Written while the export runs, after its snapshot was taken
+            async with AsyncSessionLocal() as session, session.begin():
+                await session.execute(insert(Step), [step_row(record["id"], record["createdAt"])])
+        records.append(record)
+
+    assert [record["record"] for record in records] == ["thread", "thread", "step", "step", "feedback"]
+
+
+@pytest.mark.asyncio
+async def test_export_endpoint_streams_ndjson(user, auth_headers):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/api/export", params={"userIdentifier": user}, headers=auth_headers)
+        compressed = await ac.get(
+            "/api/export", params={"userIdentifier": user, "gzip": True}, headers=auth_headers
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["record"] for record in records] == ["thread", "thread", "step", "step", "feedback"]
+    assert {record["userIdentifier"] for record in records[:2]} == {user}
+    assert records[2]["type"] == "assistant_message"
+    assert gzip.decompress(compressed.content) == response.content
+
+
+def test_export_cli_writes_gzip_file(user, tmp_path):
+    output = tmp_path / "export.ndjson.gz"
+    subprocess.run(
+        [sys.executable, "-m", "news_analyst_agent.export", "--user", user, "--gzip", "-o", str(output)],
+        check=True,
+    )
+
+    records = [json.loads(line) for line in gzip.decompress(output.read_bytes()).splitlines()]
+    assert [record["record"] for record in records] == ["thread", "thread", "step", "step", "feedback"]
@@ -0,0 +1,71 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.exc import OperationalError
+
+from news_analyst_agent.api.pagination import encode_cursor, paginate
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.db.models import Element, Feedback, Step, Thread
+from news_analyst_agent.db.utils import utcnow
+from news_analyst_agent.news_archive import search_query
+from news_analyst_agent.tasks.cleanup import orphaned_threads_filter
+
+
+@pytest.fixture(scope="module")
+def connection():
+    engine = create_engine(get_settings().DATABASE_URL)
+    try:
+        conn = engine.connect()
+    except OperationalError:
+        pytest.skip("Database is not available")
+    if "ix_threads_createdAt_id" not in {
+        i["name"] for i in inspect(conn).get_indexes("threads")
+    }:
+        conn.close()
+        pytest.skip("Database is not migrated to head")
+    # Tables are tiny in tests, so make sequential scans a last resort: a plan
+    # still containing one means no index serves the query.
+    conn.execute(text("SET enable_seqscan = off"))
+    yield conn
+    conn.close()
+    engine.dispose()
+
+
+def explain(conn, stmt) -> str:
+    compiled = stmt.compile(dialect=conn.dialect)
+    rows = conn.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params).all()
+    return "\n".join(row[0] for row in rows)
+
+
+THREAD_ID = uuid.uuid4()
+CURSOR = encode_cursor(utcnow(), uuid.uuid4())
+
+QUERIES = {
+    "threads_listing": paginate(
+        select(Thread), Thread.createdAt, Thread.id, 10, CURSOR, descending=True
+    ),
+    "threads_by_user": paginate(
+        select(Thread).where(Thread.userIdentifier == "admin"),
+        Thread.createdAt,
+        Thread.id,
+        10,
+        descending=True,
+    ),
+    "steps_by_thread": paginate(
+        select(Step).where(Step.threadId == THREAD_ID), Step.createdAt, Step.id, 50
+    ),
+    "feedbacks_by_thread": select(Feedback).where(Feedback.threadId == THREAD_ID),
+    "elements_by_thread": select(Element).where(Element.threadId == THREAD_ID),
+    "orphaned_threads": select(Thread.id).where(
+        orphaned_threads_filter(utcnow() - timedelta(hours=1))
+    ),
+    "news_archive_search": search_query("tesla factory", limit=5, max_age_days=7),
+}
+
+
+@pytest.mark.parametrize("name", list(QUERIES))
+def test_query_uses_index(connection, name):
+    plan = explain(connection, QUERIES[name])
+    assert "Seq Scan" not in plan, plan
@@ -0,0 +1,106 @@
+import asyncio
+import uuid
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.db.database import AsyncSessionLocal, dispose_engines
+from news_analyst_agent.db.models import JobRun
+from news_analyst_agent.tasks import checkpoints, cleanup
+from news_analyst_agent.tasks.scheduler import create_scheduler, run_job, run_local_job
+
+
+async def job_runs(job):
+    async with AsyncSessionLocal() as session:
+        result = await session.scalars(select(JobRun).where(JobRun.job == job))
+        return result.all()
+
+
+@pytest.fixture
+async def job():
+    name = f"test_job_{uuid.uuid4().hex[:8]}"
+    try:
+        await job_runs(name)
+    except (OSError, OperationalError, ProgrammingError):
+        pytest.skip("Database is not available or not migrated to head")
+    yield name
+    async with AsyncSessionLocal() as session, session.begin():
+        await session.execute(delete(JobRun).where(JobRun.job == name))
+    await dispose_engines()
+
+
+@pytest.mark.asyncio
+async def test_job_runs_once_across_concurrent_schedulers(job):
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return {"deleted": 3}
+
+    statuses = await asyncio.gather(*(run_job(job, work, timedelta(minutes=5)) for _ in range(3)))
+    assert sorted(statuses) == ["locked", "locked", "ok"]
+    assert len(calls) == 1
+
+    # A later turn of another scheduler finds the recent run
+    assert await run_job(job, work, timedelta(minutes=5)) == "skipped"
+    assert len(calls) == 1
+
+    runs = {run.status: run for run in await job_runs(job)}
+    assert runs["ok"].result == {"deleted": 3}
+    assert runs["ok"].duration_seconds >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_recorded(job):
+    async def work():
+        raise RuntimeError("boom")
+
+    assert await run_job(job, work, timedelta(0)) == "failed"
+    [run] = await job_runs(job)
+    assert (run.status, run.error) == ("failed", "boom")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "module, step, job_func",
+    [(checkpoints, "_prune", checkpoints.prune_checkpoints), (cleanup, "_delete_batch", cleanup.cleanup_orphaned_threads)],
+)
+async def test_maintenance_job_failure_is_recorded(job, monkeypatch, module, step, job_func):
+    async def fail(*args):
+        raise RuntimeError('relation "checkpoints" does not exist')
+
+    monkeypatch.setattr(module, step, fail)
+
+    assert await run_job(job, job_func, timedelta(0)) == "failed"
+    [run] = await job_runs(job)
+    assert (run.status, run.error) == ("failed", 'relation "checkpoints" does not exist')
+
+
+@pytest.mark.asyncio
+async def test_per_process_job_runs_in_every_process(job):
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+
+    statuses = await asyncio.gather(*(run_local_job(job, work) for _ in range(2)))
+    assert statuses == ["ok", "ok"]
+    assert len(calls) == 2
+    assert [run.status for run in await job_runs(job)] == ["ok", "ok"]
+
+
+def test_prefetch_is_scheduled_in_api_processes_only():
+    settings = get_settings().model_copy(
+        update={"PREFETCH_ENABLED": True, "NEWS_WATCHLIST": ["TSLA"]}
+    )
+    worker = {job.id for job in create_scheduler(settings).get_jobs()}
+    api = {job.id for job in create_scheduler(settings, shared=False, per_process=True).get_jobs()}
+
+    assert "prefetch_watchlist" not in worker
+    assert "cleanup_orphaned_threads" in worker
+    assert api == {"prefetch_watchlist"}
@@ -0,0 +1,61 @@
+import uuid
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from news_analyst_agent.db.database import AsyncSessionLocal, dispose_engines
+from news_analyst_agent.db.models import Step, Thread
+from news_analyst_agent.ui.write_behind import StepWriteBuffer, step_row, write_steps
+
+
+@pytest.fixture
+async def thread_id():
+    """Id of a thread that doesn't exist yet"""
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.execute(select(Thread.id).limit(1))
+    except (OSError, OperationalError, ProgrammingError):
+        pytest.skip("Database is not available or not migrated to head")
+
+    thread_id = str(uuid.uuid4())
+    yield thread_id
+
+    async with AsyncSessionLocal() as session, session.begin():
+        await session.execute(delete(Step).where(Step.threadId == thread_id))
+        await session.execute(delete(Thread).where(Thread.id == thread_id))
+    await dispose_engines()
+
+
+async def write(rows):
+    async with AsyncSessionLocal() as session, session.begin():
+        await write_steps(session, rows)
+
+
+@pytest.mark.asyncio
+async def test_flush_creates_the_thread_of_new_steps(thread_id):
+    buffer = StepWriteBuffer(write, interval=60)
+    for name in ("run", "answer"):
+        buffer.add(step_row({
+            "id": str(uuid.uuid4()), "threadId": thread_id, "name": name, "type": "run",
+            "streaming": False, "createdAt": "2025-03-01T12:00:00.000Z",
+        }))
+    await buffer.flush()
+
+    async with AsyncSessionLocal() as session:
+        thread = await session.get(Thread, thread_id)
+        steps = (await session.scalars(select(Step.name).where(Step.threadId == thread_id))).all()
+    assert thread is not None and thread.createdAt is not None
+    assert sorted(steps) == ["answer", "run"]
+
+
+@pytest.mark.asyncio
+async def test_flush_keeps_an_existing_thread(thread_id):
+    async with AsyncSessionLocal() as session, session.begin():
+        session.add(Thread(id=thread_id, name="existing", userIdentifier="test_user"))
+
+    await write([{"id": str(uuid.uuid4()), "threadId": thread_id, "name": "run", "type": "run", "streaming": False}])
+
+    async with AsyncSessionLocal() as session:
+        thread = await session.get(Thread, thread_id)
+    assert (thread.name, thread.userIdentifier) == ("existing", "test_user")
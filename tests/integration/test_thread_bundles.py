@@ -0,0 +1,118 @@
+import base64
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from news_analyst_agent.api.retrieve_db import MAX_BUNDLE_IDS, bundle_out, bundle_query
+from news_analyst_agent.db.database import AsyncSessionLocal, dispose_engines
+from news_analyst_agent.db.models import Element, Feedback, Step, Thread
+from news_analyst_agent.main import app
+
+
+@pytest.fixture
+def auth_headers():
+    credentials = base64.b64encode(b"admin:admin").decode()
+    return {"Authorization": f"Basic {credentials}"}
+
+
+@pytest.fixture
+async def threads():
+    """Two threads; the first has three steps, two of them created at the same time"""
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.execute(select(Thread.id).limit(1))
+    except (OSError, OperationalError, ProgrammingError):
+        pytest.skip("Database is not available or not migrated to head")
+
+    now = datetime.now(timezone.utc)
+    thread_ids = [uuid.uuid4(), uuid.uuid4()]
+    # Inserted out of order; ties on createdAt are broken by id
+    step_ids = sorted(uuid.uuid4() for _ in range(2))
+    steps = [
+        (uuid.uuid4(), thread_ids[0], now + timedelta(seconds=1)),
+        (step_ids[1], thread_ids[0], now),
+        (step_ids[0], thread_ids[0], now),
+        (uuid.uuid4(), thread_ids[1], now),
+    ]
+    async with AsyncSessionLocal() as session, session.begin():
+        await session.execute(
+            insert(Thread), [{"id": id, "name": f"thread {i}", "createdAt": now} for i, id in enumerate(thread_ids)]
+        )
+        await session.execute(
+            insert(Step),
+            [
+                {
+                    "id": id, "name": "step", "type": "assistant_message", "threadId": thread_id,
+                    "streaming": False, "createdAt": created_at, "output": "answer",
+                }
+                for id, thread_id, created_at in steps
+            ],
+        )
+        await session.execute(
+            insert(Feedback), [{"id": uuid.uuid4(), "forId": steps[0][0], "threadId": thread_ids[0], "value": 1}]
+        )
+        await session.execute(
+            insert(Element), [{"id": uuid.uuid4(), "threadId": thread_ids[0], "name": "chart"}]
+        )
+    yield thread_ids, [steps[2][0], steps[1][0], steps[0][0]]
+
+    async with AsyncSessionLocal() as session, session.begin():
+        for model in (Feedback, Element, Step):
+            await session.execute(delete(model).where(model.threadId.in_(thread_ids)))
+        await session.execute(delete(Thread).where(Thread.id.in_(thread_ids)))
+    await dispose_engines()
+
+
+@pytest.mark.asyncio
+async def test_bundle_is_loaded_before_the_session_closes(threads):
+    thread_ids, _ = threads
+    query, step_fields = bundle_query(thread_ids, "full")
+    async with AsyncSessionLocal() as session:
+        loaded = (await session.execute(query)).scalars().all()
+
+    # Any lazy load would fail now that the session is closed
+    bundles = [bundle_out(thread, step_fields) for thread in loaded]
+    assert sorted(len(bundle.steps) for bundle in bundles) == [1, 3]
+    assert sum(len(bundle.feedbacks) + len(bundle.elements) for bundle in bundles) == 2
+
+
+@pytest.mark.asyncio
+async def test_bundles_endpoint(threads, auth_headers):
+    thread_ids, step_order = threads
+    missing = uuid.uuid4()
+    params = {"ids": [str(thread_ids[1]), str(missing), str(thread_ids[0]), str(thread_ids[1])]}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/api/threads/bundles", params=params, headers=auth_headers)
+
+    assert response.status_code == 200
+    bundles = response.json()
+    # In the requested order, without duplicates or unknown ids
+    assert [bundle["id"] for bundle in bundles] == [str(thread_ids[1]), str(thread_ids[0])]
+    assert [step["id"] for step in bundles[1]["steps"]] == [str(id) for id in step_order]
+    assert len(bundles[1]["feedbacks"]) == 1
+    assert [element["name"] for element in bundles[1]["elements"]] == ["chart"]
+
+
+@pytest.mark.asyncio
+async def test_bundles_endpoint_caps_ids(auth_headers):
+    params = {"ids": [str(uuid.uuid4()) for _ in range(MAX_BUNDLE_IDS + 1)]}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/api/threads/bundles", params=params, headers=auth_headers)
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bundle_endpoint(threads, auth_headers):
+    thread_ids, step_order = threads
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get(f"/api/threads/{thread_ids[0]}/bundle", headers=auth_headers)
+        unknown = await ac.get(f"/api/threads/{uuid.uuid4()}/bundle", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert [step["id"] for step in response.json()["steps"]] == [str(id) for id in step_order]
+    assert unknown.status_code == 404
@@ -0,0 +1,66 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from news_analyst_agent.db.database import AsyncSessionLocal, dispose_engines
+from news_analyst_agent.db.models import Step, Thread
+
+
+async def updated_at(session, thread_ids):
+    rows = await session.execute(select(Thread.id, Thread.updatedAt).where(Thread.id.in_(thread_ids)))
+    return dict(rows.all())
+
+
+@pytest.fixture
+async def threads():
+    """Two threads, the first with a step"""
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.execute(select(Thread.updatedAt).limit(1))
+    except (OSError, OperationalError, ProgrammingError):
+        pytest.skip("Database is not available or not migrated to head")
+
+    thread_ids = [uuid.uuid4(), uuid.uuid4()]
+    step_id = uuid.uuid4()
+    async with AsyncSessionLocal() as session, session.begin():
+        await session.execute(
+            insert(Thread), [{"id": id, "createdAt": datetime.now(timezone.utc)} for id in thread_ids]
+        )
+        await session.execute(
+            insert(Step),
+            [{"id": step_id, "name": "step", "type": "run", "threadId": thread_ids[0], "streaming": False}],
+        )
+    yield thread_ids, step_id
+
+    async with AsyncSessionLocal() as session, session.begin():
+        await session.execute(delete(Step).where(Step.threadId.in_(thread_ids)))
+        await session.execute(delete(Thread).where(Thread.id.in_(thread_ids)))
+    await dispose_engines()
+
+
+@pytest.mark.asyncio
+async def test_writes_in_one_transaction_advance_updated_at(threads):
+    thread_ids, step_id = threads
+    async with AsyncSessionLocal() as session, session.begin():
+        before = await updated_at(session, thread_ids)
+        await session.execute(update(Step).where(Step.id == step_id).values(output="first"))
+        first = await updated_at(session, thread_ids)
+        await session.execute(update(Step).where(Step.id == step_id).values(output="second"))
+        second = await updated_at(session, thread_ids)
+
+    assert before[thread_ids[0]] < first[thread_ids[0]] < second[thread_ids[0]]
+    assert second[thread_ids[1]] == before[thread_ids[1]]
+
+
+@pytest.mark.asyncio
+async def test_moving_a_step_touches_both_threads(threads):
+    thread_ids, step_id = threads
+    async with AsyncSessionLocal() as session, session.begin():
+        before = await updated_at(session, thread_ids)
+        await session.execute(update(Step).where(Step.id == step_id).values(threadId=thread_ids[1]))
+        after = await updated_at(session, thread_ids)
+
+    assert all(after[id] > before[id] for id in thread_ids)
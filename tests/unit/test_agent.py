@@ -1,5 +1,9 @@
+import json
+
 import pytest
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.memory import MemorySaver
 
 from news_analyst_agent.agents.news_agent import NewsAnalystAgent
 from news_analyst_agent.agents.utils import ModelName
@@ -35,3 +39,130 @@ async def test_news_analyst_agent_stream():
     
     assert news_received, "Should have received news results"
     assert response_received, "Should have received AI response"
+
+
+@pytest.mark.asyncio
+async def test_checkpointed_thread_resumes_with_new_message_only():
+    seen = []
+
+    def fake_model(messages):
+        seen.append([m.content for m in messages[1:]])  # skip the system prompt
+        return AIMessage(content=f"answer {len(seen)}")
+
+    def make_agent():
+        agent = NewsAnalystAgent(
+            model_name=ModelName.LLAMA_3_2,
+            checkpointer=checkpointer,
+            thread_id="thread-1",
+        )
+        agent.model = RunnableLambda(fake_model)
+        return agent
+
+    checkpointer = MemorySaver()
+    await make_agent().arun([HumanMessage(content="first question")])
+    results = await make_agent().arun([HumanMessage(content="second question")])
+
+    assert seen[-1] == ["first question", "answer 1", "second question"]
+    assert [m.content for m in results["messages"]][-1] == "answer 2"
+    assert results["metadata"]["news"] == []
+
+
+@pytest.mark.asyncio
+async def test_parallel_tool_calls_get_one_message_each(monkeypatch):
+    from news_analyst_agent import news_archive
+    from news_analyst_agent.news_item import NewsItem
+    from news_analyst_agent.tools import retrieval_cache
+
+    def fake_cached_invoke(tool, query):
+        links = {"tesla": ["shared", "tesla"], "byd": ["shared", "byd"]}.get(query, [])
+        return [
+            NewsItem(title=link, link=f"https://example.com/{link}", source=tool.name)
+            for link in links
+        ]
+
+    def fake_model(messages):
+        if isinstance(messages[-1], HumanMessage):
+            return AIMessage(content="", tool_calls=[
+                {"name": "news_retriever", "args": {"query": "tesla", "entities": []}, "id": "call-1"},
+                {"name": "news_retriever", "args": {"query": "byd", "entities": []}, "id": "call-2"},
+            ])
+        return AIMessage(content="comparison")
+
+    def fake_search_archive(query):
+        # The archive also has the live "tesla" article, and an older one on BYD
+        links = {"tesla": ["tesla"], "byd": ["tesla", "archived byd"]}.get(query, [])
+        return [
+            NewsItem(title=link, link=f"https://example.com/{link}", source="ddg")
+            for link in links
+        ]
+
+    monkeypatch.setattr(retrieval_cache, "cached_invoke", fake_cached_invoke)
+    monkeypatch.setattr(news_archive, "search_archive", fake_search_archive)
+    agent = NewsAnalystAgent(model_name=ModelName.GPT_4_O)
+    agent.model = RunnableLambda(fake_model)
+
+    results = await agent.arun([HumanMessage(content="tesla vs byd")])
+
+    tool_messages = [m for m in results["messages"] if m.type == "tool"]
+    assert [m.tool_call_id for m in tool_messages] == ["call-1", "call-2"]
+    # Articles found by several calls or sources are only reported once
+    assert [[n["title"] for n in json.loads(m.content)] for m in tool_messages] == [
+        ["shared", "tesla"],
+        ["byd", "archived byd"],
+    ]
+    assert [n.title for n in results["metadata"]["news"]] == ["shared", "tesla", "byd", "archived byd"]
+    assert results["messages"][-1].content == "comparison"
+
+
+def test_trim_history_drops_whole_turns():
+    from news_analyst_agent.agents.utils import trim_history
+
+    messages = [
+        HumanMessage(content="q1"), AIMessage(content="a1"),
+        HumanMessage(content="q2"), AIMessage(content="", tool_calls=[
+            {"name": "news_retriever", "args": {"query": "q2"}, "id": "call-1"},
+        ]),
+        ToolMessage(content="[]", tool_call_id="call-1"), AIMessage(content="a2"),
+        HumanMessage(content="q3"),
+    ]
+    assert trim_history(messages, 10) == []
+    assert [m.content for m in trim_history(messages, 5)] == ["q1", "a1"]
+    # The current turn is kept even if it alone is over the cap
+    assert len(trim_history(messages, 0)) == 6
+
+
+def test_cap_news_takes_turns_between_calls():
+    from news_analyst_agent.agents.utils import cap_news
+    from news_analyst_agent.news_item import NewsItem
+
+    def items(*titles):
+        return [NewsItem(title=t, link=f"https://example.com/{t}", source="ddg") for t in titles]
+
+    responses = [items("a1", "a2", "a3"), items("b1"), items("c1", "c2")]
+    capped = cap_news(responses, max_items=4)
+    assert [[n.title for n in r] for r in capped] == [["a1", "a2"], ["b1"], ["c1"]]
+
+    capped = cap_news(responses, max_items=10, max_chars=5, size=lambda n: 1 if n.title == "b1" else 2)
+    assert [[n.title for n in r] for r in capped] == [["a1"], ["b1"], ["c1"]]
+
+
+@pytest.mark.asyncio
+async def test_old_turns_are_dropped_from_checkpointed_state(monkeypatch):
+    from news_analyst_agent.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "AGENT_MAX_MESSAGES", 3)
+    seen = []
+
+    def fake_model(messages):
+        seen.append([m.content for m in messages[1:]])
+        return AIMessage(content=f"answer {len(seen)}")
+
+    agent = NewsAnalystAgent(
+        model_name=ModelName.LLAMA_3_2, checkpointer=MemorySaver(), thread_id="thread-1"
+    )
+    agent.model = RunnableLambda(fake_model)
+    for question in ("first", "second", "third"):
+        results = await agent.arun([HumanMessage(content=question)])
+
+    assert seen[-1] == ["second", "answer 2", "third"]
+    assert [m.content for m in results["messages"]] == ["second", "answer 2", "third", "answer 3"]
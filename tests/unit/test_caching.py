@@ -0,0 +1,86 @@
+import uuid
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from news_analyst_agent.api.caching import is_not_modified, make_etag
+from news_analyst_agent.api.retrieve_db import get_thread
+from news_analyst_agent.cache import TTLCache
+
+VERSION = datetime(2025, 3, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+
+
+def make_request(path="/api/threads/1/steps", query="", headers=None):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "server": ("test", 80),
+        "scheme": "http",
+    })
+
+
+def test_etag_changes_with_version_and_query():
+    etag = make_etag(make_request(), VERSION)
+    assert etag == make_etag(make_request(), VERSION)
+    assert etag != make_etag(make_request(), VERSION.replace(second=1))
+    assert etag != make_etag(make_request(query="mode=summary"), VERSION)
+
+
+def test_conditional_headers():
+    etag = make_etag(make_request(), VERSION)
+    assert is_not_modified(make_request(headers={"If-None-Match": etag}), etag, VERSION)
+    assert not is_not_modified(
+        make_request(headers={"If-None-Match": 'W/"stale"'}), etag, VERSION
+    )
+
+    last_modified = format_datetime(VERSION, usegmt=True)
+    assert is_not_modified(
+        make_request(headers={"If-Modified-Since": last_modified}), etag, VERSION
+    )
+    assert not is_not_modified(
+        make_request(headers={"If-Modified-Since": last_modified}),
+        etag,
+        VERSION.replace(minute=1),
+    )
+    assert not is_not_modified(make_request(), etag, VERSION)
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    cache.set("d", 4, ttl=-1)
+    assert cache.get("d") is None
+
+
+class DeletingSession:
+    """Finds the thread's version, then the thread is gone"""
+
+    def __init__(self):
+        self.results = [
+            SimpleNamespace(one_or_none=lambda: SimpleNamespace(updatedAt=VERSION)),
+            SimpleNamespace(scalar_one_or_none=lambda: None),
+        ]
+
+    async def execute(self, query):
+        return self.results.pop(0)
+
+
+async def test_thread_deleted_after_version_lookup_is_not_found():
+    thread_id = uuid.uuid4()
+    request = make_request(path=f"/api/threads/{thread_id}")
+
+    with pytest.raises(HTTPException) as error:
+        await get_thread(thread_id, request, DeletingSession(), "admin")
+    assert error.value.status_code == 404
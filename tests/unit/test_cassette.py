@@ -0,0 +1,73 @@
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+
+from news_analyst_agent.cassette import (
+    Cassette,
+    CassetteLLMCache,
+    CassetteLocked,
+    CassetteMiss,
+    make_key,
+)
+
+
+def test_cassette_record_and_replay(tmp_path):
+    path = tmp_path / "calls.jsonl.gz"
+    calls = []
+
+    def search(query):
+        calls.append(query)
+        return [{"title": f"news about {query}", "link": f"https://x/{len(calls)}"}]
+
+    recorder = Cassette(path, mode="record")
+    key = make_key("ddg_search", "tesla")
+    first = recorder.call(key, search, "tesla")
+    second = recorder.call(key, search, "tesla")
+    recorder.close()
+
+    player = Cassette(path, mode="replay")
+    assert player.call(key, search, "tesla") == first
+    assert player.call(key, search, "tesla") == second
+    # Exhausted keys keep serving the last recorded response
+    assert player.call(key, search, "tesla") == second
+    assert len(calls) == 2
+
+    with pytest.raises(CassetteMiss):
+        player.call(make_key("ddg_search", "nvidia"), search, "nvidia")
+
+
+def test_cassette_llm_cache(tmp_path):
+    path = tmp_path / "llm.jsonl.gz"
+    messages = [HumanMessage(content="summary tesla recent news")]
+
+    responses = ["recorded answer", "live answer"]
+
+    recorder = Cassette(path, mode="record")
+    live_model = FakeListChatModel(responses=responses, cache=CassetteLLMCache(recorder))
+    assert live_model.invoke(messages).content == "recorded answer"
+    recorder.close()
+
+    player = Cassette(path, mode="replay")
+    replay_model = FakeListChatModel(responses=responses, cache=CassetteLLMCache(player))
+    assert replay_model.invoke(messages).content == "recorded answer"
+    assert replay_model.invoke(messages).content == "recorded answer"
+    # The model itself was never called during replay
+    assert replay_model.i == 0
+
+
+def test_cassette_is_recorded_by_one_process_at_a_time(tmp_path):
+    path = tmp_path / "calls.jsonl.gz"
+    recorder = Cassette(path, mode="record")
+    with pytest.raises(CassetteLocked):
+        Cassette(path, mode="record")
+    recorder.call(make_key("ddg_search", "tesla"), lambda: ["first"])
+    recorder.close()
+
+    # Released on close; a later recording appends to the cassette
+    recorder = Cassette(path, mode="record")
+    recorder.call(make_key("ddg_search", "tesla"), lambda: ["second"])
+    recorder.close()
+
+    player = Cassette(path, mode="replay")
+    assert player.call(make_key("ddg_search", "tesla"), list) == ["first"]
+    assert player.call(make_key("ddg_search", "tesla"), list) == ["second"]
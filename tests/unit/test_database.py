@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from news_analyst_agent.db.database import (
+    install_pool_metrics,
+    install_slow_query_log,
+    pool_status,
+)
+from news_analyst_agent.metrics import metrics
+
+
+def test_slow_query_log_and_pool_metrics():
+    metrics.reset()
+    engine = create_engine("sqlite://")
+    install_slow_query_log(engine, threshold_ms=0, name="test")
+    install_pool_metrics(engine, name="test")
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["db_slow_queries_total{engine=test}"] == 1
+    assert snapshot["counters"]["db_pool_checkouts_total{engine=test}"] >= 1
+    assert snapshot["timings"]["db_query_seconds{engine=test}"]["count"] == 1
+    assert snapshot["collectors"]["db_pool_test"] == pool_status(engine)
+
+
+def test_failed_queries_leave_no_start_time_behind():
+    metrics.reset()
+    engine = create_engine("sqlite://")
+    install_slow_query_log(engine, threshold_ms=0, name="test")
+
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info["query_start_time"] == []
+
+    assert metrics.snapshot()["timings"]["db_query_seconds{engine=test}"]["count"] == 4
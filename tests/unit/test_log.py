@@ -0,0 +1,106 @@
+import io
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from loguru import logger
+
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.log import (
+    BackgroundSink,
+    RequestContextMiddleware,
+    add_log_context,
+    configure_logging,
+    flush_logs,
+    log_context,
+)
+
+
+@pytest.fixture
+def log_output():
+    """Records logged as JSON, one dict per record"""
+    stream = io.StringIO()
+
+    def configure(**overrides):
+        settings = get_settings().model_copy(
+            update={"LOG_LEVEL": "DEBUG", "LOG_JSON": True, "LOG_ENQUEUE": True, **overrides}
+        )
+        configure_logging(settings, sink=stream)
+
+    def records():
+        return [json.loads(line)["record"] for line in stream.getvalue().splitlines()]
+
+    configure()
+    yield configure, records
+    configure_logging()
+
+
+@pytest.mark.asyncio
+async def test_request_id_reaches_tool_threads_and_late_fields(log_output):
+    _, records = log_output
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/chat")
+    async def chat():
+        add_log_context(thread_id="thread-1")
+        with ThreadPoolExecutor() as executor:
+            executor.submit(copy_context().run, logger.info, "from a tool thread").result()
+        return {}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/chat", headers={"X-Request-ID": "req-1"})
+        generated = (await ac.get("/chat")).headers["x-request-id"]
+    await flush_logs()
+
+    assert response.headers["x-request-id"] == "req-1"
+    extras = [r["extra"] for r in records() if r["message"] == "from a tool thread"]
+    assert extras == [
+        {"request_id": "req-1", "thread_id": "thread-1"},
+        {"request_id": generated, "thread_id": "thread-1"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_debug_records_are_sampled_per_context(log_output):
+    configure, records = log_output
+    configure(LOG_DEBUG_SAMPLE_RATE=0.5)
+    for i in range(200):
+        with log_context(request_id=str(i)):
+            logger.debug("first")
+            logger.debug("second")
+            logger.info("always")
+    await flush_logs()
+
+    logged = records()
+    assert sum(r["message"] == "always" for r in logged) == 200
+    first = {r["extra"]["request_id"] for r in logged if r["message"] == "first"}
+    second = {r["extra"]["request_id"] for r in logged if r["message"] == "second"}
+    # Sampled requests keep all their debug records
+    assert first == second
+    assert 40 < len(first) < 160
+
+
+def test_background_sink_drops_records_it_cannot_keep_up_with():
+    class BlockedStream(io.StringIO):
+        def write(self, message):
+            started.set()
+            release.wait()
+            return super().write(message)
+
+    started, release = threading.Event(), threading.Event()
+    stream = BlockedStream()
+    sink = BackgroundSink(stream, max_pending=2)
+    sink.write("1\n")
+    started.wait()
+    for i in range(2, 6):
+        sink.write(f"{i}\n")  # returns at once even though the writer is stuck
+    release.set()
+    sink.join()
+    sink.stop()
+
+    assert stream.getvalue() == "1\n2\n3\n"
@@ -0,0 +1,44 @@
+import tracemalloc
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from news_analyst_agent.memory import MemoryProfilingMiddleware, top_allocations
+from news_analyst_agent.metrics import metrics
+
+retained = []
+
+
+@pytest.fixture
+def tracing():
+    metrics.reset()
+    tracemalloc.start()
+    yield
+    tracemalloc.stop()
+    retained.clear()
+
+
+@pytest.mark.asyncio
+async def test_records_peak_and_retained_memory_per_route(tracing):
+    app = FastAPI()
+    app.add_middleware(MemoryProfilingMiddleware)
+
+    @app.get("/items/{n}")
+    async def allocate(n: int):
+        scratch = bytearray(4_000_000)  # freed before the response is sent
+        retained.append(bytearray(n))
+        return {"size": len(scratch)}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        assert (await ac.get("/items/1000000")).status_code == 200
+
+    timings = metrics.snapshot()["timings"]
+    assert timings["request_memory_peak_bytes{path=/items/{n}}"]["max"] >= 5_000_000
+    assert 1_000_000 <= timings["request_memory_retained_bytes{path=/items/{n}}"]["max"] < 4_000_000
+    assert top_allocations(limit=5)
+
+
+def test_top_allocations_is_empty_without_tracing():
+    assert not tracemalloc.is_tracing()
+    assert top_allocations() == []
@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+
+from news_analyst_agent import news_archive
+from news_analyst_agent.news_archive import search_query, upsert_statement
+from news_analyst_agent.news_item import NewsItem
+
+ITEMS = [
+    NewsItem(title="Tesla opens factory", link="https://example.com/a", source="ddg"),
+    NewsItem(
+        title="Tesla opens factory",
+        link="https://example.com/a",
+        source="yfinance",
+        content="Tesla  opened\x00 a factory.",
+        published="2025-03-01T12:00:00Z",
+    ),
+    NewsItem(title="NVDA earnings", link="https://example.com/b", source="ddg", published="yesterday"),
+]
+
+
+def compile_pg(stmt):
+    return stmt.compile(dialect=postgresql.dialect())
+
+
+def test_upsert_deduplicates_rows_and_keeps_archived_content():
+    compiled = compile_pg(upsert_statement(ITEMS))
+    params = compiled.params
+    sql = str(compiled)
+
+    assert "ON CONFLICT (id) DO UPDATE" in sql
+    assert "coalesce(excluded.content, news_articles.content)" in sql
+    # One row per article, the last retrieved version of it
+    assert {params["id_m0"], params["id_m1"]} == {ITEMS[0].id, ITEMS[2].id}
+    assert params["content_m0"] == "Tesla opened a factory."
+    assert params["published_at_m0"].isoformat() == "2025-03-01T12:00:00+00:00"
+    assert params["published_at_m1"] is None
+
+
+def test_search_query_uses_full_text_search():
+    stmt = search_query("tesla factory", limit=5, max_age_days=7)
+    sql = str(compile_pg(stmt))
+
+    assert "news_articles.search @@ websearch_to_tsquery" in sql
+    assert "ORDER BY ts_rank_cd(news_articles.search, websearch_to_tsquery" in sql
+    # The search vector is only filtered and ranked on, not loaded
+    assert "search" not in stmt.selected_columns
+
+
+@pytest.mark.asyncio
+async def test_get_archived_returns_none_when_the_archive_is_unavailable(monkeypatch):
+    def unavailable():
+        raise OperationalError("SELECT", {}, ConnectionRefusedError("database is down"))
+
+    monkeypatch.setattr(news_archive, "AsyncSessionLocal", unavailable)
+
+    assert await news_archive.get_archived("0123456789abcdef") is None
@@ -0,0 +1,60 @@
+from dataclasses import replace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from news_analyst_agent.api import news
+from news_analyst_agent.config import get_settings
+from news_analyst_agent.news_item import NewsItem, news_id
+from news_analyst_agent.news_store import clean_text, get_news, store_news
+
+ITEM = NewsItem(
+    title="Tesla opens new factory",
+    description="Tesla announced ...",
+    content="  Tesla\t\topened  a factory.\r\n\n\n\n\nMore   text\x00 here  ",
+    link="https://example.com/tesla-factory",
+    query="tesla",
+    source="yfinance",
+    published="2025-03-01T12:00:00+00:00",
+)
+
+
+def test_clean_text_normalizes_whitespace_and_caps_length():
+    assert clean_text(ITEM.content) == ("Tesla opened a factory.\n\nMore text here", False)
+    assert clean_text("word " * 10, max_chars=12) == ("word word wo", True)
+    assert clean_text(None) == (None, False)
+
+
+def test_store_returns_summaries_and_keeps_content():
+    [summary] = store_news([ITEM])
+
+    assert summary.id == news_id(ITEM.link)
+    assert summary.content is None
+    assert get_news(summary.id).content == "Tesla opened a factory.\n\nMore text here"
+
+    # A later result for the same link without content keeps the stored text
+    store_news([replace(ITEM, content=None, source="ddg")])
+    assert get_news(summary.id).content is not None
+
+
+def test_news_endpoint(monkeypatch):
+    app = FastAPI()
+    app.include_router(news.router, prefix="/api")
+    client = TestClient(app)
+    settings = get_settings()
+    auth = (settings.ADMIN_USERNAME, settings.ADMIN_PASSWORD)
+    [summary] = store_news([ITEM])
+
+    response = client.get(f"/api/news/{summary.id}", auth=auth)
+    assert response.status_code == 200
+    assert response.json()["content"].startswith("Tesla opened")
+
+    async def get_archived(article_id):
+        return replace(ITEM, id=article_id) if article_id == "archived" else None
+
+    monkeypatch.setattr(news, "get_archived", get_archived)
+    response = client.get("/api/news/archived", auth=auth)
+    assert response.status_code == 200
+    assert response.json()["id"] == "archived"
+
+    assert client.get("/api/news/unknown", auth=auth).status_code == 404
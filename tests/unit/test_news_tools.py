@@ -7,11 +7,10 @@ def test_ddg_search_tool():
     
     assert len(results) > 0
     for result in results:
-        assert "title" in result
-        assert "description" in result
-        assert "content" in result
-        assert "link" in result
-        assert result["source"] == "ddg"
+        assert result.title
+        assert result.link
+        assert result.id
+        assert result.source == "ddg"
 
 
 def test_yfinance_tool():
@@ -19,8 +18,7 @@ def test_yfinance_tool():
     
     assert len(results) > 0
     for result in results:
-        assert "title" in result
-        assert "description" in result
-        assert "content" in result
-        assert "link" in result
-        assert result["source"] == "yfinance"
+        assert result.title
+        assert result.link
+        assert result.id
+        assert result.source == "yfinance"
@@ -0,0 +1,82 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, MetaData, String, Table, Uuid, create_engine, select
+
+from news_analyst_agent.api.pagination import (
+    decode_cursor,
+    encode_cursor,
+    paginate,
+    split_page,
+)
+
+metadata = MetaData()
+rows_table = Table(
+    "rows",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("createdAt", String),
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    created = [
+        "2025-01-01", "2025-01-02", "2025-01-02", "2025-01-03", None, None, "2025-01-04"
+    ]
+    with engine.begin() as conn:
+        conn.execute(
+            rows_table.insert(),
+            [{"id": uuid.uuid4(), "createdAt": c} for c in created],
+        )
+    return engine
+
+
+def _walk(engine, descending):
+    seen, cursor = [], None
+    with engine.connect() as conn:
+        while True:
+            query = paginate(
+                select(rows_table),
+                rows_table.c.createdAt,
+                rows_table.c.id,
+                limit=3,
+                cursor=cursor,
+                descending=descending,
+            )
+            page, cursor = split_page(conn.execute(query).all(), 3)
+            seen.extend(page)
+            if cursor is None:
+                return seen
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_keyset_pagination_visits_every_row_once(engine, descending):
+    rows = _walk(engine, descending)
+
+    with engine.connect() as conn:
+        expected = conn.execute(
+            paginate(
+                select(rows_table),
+                rows_table.c.createdAt,
+                rows_table.c.id,
+                limit=100,
+                descending=descending,
+            )
+        ).all()
+    assert [r.id for r in rows] == [r.id for r in expected]
+    assert len({r.id for r in rows}) == 7
+    # Rows without a creation time always come last
+    assert [r.createdAt for r in rows[-2:]] == [None, None]
+
+
+def test_cursor_round_trip():
+    row_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor("2025-01-01", row_id)) == ("2025-01-01", row_id)
+
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("not-a-cursor")
+    assert exc_info.value.status_code == 400
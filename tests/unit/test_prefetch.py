@@ -0,0 +1,44 @@
+from news_analyst_agent.tasks import prefetch
+from news_analyst_agent.tools import retrieval_cache
+
+
+async def test_prefetch_refreshes_each_tool_and_entry(monkeypatch):
+    calls = []
+
+    def fake_refresh(tool, query, ttl=None):
+        calls.append((tool.name, query))
+        return [{"link": "https://example.com"}] if tool.name == "yahoo_finance_news" else []
+
+    monkeypatch.setattr(retrieval_cache, "refresh", fake_refresh)
+
+    stats = await prefetch.prefetch_watchlist(["TSLA", "NVDA"])
+
+    assert sorted(calls) == [
+        ("duckduckgo_results_json", "NVDA"),
+        ("duckduckgo_results_json", "TSLA"),
+        ("yahoo_finance_news", "NVDA"),
+        ("yahoo_finance_news", "TSLA"),
+    ]
+    assert (stats.fetched, stats.empty, stats.failed) == (2, 2, 0)
+
+
+async def test_prefetch_counts_failed_calls(monkeypatch):
+    from news_analyst_agent.agents import utils
+
+    class Tool:
+        def __init__(self, name, results):
+            self.name = name
+            self.results = results
+
+        def invoke(self, query):
+            if self.results is None:
+                raise ConnectionError("unreachable")
+            return self.results
+
+    monkeypatch.setattr(utils.time, "sleep", lambda delay: None)
+    monkeypatch.setattr("news_analyst_agent.tools.ddg_search.ddg_search", Tool("ddg", []))
+    monkeypatch.setattr("news_analyst_agent.tools.yfinance_news.yf_tool", Tool("yf", None))
+
+    stats = await prefetch.prefetch_watchlist(["TSLA"])
+
+    assert (stats.fetched, stats.empty, stats.failed) == (0, 1, 1)
@@ -0,0 +1,29 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from news_analyst_agent.api.projection import resolve_step_fields, step_columns
+
+
+def test_summary_mode_skips_large_fields():
+    names = resolve_step_fields(None, "summary")
+    assert {"input", "output", "generation"}.isdisjoint(names)
+
+    sql = str(select(*step_columns(names)).compile(dialect=postgresql.dialect()))
+    assert "steps.output" not in sql
+    assert "steps.input" not in sql
+
+
+def test_explicit_fields_keep_cursor_columns_and_truncate():
+    names = resolve_step_fields("name, output", "full")
+    assert names == ["id", "createdAt", "name", "output"]
+
+    sql = str(select(*step_columns(names, truncate=100)).compile(dialect=postgresql.dialect()))
+    assert "left(steps.output" in sql
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(HTTPException) as exc_info:
+        resolve_step_fields("name,secret", "full")
+    assert exc_info.value.status_code == 400
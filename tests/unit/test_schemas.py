@@ -0,0 +1,47 @@
+import json
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from news_analyst_agent.api.projection import resolve_step_fields, step_from_row
+from news_analyst_agent.api.schemas import FeedbackOut, StepPage, dump_json
+
+
+def test_projected_steps_omit_unloaded_fields():
+    names = resolve_step_fields(None, "summary")
+    step_id = uuid.uuid4()
+    created = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+    row = SimpleNamespace(
+        id=step_id, createdAt=created, name="agent", type="run", isError=False
+    )
+
+    body = json.loads(dump_json(StepPage(items=[step_from_row(row, names)], next_cursor=None)))
+
+    assert body == {
+        "items": [{
+            "id": str(step_id),
+            "createdAt": "2025-03-01T12:00:00+00:00",
+            "name": "agent",
+            "type": "run",
+            "isError": False,
+        }],
+        "next_cursor": None,
+    }
+
+
+def test_list_payloads_need_their_type():
+    feedback = FeedbackOut(id=uuid.uuid4(), forId=uuid.uuid4(), value=1)
+
+    body = json.loads(dump_json([feedback], list[FeedbackOut]))
+
+    assert body == [{"id": str(feedback.id), "forId": str(feedback.forId), "value": 1}]
+
+
+def test_uuid_subclasses_are_encoded():
+    class DriverUUID(uuid.UUID):
+        pass
+
+    feedback_id = DriverUUID(int=1)
+    body = json.loads(dump_json(FeedbackOut(id=feedback_id, forId=feedback_id, value=1)))
+
+    assert body["id"] == body["forId"] == str(feedback_id)
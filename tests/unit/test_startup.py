@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Only needed once a chat request or a background job actually runs
+LAZY_MODULES = [
+    "langchain_openai",
+    "langchain_ollama",
+    "langchain_community",
+    "langgraph",
+    "apscheduler",
+    "yfinance",
+    "duckduckgo_search",
+    "asyncpg",
+]
+
+
+def test_importing_the_app_skips_heavy_dependencies():
+    code = (
+        "import json, sys\n"
+        "import news_analyst_agent.main\n"
+        "from news_analyst_agent.db import database\n"
+        f"print(json.dumps({{'loaded': [m for m in {LAZY_MODULES!r} if m in sys.modules],"
+        " 'engines': list(database._engines)}))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    env.setdefault("OPENAI_API_KEY", "test")
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, env=env, cwd=ROOT, check=True,
+    )
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert report == {"loaded": [], "engines": []}
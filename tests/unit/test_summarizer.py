@@ -0,0 +1,61 @@
+import asyncio
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from news_analyst_agent.agents import summarizer
+from news_analyst_agent.news_item import NewsItem
+from news_analyst_agent.news_store import store_news
+
+
+def make_item(n: int, content: str | None) -> NewsItem:
+    return NewsItem(
+        title=f"Article {n}",
+        link=f"https://example.com/summarize/{n}",
+        source="yfinance",
+        description=f"Description {n}",
+        content=content,
+    )
+
+
+def test_chunk_text_splits_at_paragraphs_and_caps_chunks():
+    text = "\n\n".join(["a" * 30, "b" * 30, "c" * 30])
+    assert summarizer.chunk_text(text, chunk_chars=70, max_chunks=5) == [
+        "a" * 30 + "\n\n" + "b" * 30,
+        "c" * 30,
+    ]
+    assert summarizer.chunk_text("x" * 100, chunk_chars=40, max_chunks=2) == ["x" * 40, "x" * 40]
+
+
+async def test_summarize_news_maps_chunks_and_caches_per_article(monkeypatch):
+    settings = summarizer.settings
+    monkeypatch.setattr(settings, "SUMMARY_CHUNK_CHARS", 100)
+    monkeypatch.setattr(settings, "SUMMARY_CONCURRENCY", 2)
+    calls, running, peak = [], 0, 0
+
+    async def fake_model(prompt):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        calls.append(prompt)
+        return AIMessage(content="combined" if prompt.startswith("Combine") else "partial")
+
+    items = store_news([
+        make_item(1, "\n\n".join(["one " * 20, "two " * 20, "three " * 10])),
+        make_item(2, "short article"),
+        make_item(3, None),
+    ])
+    model = RunnableLambda(fake_model)
+
+    summaries = await summarizer.summarize_news(items, model)
+
+    assert summaries == {items[0].id: "combined", items[1].id: "partial"}
+    # Three chunks and one combine call for the first article, one for the second
+    assert len(calls) == 5
+    assert peak <= 2
+
+    calls.clear()
+    assert await summarizer.summarize_news(items, model) == summaries
+    assert calls == []
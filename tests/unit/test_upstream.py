@@ -0,0 +1,125 @@
+import time
+
+import pytest
+
+from news_analyst_agent.agents.utils import retry_with_backoff
+from news_analyst_agent.tools.upstream import (
+    CircuitBreaker,
+    SharedTokenBucket,
+    TokenBucket,
+    Upstream,
+    UpstreamUnavailable,
+    upstream_max_wait,
+)
+
+
+def make_upstream(rate=100, burst=2, failure_threshold=2, reset_timeout=60, max_wait=0):
+    return Upstream(
+        "test",
+        TokenBucket(rate, burst),
+        CircuitBreaker(failure_threshold, reset_timeout),
+        max_wait,
+    )
+
+
+def test_token_bucket_allows_bursts_then_rejects_or_waits():
+    bucket = TokenBucket(rate=20, burst=2)
+    assert bucket.acquire() and bucket.acquire()
+    assert not bucket.acquire()
+
+    start = time.monotonic()
+    assert bucket.acquire(max_wait=1)
+    assert time.monotonic() - start >= 0.04
+
+
+def test_circuit_opens_after_failures_and_fails_fast():
+    upstream = make_upstream()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise ConnectionError("rate limited by upstream")
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            upstream.call(failing)
+    assert upstream.breaker.state == "open"
+
+    with pytest.raises(UpstreamUnavailable, match="circuit open"):
+        upstream.call(failing)
+    assert len(calls) == 2
+
+
+def test_half_open_circuit_closes_after_successful_trial():
+    upstream = make_upstream(failure_threshold=1, reset_timeout=0.01)
+    with pytest.raises(ValueError):
+        upstream.call(lambda: (_ for _ in ()).throw(ValueError("boom")))
+    time.sleep(0.02)
+    assert upstream.breaker.state == "half_open"
+
+    assert upstream.call(lambda: "ok") == "ok"
+    assert upstream.breaker.state == "closed"
+
+
+def test_retry_with_backoff_gives_up_on_unavailable_source():
+    upstream = make_upstream(rate=0.001, burst=1)
+    upstream.call(lambda: None)
+    calls = []
+
+    start = time.monotonic()
+    result = retry_with_backoff(upstream.wrap(lambda q: calls.append(q)), "tesla")
+
+    assert result == []
+    assert calls == []
+    assert time.monotonic() - start < 0.5
+
+
+def test_background_calls_wait_for_the_rate_limit():
+    upstream = make_upstream(rate=20, burst=1)
+    upstream.call(lambda: None)
+    with pytest.raises(UpstreamUnavailable, match="rate limited"):
+        upstream.call(lambda: None)
+
+    start = time.monotonic()
+    with upstream_max_wait(1):
+        assert upstream.call(lambda: "ok") == "ok"
+    assert time.monotonic() - start >= 0.04
+
+
+def test_shared_bucket_stays_local_after_a_database_failure(monkeypatch):
+    from news_analyst_agent.db import database
+
+    connects = []
+
+    def unreachable():
+        connects.append(1)
+        raise ConnectionError("database is down")
+
+    monkeypatch.setattr(database, "get_sync_engine", unreachable)
+    bucket = SharedTokenBucket("test", rate=100, burst=5, retry_after=60)
+
+    assert all(bucket.acquire() for _ in range(3))
+    assert connects == [1]
+
+    bucket._local_until = 0
+    assert bucket.acquire()
+    assert connects == [1, 1]
+
+
+def test_cassette_inside_upstream_records_only_the_call(tmp_path, monkeypatch):
+    from news_analyst_agent import cassette
+
+    recorder = cassette.Cassette(tmp_path / "calls.jsonl.gz", mode="record")
+    monkeypatch.setattr(cassette, "get_cassette", lambda: recorder)
+    upstream = make_upstream(rate=10, burst=1, max_wait=1)
+
+    start = time.perf_counter()
+    for _ in range(2):
+        upstream.call(cassette.cassette_call, "search", ("tesla",), lambda: ["news"])
+    recorder.close()
+    # The second call waited for a token
+    assert time.perf_counter() - start >= 0.05
+
+    player = cassette.Cassette(tmp_path / "calls.jsonl.gz", mode="replay")
+    key = cassette.make_key("search", "tesla")
+    assert all(player.replay(key)["elapsed"] < 0.05 for _ in range(2))
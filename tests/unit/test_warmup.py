@@ -0,0 +1,48 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from news_analyst_agent import warmup
+from news_analyst_agent.api import health
+
+
+async def test_warmup_reports_failures_and_becomes_ready(monkeypatch):
+    calls = []
+
+    async def ok():
+        calls.append("ok")
+
+    async def broken():
+        raise RuntimeError("model not found")
+
+    monkeypatch.setattr(warmup, "WARMUP_STEPS", {
+        "db_pool": ok, "agent_stack": ok, "models": broken, "watchlist": ok,
+    })
+    settings = warmup.get_settings()
+    monkeypatch.setattr(settings, "WARMUP_MODELS", ["gpt-4o-mini"])
+    monkeypatch.setattr(settings, "NEWS_WATCHLIST", [])
+
+    state = await warmup.run_warmup(warmup.WarmupState())
+
+    assert state.ready
+    assert state.steps == {
+        "db_pool": "ok",
+        "agent_stack": "ok",
+        "models": "failed: model not found",
+        "watchlist": "skipped",
+    }
+    assert len(calls) == 2
+
+
+def test_readiness_endpoint(monkeypatch):
+    app = FastAPI()
+    app.include_router(health.router, prefix="/api")
+    client = TestClient(app)
+    state = warmup.WarmupState()
+    monkeypatch.setattr(health, "warmup_state", state)
+
+    assert client.get("/api/health/ready").status_code == 503
+
+    state.ready = True
+    response = client.get("/api/health/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
@@ -0,0 +1,114 @@
+import asyncio
+
+from sqlalchemy.dialects import postgresql
+
+from news_analyst_agent.ui.write_behind import StepWriteBuffer, step_row, upsert_steps
+
+STEP = {
+    "id": "step-1",
+    "threadId": "thread-1",
+    "name": "Assistant",
+    "type": "assistant_message",
+    "streaming": True,
+    "output": "",
+    "createdAt": "2025-03-01T12:00:00.000Z",
+    "showInput": False,
+    "metadata": {},
+    "command": None,
+    "feedback": {"value": 1},
+}
+
+
+def test_step_row_keeps_known_non_empty_columns():
+    row = step_row(STEP)
+
+    assert set(row) == {"id", "threadId", "name", "type", "streaming", "output", "createdAt", "showInput"}
+    assert row["showInput"] == "false"
+    assert row["createdAt"].isoformat() == "2025-03-01T12:00:00+00:00"
+
+
+def test_upsert_keeps_stored_values_of_missing_columns():
+    rows = [step_row(STEP), {"id": "step-2", "output": "done"}]
+    sql = str(upsert_steps(rows).compile(dialect=postgresql.dialect()))
+
+    assert sql.count("ON CONFLICT") == 1
+    assert 'coalesce(excluded.output, steps.output)' in sql
+
+
+async def test_buffer_coalesces_updates_into_one_batch():
+    batches = []
+
+    async def write(rows):
+        batches.append(rows)
+
+    buffer = StepWriteBuffer(write, interval=0.01)
+    buffer.add(step_row(STEP))
+    for i in range(100):
+        buffer.add({"id": "step-1", "output": "token " * i})
+    buffer.add({"id": "step-2", "threadId": "thread-1", "output": "news"})
+    await asyncio.sleep(0.05)
+
+    assert len(batches) == 1
+    step_1, step_2 = batches[0]
+    assert step_1["output"] == "token " * 99
+    assert step_1["name"] == "Assistant"
+    assert step_2["output"] == "news"
+    assert len(buffer) == 0
+
+
+async def test_failed_batch_is_written_row_by_row():
+    written = []
+
+    async def write(rows):
+        if len(rows) > 1 or rows[0]["id"] == "bad":
+            raise ValueError("foreign key violation")
+        written.extend(rows)
+
+    buffer = StepWriteBuffer(write, interval=60)
+    buffer.add({"id": "bad", "output": "x"})
+    buffer.add({"id": "good", "output": "y"})
+    await buffer.flush()
+
+    assert [row["id"] for row in written] == ["good"]
+
+
+async def test_discard_waits_for_a_flush_in_progress():
+    events = []
+    writing = asyncio.Event()
+
+    async def write(rows):
+        writing.set()
+        await asyncio.sleep(0.01)
+        events.append("written")
+
+    buffer = StepWriteBuffer(write, interval=60)
+    buffer.add({"id": "step-1", "output": "x"})
+    flush = asyncio.create_task(buffer.flush())
+    await writing.wait()
+    await buffer.discard("step-1")
+    events.append("discarded")
+    await flush
+
+    # A delete that follows the discard comes after the write
+    assert events == ["written", "discarded"]
+
+
+async def test_failed_background_flush_is_reported(monkeypatch):
+    from news_analyst_agent.ui import write_behind
+
+    errors = []
+    monkeypatch.setattr(write_behind.metrics, "inc", lambda name, *args, **kwargs: errors.append(name))
+
+    async def write(rows):
+        pass
+
+    buffer = StepWriteBuffer(write, interval=60, max_pending=1)
+    # Fails before writing, outside of the per-row error handling
+    monkeypatch.setattr(buffer, "_lock", None)
+    buffer.add({"id": "step-1", "output": "x"})
+    assert len(buffer._flushes) == 1
+    await asyncio.gather(*buffer._flushes, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert "ui_step_write_errors_total" in errors
+    assert not buffer._flushes